@@ -0,0 +1,9 @@
+"""
+Benchmarks of the python-ecdsa library.
+
+Run ``python -m benchmark --help`` from the top directory of the source
+tree for usage. The package is not installed with the library, it
+benchmarks whatever version of :py:mod:`ecdsa` is importable, so the same
+benchmarks can be executed against different releases and the results
+compared with the ``--json`` and ``--compare`` options.
+"""
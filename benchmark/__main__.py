@@ -0,0 +1,249 @@
+"""
+Command line interface of the benchmarks.
+
+Examples:
+
+.. code-block:: shell
+
+    # all operations on all curves
+    python -m benchmark
+    # signing and verification on NIST curves, save the results
+    python -m benchmark -c 'NIST*' -o 'sign*' -o 'verify*' --json old.json
+    # after upgrading the library, compare with the saved results
+    python -m benchmark -c 'NIST*' -o 'sign*' -o 'verify*' --compare old.json
+"""
+
+from __future__ import print_function
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+
+import ecdsa
+from ecdsa import ellipticcurve, numbertheory
+
+from .operations import OPERATIONS, Fixture, curves
+from .runner import measure
+from . import report
+
+
+FORMAT_VERSION = 1
+"""Version of the JSON output format."""
+
+
+def _matches(name, patterns):
+    """Check if the name matches any of the (case-insensitive) patterns."""
+    if not patterns:
+        return True
+    return any(
+        fnmatch.fnmatchcase(name.lower(), pattern.lower())
+        for pattern in patterns
+    )
+
+
+def _split(values):
+    """Split the comma separated values of repeated options."""
+    if not values:
+        return []
+    return [i.strip() for value in values for i in value.split(",")]
+
+
+def environment():
+    """Return description of the environment the benchmarks run in."""
+    return {
+        "ecdsa_version": ecdsa.__version__,
+        "python_implementation": platform.python_implementation(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "gmpy": bool(ellipticcurve.GMPY),
+        "gmpy2": bool(getattr(numbertheory, "GMPY2", False)),
+    }
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark",
+        description="Benchmark operations of the python-ecdsa library.",
+        epilog="Patterns are case-insensitive shell-style wildcards, "
+        "options can be repeated or take comma separated lists.",
+    )
+    parser.add_argument(
+        "-c",
+        "--curve",
+        action="append",
+        metavar="PATTERN",
+        help="benchmark only the curves with matching names",
+    )
+    parser.add_argument(
+        "-o",
+        "--operation",
+        action="append",
+        metavar="PATTERN",
+        help="benchmark only the matching operations",
+    )
+    parser.add_argument(
+        "-l",
+        "--list",
+        action="store_true",
+        help="list the curves and operations and exit",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=5,
+        help="number of samples to collect for every operation "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "-t",
+        "--min-time",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help="minimal duration of a single sample (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--json",
+        metavar="FILE",
+        help="save the results in JSON format to FILE ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="compare the results with a baseline saved with --json",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="significance level for the comparison (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+    if args.compare and args.repeat < 2:
+        parser.error("--compare needs at least 2 samples per operation")
+    return args
+
+
+def _list(out):
+    print("curves:", file=out)
+    for curve in curves():
+        print("  {0}".format(curve.name), file=out)
+    print("operations:", file=out)
+    for name, (description, _, _) in OPERATIONS.items():
+        print("  {0:<24} {1}".format(name, description), file=out)
+
+
+def _load_baseline(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            "Unsupported format of baseline file {0}".format(path)
+        )
+    return dict(((i["curve"], i["operation"]), i) for i in data["results"])
+
+
+def run(curve_patterns, operation_patterns, repeat, min_time, callback):
+    """
+    Run the selected benchmarks.
+
+    :param list curve_patterns: patterns of curve names to benchmark,
+        all curves when empty
+    :param list operation_patterns: patterns of operation names to
+        benchmark, all operations when empty
+    :param int repeat: number of samples to collect
+    :param float min_time: minimal duration of a sample, in seconds
+    :param callable callback: called with every result as it is finished
+
+    :return: the results
+    :rtype: list(dict)
+    """
+    results = []
+    for curve in curves():
+        if not _matches(curve.name, curve_patterns):
+            continue
+        fixture = Fixture(curve)
+        for name, (_, items, setup) in OPERATIONS.items():
+            if not _matches(name, operation_patterns):
+                continue
+            func = setup(fixture)
+            if func is None:
+                continue
+            number, samples = measure(func, items, repeat, min_time)
+            result = {
+                "curve": curve.name,
+                "operation": name,
+                "items": items,
+                "number": number,
+                "samples": samples,
+            }
+            callback(result)
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    out = sys.stdout
+    if args.list:
+        _list(out)
+        return 0
+
+    if args.json == "-":
+        # keep stdout clean for the JSON
+        out = sys.stderr
+    baseline = None
+    if args.compare:
+        baseline = _load_baseline(args.compare)
+        print(report.compare_header(), file=out)
+    else:
+        print(report.header(), file=out)
+
+    def callback(result):
+        if baseline is None:
+            line = report.format_result(result)
+        else:
+            line = report.compare_result(
+                baseline.get((result["curve"], result["operation"])),
+                result,
+                args.alpha,
+            )
+        print(line, file=out)
+        out.flush()
+
+    results = run(
+        _split(args.curve),
+        _split(args.operation),
+        args.repeat,
+        args.min_time,
+        callback,
+    )
+    if not results:
+        print("No benchmarks selected, see --list", file=sys.stderr)
+        return 1
+
+    if args.json:
+        data = {
+            "version": FORMAT_VERSION,
+            "environment": environment(),
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+            "results": results,
+        }
+        if args.json == "-":
+            json.dump(data, sys.stdout, indent=1)
+            print()
+        else:
+            with open(args.json, "w") as f:
+                json.dump(data, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Definitions of the benchmarked operations.
+
+Every operation is a setup function that gets a :class:`Fixture` for
+a curve and returns the callable to time, or ``None`` when the operation
+is not applicable to the curve (or not supported by the version of the
+library being benchmarked).
+"""
+
+import io
+from collections import OrderedDict
+
+from ecdsa import SigningKey, VerifyingKey, ECDH
+from ecdsa.curves import curves as _curves
+from ecdsa.ellipticcurve import CurveEdTw
+from ecdsa.util import sigencode_der, sigdecode_der
+
+try:
+    from ecdsa import XDH
+except ImportError:  # pragma: no cover
+    # releases before 0.20
+    XDH = None
+
+try:
+    from ecdsa import bundle
+except ImportError:  # pragma: no cover
+    bundle = None
+
+
+MESSAGE = b"msg"
+"""Message signed and verified in the benchmarks."""
+
+BATCH_SIZE = 16
+"""Number of items processed by the batch operations in one call."""
+
+# name -> (description, number of items processed in one call, setup)
+OPERATIONS = OrderedDict()
+
+
+def operation(name, description, items=1):
+    """
+    Register the decorated setup function as a benchmarked operation.
+
+    :param str name: name of the operation, as used on the command line
+    :param str description: one line description of the operation
+    :param int items: number of items processed by a single call of the
+        callable returned by setup, the reported times are per item
+    """
+
+    def decorator(setup):
+        OPERATIONS[name] = (description, items, setup)
+        return setup
+
+    return decorator
+
+
+def _cached(method):
+    """Calculate the value of the property only on first access."""
+    attr = "_" + method.__name__
+
+    def getter(self):
+        try:
+            return getattr(self, attr)
+        except AttributeError:
+            value = method(self)
+            setattr(self, attr, value)
+            return value
+
+    getter.__doc__ = method.__doc__
+    return property(getter)
+
+
+class Fixture(object):
+    """Keys and signatures for a single curve, created when needed."""
+
+    def __init__(self, curve):
+        self.curve = curve
+        self.edwards = isinstance(curve.curve, CurveEdTw)
+
+    @_cached
+    def sk(self):
+        """Private key."""
+        return SigningKey.generate(self.curve)
+
+    def new_vk(self):
+        """Return new copy of the public key of :attr:`sk`."""
+        # keys decoded with VerifyingKey.from_string() can't be precomputed
+        # in some releases, as their points don't have the order set
+        return SigningKey.from_string(
+            self.sk.to_string(), self.curve
+        ).verifying_key
+
+    @_cached
+    def vk(self):
+        """Public key of :attr:`sk`, without precomputation."""
+        return self.new_vk()
+
+    @_cached
+    def vk_precomputed(self):
+        """Public key of :attr:`sk`, with precomputation."""
+        vk = self.new_vk()
+        vk.precompute()
+        return vk
+
+    @_cached
+    def sig(self):
+        """Signature of :data:`MESSAGE` made with :attr:`sk`."""
+        return self.sk.sign(MESSAGE)
+
+    @_cached
+    def peer_keys(self):
+        """Public keys of other parties."""
+        return [
+            SigningKey.generate(self.curve).verifying_key
+            for _ in range(BATCH_SIZE)
+        ]
+
+    @property
+    def sk_format(self):
+        """Private key format supported for the curve."""
+        return "pkcs8" if self.edwards else "ssleay"
+
+
+@operation("keygen", "generate a private key and its public key")
+def _keygen(fix):
+    curve = fix.curve
+    return lambda: SigningKey.generate(curve)
+
+
+@operation("sign", "sign a message (EdDSA for Edwards curves)")
+def _sign(fix):
+    sk = fix.sk
+    return lambda: sk.sign(MESSAGE)
+
+
+@operation("sign_deterministic", "sign a message with RFC 6979 nonce")
+def _sign_deterministic(fix):
+    if fix.edwards:
+        return None
+    sk = fix.sk
+    return lambda: sk.sign_deterministic(MESSAGE)
+
+
+@operation("sign_der", "sign a message, DER encode the signature")
+def _sign_der(fix):
+    if fix.edwards:
+        return None
+    sk = fix.sk
+    return lambda: sk.sign(MESSAGE, sigencode=sigencode_der)
+
+
+@operation("verify", "verify a signature with a precomputed public key")
+def _verify(fix):
+    vk, sig = fix.vk_precomputed, fix.sig
+    return lambda: vk.verify(sig, MESSAGE)
+
+
+@operation("verify_no_precompute", "verify a signature")
+def _verify_no_precompute(fix):
+    vk, sig = fix.vk, fix.sig
+    return lambda: vk.verify(sig, MESSAGE)
+
+
+@operation("verify_der", "verify a DER encoded signature, precomputed key")
+def _verify_der(fix):
+    if fix.edwards:
+        return None
+    vk = fix.vk_precomputed
+    sig = fix.sk.sign(MESSAGE, sigencode=sigencode_der)
+    return lambda: vk.verify(sig, MESSAGE, sigdecode=sigdecode_der)
+
+
+@operation("precompute", "build the precomputation table of a public key")
+def _precompute(fix):
+    return fix.new_vk().precompute
+
+
+@operation("recover", "recover public keys from a signature")
+def _recover(fix):
+    if fix.edwards:
+        return None
+    curve, sig = fix.curve, fix.sig
+    return lambda: VerifyingKey.from_public_key_recovery(sig, MESSAGE, curve)
+
+
+@operation("point_decode", "decode a public key from the raw encoding")
+def _point_decode(fix):
+    curve, encoded = fix.curve, fix.vk.to_string()
+    return lambda: VerifyingKey.from_string(encoded, curve)
+
+
+@operation("point_decode_compressed", "decode a compressed public key")
+def _point_decode_compressed(fix):
+    if fix.edwards:
+        return None
+    curve, encoded = fix.curve, fix.vk.to_string("compressed")
+    return lambda: VerifyingKey.from_string(encoded, curve)
+
+
+@operation("vk_to_der", "encode a public key to DER")
+def _vk_to_der(fix):
+    return fix.vk.to_der
+
+
+@operation("vk_from_der", "decode a public key from DER")
+def _vk_from_der(fix):
+    der = fix.vk.to_der()
+    return lambda: VerifyingKey.from_der(der)
+
+
+@operation("vk_to_pem", "encode a public key to PEM")
+def _vk_to_pem(fix):
+    return fix.vk.to_pem
+
+
+@operation("vk_from_pem", "decode a public key from PEM")
+def _vk_from_pem(fix):
+    pem = fix.vk.to_pem()
+    return lambda: VerifyingKey.from_pem(pem)
+
+
+@operation("vk_to_der_compressed", "encode a public key to compressed DER")
+def _vk_to_der_compressed(fix):
+    if fix.edwards:
+        return None
+    vk = fix.vk
+    return lambda: vk.to_der("compressed")
+
+
+@operation("vk_from_der_compressed", "decode a compressed public key DER")
+def _vk_from_der_compressed(fix):
+    if fix.edwards:
+        return None
+    der = fix.vk.to_der("compressed")
+    return lambda: VerifyingKey.from_der(der)
+
+
+@operation("sk_to_der", "encode a private key to DER")
+def _sk_to_der(fix):
+    sk, fmt = fix.sk, fix.sk_format
+    return lambda: sk.to_der(format=fmt)
+
+
+@operation("sk_from_der", "decode a private key from DER")
+def _sk_from_der(fix):
+    der = fix.sk.to_der(format=fix.sk_format)
+    return lambda: SigningKey.from_der(der)
+
+
+@operation("sk_to_pem", "encode a private key to PEM")
+def _sk_to_pem(fix):
+    sk, fmt = fix.sk, fix.sk_format
+    return lambda: sk.to_pem(format=fmt)
+
+
+@operation("sk_from_pem", "decode a private key from PEM")
+def _sk_from_pem(fix):
+    pem = fix.sk.to_pem(format=fix.sk_format)
+    return lambda: SigningKey.from_pem(pem)
+
+
+@operation("ecdh", "compute a shared secret (X25519/X448 for Edwards)")
+def _ecdh(fix):
+    if fix.edwards:
+        if XDH is None:
+            return None
+        name = "X" + fix.curve.name[2:]
+        ecdh = XDH(name)
+        ecdh.generate_private_key()
+        ecdh.load_received_public_key_bytes(XDH(name).generate_private_key())
+    else:
+        ecdh = ECDH(private_key=fix.sk, public_key=fix.peer_keys[0])
+    return ecdh.generate_sharedsecret_bytes
+
+
+@operation(
+    "ecdh_loop",
+    "compute shared secrets with many public keys one by one",
+    BATCH_SIZE,
+)
+def _ecdh_loop(fix):
+    if fix.edwards:
+        return None
+    ecdh = ECDH(private_key=fix.sk)
+    peer_keys = fix.peer_keys
+
+    def loop():
+        for vk in peer_keys:
+            ecdh.load_received_public_key(vk)
+            ecdh.generate_sharedsecret_bytes()
+
+    return loop
+
+
+@operation(
+    "ecdh_batch",
+    "compute shared secrets with many public keys in one call",
+    BATCH_SIZE,
+)
+def _ecdh_batch(fix):
+    if fix.edwards or not hasattr(ECDH, "generate_sharedsecrets_bytes"):
+        return None
+    ecdh = ECDH(private_key=fix.sk)
+    peer_keys = fix.peer_keys
+    return lambda: ecdh.generate_sharedsecrets_bytes(peer_keys)
+
+
+@operation(
+    "load_pem_bundle",
+    "decode a bundle of PEM public keys, per key",
+    BATCH_SIZE,
+)
+def _load_pem_bundle(fix):
+    if bundle is None:
+        return None
+    pem = b"".join(vk.to_pem() for vk in fix.peer_keys)
+
+    def load():
+        for _ in bundle.iter_keys(io.BytesIO(pem)):
+            pass
+
+    return load
+
+
+def curves():
+    """Return the curves that can be benchmarked."""
+    return list(_curves)
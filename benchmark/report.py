@@ -0,0 +1,90 @@
+"""Formatting and comparison of benchmark results."""
+
+from __future__ import division
+
+from .stats import mean, stdev, welch_t_test
+
+
+_ROW = "{0:>16} {1:<24} {2:>11} {3:>6} {4:>11}"
+_COMPARE_ROW = "{0:>16} {1:<24} {2:>11} {3:>11} {4:>8} {5:>7}  {6}"
+
+
+def format_time(seconds):
+    """Return the time with a unit that keeps the number readable."""
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return "{0:.3f} {1}".format(seconds * scale, unit)
+    return "{0:.3f} ns".format(seconds * 1e9)
+
+
+def header():
+    """Return the header of the result table."""
+    return _ROW.format("curve", "operation", "time/op", "+-%", "op/s")
+
+
+def format_result(result):
+    """Return the row of the result table for a single result."""
+    samples = result["samples"]
+    avg = mean(samples)
+    return _ROW.format(
+        result["curve"],
+        result["operation"],
+        format_time(avg),
+        "{0:.1f}".format(stdev(samples) / avg * 100),
+        "{0:.2f}".format(1 / avg),
+    )
+
+
+def compare_header():
+    """Return the header of the comparison table."""
+    return _COMPARE_ROW.format(
+        "curve", "operation", "baseline", "current", "change", "p", ""
+    ).rstrip()
+
+
+def compare_result(baseline, result, alpha):
+    """
+    Return the row of the comparison table for a single result.
+
+    The change is reported as significant when the two-sided p-value of
+    Welch's t-test is below `alpha`.
+
+    :param dict baseline: result from the baseline run, or ``None``
+    :param dict result: result from the current run
+    :param float alpha: significance level
+    """
+    new = mean(result["samples"])
+    if baseline is None:
+        return _COMPARE_ROW.format(
+            result["curve"],
+            result["operation"],
+            "-",
+            format_time(new),
+            "",
+            "",
+            "not in baseline",
+        )
+    old = mean(baseline["samples"])
+    try:
+        p_value = welch_t_test(baseline["samples"], result["samples"])
+    except ValueError:
+        p_value = None
+    if p_value is None:
+        verdict, p_text = "too few samples", "-"
+    else:
+        p_text = "{0:.3f}".format(p_value)
+        if p_value >= alpha:
+            verdict = "no significant change"
+        elif new < old:
+            verdict = "faster"
+        else:
+            verdict = "slower"
+    return _COMPARE_ROW.format(
+        result["curve"],
+        result["operation"],
+        format_time(old),
+        format_time(new),
+        "{0:+.1f}%".format((new / old - 1) * 100),
+        p_text,
+        verdict,
+    )
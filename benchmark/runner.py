@@ -0,0 +1,49 @@
+"""Timing of the benchmarked operations."""
+
+import timeit
+
+
+def autorange(timer, min_time):
+    """
+    Find the number of loops that take at least `min_time` seconds.
+
+    Like :py:meth:`timeit.Timer.autorange`, but with configurable
+    minimum time and without the limit to powers of 10 (so the slow
+    operations don't take ten times as long as necessary).
+
+    :return: number of loops and the time they took
+    :rtype: tuple(int, float)
+    """
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            return number, elapsed
+        if elapsed <= 0:
+            number *= 10
+        else:
+            # aim a bit over the minimum, so that one more round is enough
+            number = max(number * 2, int(number * min_time * 1.2 / elapsed))
+
+
+def measure(func, items=1, repeat=5, min_time=0.1):
+    """
+    Time the callable.
+
+    :param callable func: the operation to time, called without arguments
+    :param int items: number of items processed by a single call
+    :param int repeat: number of samples to collect
+    :param float min_time: minimal time of a single sample, in seconds
+
+    :return: number of calls in a sample and the samples: times per item,
+        in seconds
+    :rtype: tuple(int, list(float))
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = autorange(timer, min_time)
+    # the first sample includes the warm-up, like filling of caches,
+    # so it's used only for calibration
+    samples = []
+    for _ in range(repeat):
+        samples.append(timer.timeit(number) / number / items)
+    return number, samples
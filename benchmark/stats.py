@@ -0,0 +1,90 @@
+"""
+Statistics for comparison of benchmark results.
+
+Implemented here, as the :py:mod:`statistics` module doesn't provide
+the distribution of Student's t and scipy is too heavy a dependency for
+a benchmark.
+"""
+
+from __future__ import division
+
+import math
+
+
+def mean(samples):
+    """Return arithmetic mean of the samples."""
+    return sum(samples) / len(samples)
+
+
+def stdev(samples):
+    """Return sample standard deviation, 0 for a single sample."""
+    if len(samples) < 2:
+        return 0.0
+    avg = mean(samples)
+    return math.sqrt(sum((i - avg) ** 2 for i in samples) / (len(samples) - 1))
+
+
+def _betacf(a, b, x):
+    """Continued fraction for the incomplete beta function (Lentz)."""
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for num in (
+            m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+            -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1)),
+        ):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def betainc(a, b, x):
+    """Return the regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log(1.0 - x)
+    )
+    # the continued fraction converges quickly only on this side
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(first, second):
+    """
+    Compare means of two sets of samples with Welch's t-test.
+
+    The test doesn't assume that the variances of the sets are equal,
+    which is the case with timings from different library versions.
+
+    :return: two-sided p-value of the hypothesis that the means are equal
+    :rtype: float
+    """
+    n1, n2 = len(first), len(second)
+    if n1 < 2 or n2 < 2:
+        raise ValueError("At least two samples in each set are needed")
+    v1 = stdev(first) ** 2 / n1
+    v2 = stdev(second) ** 2 / n2
+    diff = mean(first) - mean(second)
+    if v1 + v2 == 0:
+        return 1.0 if diff == 0 else 0.0
+    t = diff / math.sqrt(v1 + v2)
+    # Welch-Satterthwaite approximation of degrees of freedom
+    df = (v1 + v2) ** 2 / (v1**2 / (n1 - 1) + v2**2 / (n2 - 1))
+    return betainc(df / 2, 0.5, df / (df + t * t))
@@ -7,6 +7,7 @@ from .keys import (
     BadSignatureError,
     BadDigestError,
     MalformedPointError,
+    warmup,
 )
 from .curves import (
     NIST192p,
@@ -38,6 +39,8 @@ from .curves import (
 )
 from .ecdh import (
     ECDH,
+    EphemeralKeyPool,
+    XDH,
     NoKeyError,
     NoCurveError,
     InvalidCurveError,
@@ -66,10 +69,13 @@ _hush_pyflakes = [
     BadDigestError,
     MalformedPointError,
     UnexpectedDER,
+    warmup,
     InvalidCurveError,
     NoKeyError,
     InvalidSharedSecretError,
     ECDH,
+    EphemeralKeyPool,
+    XDH,
     NoCurveError,
     NIST192p,
     NIST224p,
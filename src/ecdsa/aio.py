@@ -0,0 +1,202 @@
+"""
+Support for signing and verification from :py:mod:`asyncio` code.
+
+Signing and verification are CPU-bound operations that take milliseconds,
+so calling them directly from a coroutine blocks the event loop for that
+time. The :func:`~ecdsa.keys.VerifyingKey.averify` and
+:func:`~ecdsa.keys.SigningKey.asign` methods (that use this module) run
+them in an executor instead.
+
+Concurrent requests that use the same key are coalesced: they are queued
+and sent to the executor in batches of up to `max_batch` requests, so
+a burst of requests needs just a few executor jobs. The queue for every key
+holds at most `max_queue` requests, when it's full the callers wait for
+space in it (providing backpressure), rather than queueing unbounded work.
+
+Note that with the default executor (a thread pool) the operations still
+need the interpreter lock, so the event loop remains responsive, but the
+throughput doesn't increase. Configure a
+:py:class:`concurrent.futures.ProcessPoolExecutor` to use multiple CPU
+cores.
+
+Requires Python 3.5 or later.
+
+Example:
+
+.. code-block:: python
+
+    from concurrent.futures import ProcessPoolExecutor
+    from ecdsa import aio
+
+    aio.configure(executor=ProcessPoolExecutor(4))
+
+    async def handler(request):
+        ...
+        await vk.averify(signature, data)
+"""
+
+import asyncio
+import collections
+import weakref
+
+
+__all__ = ["configure"]
+
+
+_config = {"executor": None, "max_batch": 32, "max_queue": 256}
+
+# event loop -> id of the key -> _Batcher of requests for the key
+_batchers = weakref.WeakKeyDictionary()
+
+
+def configure(executor=None, max_batch=32, max_queue=256):
+    """
+    Set the executor and the batching parameters for asynchronous calls.
+
+    Applies to the batches that are started after the call.
+
+    :param executor: executor to run the operations in, ``None`` for
+        the default executor of the event loop
+    :type executor: concurrent.futures.Executor
+    :param int max_batch: maximum number of requests that are sent to the
+        executor in a single job
+    :param int max_queue: maximum number of requests waiting for processing
+        for a single key
+
+    :raises ValueError: when `max_batch` or `max_queue` is not positive
+    """
+    if max_batch < 1 or max_queue < 1:
+        raise ValueError("Batch and queue sizes must be positive")
+    _config["executor"] = executor
+    _config["max_batch"] = max_batch
+    _config["max_queue"] = max_queue
+
+
+def _run_batch(calls):
+    """Execute the calls, return pairs of success flag and result."""
+    results = []
+    for func, args in calls:
+        try:
+            results.append((True, func(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class _Batcher(object):
+    """Queue of requests that use the same key."""
+
+    def __init__(self, key):
+        # keep the key alive, so that its id is not reused
+        self.key = key
+        self.queue = collections.deque()
+        # callers waiting for space in the queue, functions that build
+        # their requests and put them in the queue
+        self.waiting = collections.deque()
+        self.running = False
+
+
+def _get_loop():
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:  # pragma: no cover
+        # Python 3.6 and earlier
+        return asyncio.get_event_loop()
+
+
+def _start_batch(loop, batchers, batcher):
+    """Send the next batch of queued requests to the executor."""
+    queue, waiting = batcher.queue, batcher.waiting
+    max_queue = _config["max_queue"]
+    # the queue can be empty while callers wait, when the callers before
+    # them gave up waiting (were cancelled)
+    while waiting and not queue:
+        waiting.popleft()()
+    batch = []
+    while len(batch) < _config["max_batch"] and queue:
+        batch.append(queue.popleft())
+    while waiting and len(queue) < max_queue:
+        waiting.popleft()()
+    if not batch:
+        batcher.running = False
+        if batchers.get(id(batcher.key)) is batcher:
+            del batchers[id(batcher.key)]
+        return
+
+    def finish(job):
+        if job.cancelled():
+            # like when the executor was shut down with cancel_futures
+            for _, _, future in batch:
+                future.cancel()
+        else:
+            try:
+                results = job.result()
+            except Exception as e:
+                # the executor failed, not the calls
+                results = [(False, e)] * len(batch)
+            for (_, _, future), (success, value) in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if success:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        _start_batch(loop, batchers, batcher)
+
+    batcher.running = True
+    job = loop.run_in_executor(
+        _config["executor"],
+        _run_batch,
+        [(func, args) for func, args, _ in batch],
+    )
+    job.add_done_callback(finish)
+
+
+def _submit(key, func, args):
+    """Queue the call in the batch for `key`, return future of result."""
+    loop = _get_loop()
+    batchers = _batchers.setdefault(loop, {})
+    batcher = batchers.get(id(key))
+    if batcher is None:
+        batcher = batchers[id(key)] = _Batcher(key)
+
+    future = loop.create_future()
+
+    def enqueue():
+        if not future.cancelled():
+            batcher.queue.append((func, args, future))
+
+    if len(batcher.queue) < _config["max_queue"] and not batcher.waiting:
+        enqueue()
+    else:
+        # wait until the next batch makes space in the queue
+        batcher.waiting.append(enqueue)
+    if not batcher.running:
+        _start_batch(loop, batchers, batcher)
+    return future
+
+
+class _Call(object):
+    """Awaitable that queues the call when it's awaited."""
+
+    def __init__(self, key, func, args):
+        self._request = (key, func, args)
+        self._future = None
+
+    def __await__(self):
+        if self._future is None:
+            self._future = _submit(*self._request)
+        return self._future.__await__()
+
+
+def submit(key, func, args):
+    """
+    Queue the call of `func` with `args` in the batch for `key`.
+
+    Returns awaitable with the result of the call (or its exception).
+    The call is queued when the awaitable is awaited (or scheduled as a
+    task) in the event loop.
+    """
+    # implemented with futures and callbacks, rather than coroutines, so
+    # that the module can be byte-compiled on Python 2 too
+    return _Call(key, func, args)
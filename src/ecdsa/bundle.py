@@ -0,0 +1,344 @@
+"""
+Loading of files with many keys (key bundles).
+
+Bundles are files with concatenated :term:`PEM` blocks (like trust stores)
+or with concatenated :term:`DER` encoded keys. In contrast to
+:func:`~ecdsa.keys.VerifyingKey.from_pem` and
+:func:`~ecdsa.keys.SigningKey.from_pem`, the bundle is read line by line
+(or object by object for DER), so the whole file never needs to be held in
+memory and every block is decoded just once.
+
+Example:
+
+.. code-block:: python
+
+    from ecdsa.bundle import iter_keys, load_keys
+
+    with open("trust-store.pem", "rb") as f:
+        for key in iter_keys(f):
+            print(key.curve.name)
+
+    keys = load_keys("trust-store.pem", processes=4)
+"""
+
+import binascii
+from collections import deque
+from hashlib import sha1, sha256
+from itertools import islice
+from six import text_type
+from . import der
+from ._compat import str_idx_as_int
+from .keys import SigningKey, VerifyingKey
+
+
+__all__ = [
+    "iter_pem_blocks",
+    "iter_der_objects",
+    "iter_keys",
+    "load_keys",
+    "fingerprint",
+]
+
+
+_PUBLIC_KEY_LABELS = (b"PUBLIC KEY",)
+_PRIVATE_KEY_LABELS = (b"EC PRIVATE KEY", b"PRIVATE KEY")
+
+
+def iter_pem_blocks(stream):
+    """
+    Decode all PEM blocks in a stream.
+
+    The stream is processed line by line, text before, after and between
+    the blocks is ignored.
+
+    :param stream: file object (opened in either text or binary mode) or
+        any other iterable of lines
+    :type stream: iterable
+
+    :raises UnexpectedDER: if a block is not terminated, the labels of
+        the BEGIN and END lines don't match, the block has headers
+        (as used for encrypted keys), or the base64 encoding is invalid
+
+    :return: generator of tuples with the label of the block and its
+        decoded contents
+    :rtype: generator of tuple(bytes, bytes)
+    """
+    label = None
+    lines = []
+    for line in stream:
+        if isinstance(line, text_type):
+            line = line.encode()
+        line = line.strip()
+        if label is None:
+            if line.startswith(b"-----BEGIN ") and line.endswith(b"-----"):
+                label = line[11:-5]
+                lines = []
+            continue
+        if line.startswith(b"-----END "):
+            if line[9:-5] != label or not line.endswith(b"-----"):
+                raise der.UnexpectedDER(
+                    "Mismatched END line for PEM block {0!r}".format(label)
+                )
+            try:
+                yield label, binascii.a2b_base64(b"".join(lines))
+            except (binascii.Error, TypeError) as e:
+                raise der.UnexpectedDER(
+                    "Invalid base64 encoding in PEM block: {0}".format(e)
+                )
+            label = None
+            continue
+        if b":" in line:
+            raise der.UnexpectedDER(
+                "PEM blocks with headers (encrypted keys) are not supported"
+            )
+        lines.append(line)
+    if label is not None:
+        raise der.UnexpectedDER("Unterminated PEM block {0!r}".format(label))
+
+
+def _read_exactly(stream, length):
+    data = stream.read(length)
+    if len(data) != length:
+        raise der.UnexpectedDER("Truncated DER object in stream")
+    return data
+
+
+def iter_der_objects(stream):
+    """
+    Split a stream of concatenated DER objects.
+
+    Only the tag and length of the objects are decoded, the values are
+    returned as is.
+
+    :param stream: binary file object
+    :type stream: file object
+
+    :raises UnexpectedDER: if the stream ends in the middle of an object
+        or the length encoding is invalid
+
+    :return: generator of complete DER encoded objects (with tag and
+        length)
+    :rtype: generator of bytes
+    """
+    while True:
+        header = stream.read(2)
+        if not header:
+            return
+        if len(header) != 2:
+            raise der.UnexpectedDER("Truncated DER object in stream")
+        llen = str_idx_as_int(header, 1)
+        if llen & 0x80:
+            header += _read_exactly(stream, llen & 0x7F)
+        length, _ = der.read_length(header[1:])
+        yield header + _read_exactly(stream, length)
+
+
+def _decode_key(item):
+    """Convert the (kind, der, options) tuple to a key object."""
+    kind, encoded, hashfunc, valid_encodings, valid_curve_encodings = item
+    if kind is None:
+        # SubjectPublicKeyInfo starts with a SEQUENCE (the algorithm
+        # identifier), the private key formats with an INTEGER (version)
+        kind = der.Reader(encoded).read_sequence().is_sequence()
+    if kind:
+        return VerifyingKey.from_der(
+            encoded,
+            hashfunc=hashfunc,
+            valid_encodings=valid_encodings,
+            valid_curve_encodings=valid_curve_encodings,
+        )
+    return SigningKey.from_der(
+        encoded, hashfunc=hashfunc, valid_curve_encodings=valid_curve_encodings
+    )
+
+
+def _decode_keys(items):
+    """Convert a chunk of the (kind, der, options) tuples to key objects."""
+    return [_decode_key(i) for i in items]
+
+
+def _decode_in_pool(pool, items, chunksize, max_pending):
+    """
+    Decode the keys in the pool, in order.
+
+    Only `max_pending` chunks of `chunksize` items are read from `items`
+    ahead of the returned keys, so the input is consumed as the keys are
+    decoded, not all at once.
+    """
+    pending = deque()
+    while True:
+        chunk = list(islice(items, chunksize))
+        if chunk:
+            pending.append(pool.apply_async(_decode_keys, (chunk,)))
+        if not pending:
+            return
+        if not chunk or len(pending) >= max_pending:
+            for key in pending.popleft().get():
+                yield key
+
+
+def _iter_encoded(
+    stream, encoding, hashfunc, valid_encodings, valid_curve_encodings
+):
+    """Convert the stream to the arguments of _decode_key()."""
+    if encoding == "pem":
+        for label, encoded in iter_pem_blocks(stream):
+            if label in _PUBLIC_KEY_LABELS:
+                kind = True
+            elif label in _PRIVATE_KEY_LABELS:
+                kind = False
+            else:
+                # certificates, curve parameters, etc.
+                continue
+            yield (
+                kind,
+                encoded,
+                hashfunc,
+                valid_encodings,
+                valid_curve_encodings,
+            )
+    elif encoding == "der":
+        for encoded in iter_der_objects(stream):
+            yield (
+                None,
+                encoded,
+                hashfunc,
+                valid_encodings,
+                valid_curve_encodings,
+            )
+    else:
+        raise ValueError("Only 'pem' and 'der' encodings are supported")
+
+
+def _open(source):
+    """Return file object and a flag if it needs to be closed by caller."""
+    if isinstance(source, (str, text_type)):
+        return open(source, "rb"), True
+    return source, False
+
+
+def iter_keys(
+    source,
+    encoding="pem",
+    hashfunc=sha1,
+    valid_encodings=None,
+    valid_curve_encodings=None,
+):
+    """
+    Lazily decode all keys in a bundle.
+
+    For PEM bundles, blocks labeled ``PUBLIC KEY`` are decoded as
+    :class:`~ecdsa.keys.VerifyingKey` objects, blocks labeled
+    ``EC PRIVATE KEY`` and ``PRIVATE KEY`` as
+    :class:`~ecdsa.keys.SigningKey` objects. Other blocks (like
+    ``EC PARAMETERS`` or ``CERTIFICATE``) are skipped. For DER bundles,
+    the type of the key is detected from the structure of the encoding.
+
+    See :func:`~ecdsa.keys.VerifyingKey.from_der` and
+    :func:`~ecdsa.keys.SigningKey.from_der` for the supported formats.
+
+    :param source: path to the file or a file object with the bundle
+        (binary for DER, binary or text for PEM)
+    :type source: str or file object
+    :param str encoding: ``pem`` or ``der``
+    :param callable hashfunc: The default hash function that will be used
+        for signing and verification with the returned keys
+    :param valid_encodings: list of allowed point encodings of public keys,
+        see :func:`~ecdsa.keys.VerifyingKey.from_der`
+    :type valid_encodings: :term:`set-like object`
+    :param valid_curve_encodings: list of allowed encoding formats
+        for curve parameters. By default (``None``) all are supported:
+        ``named_curve`` and ``explicit``.
+    :type valid_curve_encodings: :term:`set-like object`
+
+    :raises UnexpectedDER: if the encoding of the bundle or any of the
+        keys in it is malformed
+    :raises MalformedPointError: if any of the public keys is invalid
+
+    :return: generator of keys in the order they appear in the bundle
+    :rtype: generator of VerifyingKey and SigningKey objects
+    """
+    stream, close = _open(source)
+    try:
+        for item in _iter_encoded(
+            stream, encoding, hashfunc, valid_encodings, valid_curve_encodings
+        ):
+            yield _decode_key(item)
+    finally:
+        if close:
+            stream.close()
+
+
+def fingerprint(key, hashfunc=sha256):
+    """
+    Calculate the fingerprint of a key.
+
+    The fingerprint is the hash of the DER encoding of the public key
+    (the SubjectPublicKeyInfo structure, with uncompressed point), so a
+    private key has the same fingerprint as its public key and the
+    encoding of the point in the source file doesn't matter.
+
+    :param key: key to calculate the fingerprint of
+    :type key: VerifyingKey or SigningKey
+    :param callable hashfunc: hash function to use
+
+    :return: hex encoded fingerprint
+    :rtype: str
+    """
+    if isinstance(key, SigningKey):
+        key = key.verifying_key
+    return hashfunc(key.to_der()).hexdigest()
+
+
+def load_keys(
+    source,
+    encoding="pem",
+    hashfunc=sha1,
+    valid_encodings=None,
+    valid_curve_encodings=None,
+    processes=None,
+    chunksize=64,
+):
+    """
+    Decode all keys in a bundle into a dictionary keyed by fingerprints.
+
+    When the bundle includes the same key multiple times (or both the
+    private and public key of a pair), the last one is kept.
+
+    Decoding of the keys (and verification that the public keys are
+    valid) can be performed in a :py:class:`multiprocessing.Pool` by
+    setting the `processes` parameter. The file is still read in the
+    calling process, one chunk of keys at a time, and at most two chunks
+    per worker process are read ahead of the decoded keys.
+
+    See :func:`iter_keys` for description of the parameters shared with it.
+
+    :param int processes: number of worker processes to use, ``None`` to
+        decode the keys in the calling process
+    :param int chunksize: number of keys sent to a worker process at a time
+
+    :return: dictionary with :func:`fingerprint` of the keys as keys
+    :rtype: dict
+    """
+    stream, close = _open(source)
+    try:
+        items = _iter_encoded(
+            stream, encoding, hashfunc, valid_encodings, valid_curve_encodings
+        )
+        if not processes:
+            return dict((fingerprint(k), k) for k in map(_decode_key, items))
+
+        import multiprocessing
+
+        pool = multiprocessing.Pool(processes)
+        try:
+            return dict(
+                (fingerprint(k), k)
+                for k in _decode_in_pool(pool, items, chunksize, 2 * processes)
+            )
+        finally:
+            pool.terminate()
+            pool.join()
+    finally:
+        if close:
+            stream.close()
@@ -1,5 +1,7 @@
 from __future__ import division
 
+import threading
+from collections import namedtuple
 from six import PY2
 from . import der, ecdsa, ellipticcurve, eddsa
 from .util import orderlen, number_to_string, string_to_number
@@ -24,6 +26,7 @@ __all__ = [
     "curves",
     "find_curve",
     "curve_by_name",
+    "register_curve",
     "SECP256k1",
     "BRAINPOOLP160r1",
     "BRAINPOOLP160t1",
@@ -89,6 +92,30 @@ class Curve:
     def __repr__(self):
         return self.name
 
+    def __reduce__(self):
+        # pickle the well known curves by OID, so that the unpickled object
+        # is the one from this module, with the generator precomputation
+        # table already calculated
+        # (on Python 2 Curve is an old-style class and pickle doesn't use
+        # this method, it pickles the instance dictionary instead)
+        if self.oid:
+            try:
+                known = find_curve(self.oid)
+            except UnknownCurveError:
+                known = None
+            if known is self or known == self:
+                return (find_curve, (self.oid,))
+        return (
+            Curve,
+            (
+                self.name,
+                self.curve,
+                self.generator,
+                self.oid,
+                self.openssl_name,
+            ),
+        )
+
     def to_der(self, encoding=None, point_encoding="uncompressed"):
         """Serialise the curve parameters to binary string.
 
@@ -250,14 +277,12 @@ class Curve:
             order=order,
             generator=True,
         )
-        tmp_curve = Curve("unknown", curve_fp, base, None)
-
         # if the curve matches one of the well-known ones, use the well-known
         # one in preference, as it will have the OID and name associated
-        for i in curves:
-            if tmp_curve == i:
-                return i
-        return tmp_curve
+        known = _get_index().by_params.get(_params_key(curve_fp, base))
+        if known is not None:
+            return known
+        return Curve("unknown", curve_fp, base, None)
 
     @classmethod
     def from_pem(cls, string, valid_encodings=None):
@@ -546,6 +571,92 @@ curves = [
 ]
 
 
+# indexes over the ``curves`` list, the first curve in the list wins in case
+# of duplicates, same as it would with a linear search
+#
+# The indexes are never modified after they are built, changes are made
+# by building new ones and replacing the whole tuple with a single
+# assignment, so the lookups don't need a lock and never see a partially
+# built index.
+_CurveIndex = namedtuple("_CurveIndex", "count by_oid by_name by_params")
+
+
+def _params_key(curve_fp, generator):
+    """Return the key identifying a short Weierstrass curve with generator."""
+    p = curve_fp.p()
+    return (
+        p,
+        curve_fp.a() % p,
+        curve_fp.b() % p,
+        generator.x(),
+        generator.y(),
+    )
+
+
+def _build_index(curve_list):
+    """Return new indexes of the curves in the list."""
+    by_oid = {}
+    by_name = {}
+    by_params = {}
+    for curve in curve_list:
+        if curve.oid:
+            by_oid.setdefault(curve.oid, curve)
+        by_name.setdefault(curve.name, curve)
+        if curve.openssl_name:
+            by_name.setdefault(curve.openssl_name, curve)
+        if isinstance(curve.curve, ellipticcurve.CurveFp):
+            by_params.setdefault(
+                _params_key(curve.curve, curve.generator), curve
+            )
+    return _CurveIndex(len(curve_list), by_oid, by_name, by_params)
+
+
+_index = _build_index(curves)
+_register_lock = threading.Lock()
+
+
+def _get_index():
+    """Return the indexes of all curves from the ``curves`` list."""
+    global _index
+    index = _index
+    if index.count != len(curves):
+        # the list was modified directly, not through register_curve()
+        index = _index = _build_index(list(curves))
+    return index
+
+
+def register_curve(curve):
+    """Add a curve to the list of known curves.
+
+    Registered curves can be looked up with :func:`find_curve` and
+    :func:`curve_by_name`, and will be used when decoding keys that
+    specify the curve by OID or by explicit parameters.
+
+    :param curve: the curve to register
+    :type curve: ~ecdsa.curves.Curve
+
+    :raises ValueError: when a different curve with the same OID or name
+        is already registered
+    """
+    global _index
+    with _register_lock:
+        index = _get_index()
+        if any(c is curve for c in curves):
+            return
+        if curve.oid and curve.oid in index.by_oid:
+            raise ValueError(
+                "Curve with OID {0} already registered".format(curve.oid)
+            )
+        for name in (curve.name, curve.openssl_name):
+            if name and name in index.by_name:
+                raise ValueError(
+                    "Curve with name {0!r} already registered".format(name)
+                )
+        new_index = _build_index(curves + [curve])
+        curves.append(curve)
+        _index = new_index
+
+
 def find_curve(oid_curve):
     """Select a curve based on its OID
 
@@ -557,9 +668,10 @@ def find_curve(oid_curve):
 
     :rtype: ~ecdsa.curves.Curve
     """
-    for c in curves:
-        if c.oid == oid_curve:
-            return c
+    try:
+        return _get_index().by_oid[oid_curve]
+    except (KeyError, TypeError):
+        pass
     raise UnknownCurveError(
         "I don't know about the curve with oid %s."
         "I only know about these: %s" % (oid_curve, [c.name for c in curves])
@@ -580,9 +692,10 @@ def curve_by_name(name):
 
     :rtype: ~ecdsa.curves.Curve
     """
-    for c in curves:
-        if name == c.name or (c.openssl_name and name == c.openssl_name):
-            return c
+    try:
+        return _get_index().by_name[name]
+    except (KeyError, TypeError):
+        pass
     raise UnknownCurveError(
         "Curve with name {0!r} unknown, only curves supported: {1}".format(
             name, [c.name for c in curves]
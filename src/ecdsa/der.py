@@ -5,7 +5,8 @@ import base64
 import warnings
 from itertools import chain
 from six import int2byte, text_type
-from ._compat import compat26_str, str_idx_as_int
+from ._compat import compat26_str, str_idx_as_int, normalise_bytes
+from ._compat import bytes_to_int, int_to_bytes, bit_length
 
 
 class UnexpectedDER(Exception):
@@ -42,20 +43,45 @@ def encode_implicit(tag, value, cls="context-specific"):
     return int2byte(tag_class + tag) + encode_length(len(value)) + value
 
 
+def _integer_value(r):
+    """Return the minimal, two's complement, encoding of non-negative int."""
+    # DER integers are two's complement, so if the most significant bit
+    # is set, we need an extra 0x00 byte to prevent it from looking negative
+    # int_to_bytes() returns a bytearray, that would make the whole
+    # encoding a bytearray on Python 2
+    return bytes(int_to_bytes(r, bit_length(r) // 8 + 1))
+
+
 def encode_integer(r):
     assert r >= 0  # can't support negative numbers yet
-    h = ("%x" % r).encode()
-    if len(h) % 2:
-        h = b"0" + h
-    s = binascii.unhexlify(h)
-    num = str_idx_as_int(s, 0)
-    if num <= 0x7F:
-        return b"\x02" + encode_length(len(s)) + s
-    else:
-        # DER integers are two's complement, so if the first byte is
-        # 0x80-0xff then we need an extra 0x00 byte to prevent it from
-        # looking negative.
-        return b"\x02" + encode_length(len(s) + 1) + b"\x00" + s
+    s = _integer_value(r)
+    return b"\x02" + encode_length(len(s)) + s
+
+
+def encode_ecdsa_sig_value(r, s):
+    """
+    Encode the ECDSA signature as the Ecdsa-Sig-Value structure.
+
+    Faster equivalent of
+    ``encode_sequence(encode_integer(r), encode_integer(s))``.
+
+    :param int r: the ``r`` value of the signature
+    :param int s: the ``s`` value of the signature
+
+    :rtype: bytes
+    """
+    assert r >= 0 and s >= 0
+    r_val = _integer_value(r)
+    s_val = _integer_value(s)
+    body = (
+        b"\x02"
+        + encode_length(len(r_val))
+        + r_val
+        + b"\x02"
+        + encode_length(len(s_val))
+        + s_val
+    )
+    return b"\x30" + encode_length(len(body)) + body
 
 
 # sentry object to check if an argument was specified (used to detect
@@ -430,6 +456,306 @@ def remove_bitstring(string, expect_unused=_sentry):
     return body, rest
 
 
+class Reader(object):
+    """
+    Cursor for decoding :term:`DER` encoded data without copying it.
+
+    In contrast to the ``remove_*()`` functions, which return the remaining
+    data as a new string every time, the reader keeps only an offset into
+    the original buffer. The values are returned as :py:class:`memoryview`
+    slices of it and nested structures as new readers over the same buffer.
+
+    The decoding follows the same rules (and has the same strictness) as the
+    ``remove_*()`` functions.
+
+    :param data: the DER encoded data
+    :type data: :term:`bytes-like object`
+    """
+
+    __slots__ = ("_data", "_pos", "_end")
+
+    def __init__(self, data):
+        self._data = normalise_bytes(data)
+        self._pos = 0
+        self._end = len(self._data)
+
+    def _sub_reader(self, start, end):
+        """Create reader over the part of the buffer of this reader."""
+        reader = Reader.__new__(Reader)
+        reader._data = self._data
+        reader._pos = start
+        reader._end = end
+        return reader
+
+    def empty(self):
+        """Return True if all the data has been read."""
+        return self._pos >= self._end
+
+    def remaining(self):
+        """Return the data that was not read yet, without consuming it."""
+        return self._data[self._pos : self._end]
+
+    def is_sequence(self):
+        """Return True if the next object is a SEQUENCE."""
+        return (
+            not self.empty() and str_idx_as_int(self._data, self._pos) == 0x30
+        )
+
+    def _read_length(self, pos):
+        """
+        Decode the length of object starting at `pos`.
+
+        :return: a tuple with the decoded length and the position of the
+            first byte of the value
+        """
+        data = self._data
+        if pos >= self._end:
+            raise UnexpectedDER("Empty string can't encode valid length value")
+        num = str_idx_as_int(data, pos)
+        if not (num & 0x80):
+            # short form
+            return num, pos + 1
+        # long form: num&0x7f is number of additional base256 length bytes,
+        # big-endian
+        llen = num & 0x7F
+        if not llen:
+            raise UnexpectedDER(
+                "Invalid length encoding, length of length is 0"
+            )
+        if llen > self._end - pos - 1:
+            raise UnexpectedDER("Length of length longer than provided buffer")
+        # verify that the encoding is minimal possible (DER requirement)
+        msb = str_idx_as_int(data, pos + 1)
+        if not msb or llen == 1 and msb < 0x80:
+            raise UnexpectedDER("Not minimal encoding of length")
+        return (
+            bytes_to_int(data[pos + 1 : pos + 1 + llen], "big"),
+            pos + 1 + llen,
+        )
+
+    def _read_tlv(
+        self,
+        tag,
+        empty_msg,
+        wanted_msg,
+        length_msg="Length longer than the provided buffer",
+    ):
+        """
+        Read an object with the specified tag.
+
+        The error messages are the same as the ones raised by the
+        corresponding ``remove_*()`` function; `wanted_msg` is formatted
+        with the tag that was found.
+
+        :return: tuple with the start and end positions of the object value
+        """
+        pos = self._pos
+        end = self._end
+        if pos >= end:
+            raise UnexpectedDER(empty_msg)
+        data = self._data
+        num = str_idx_as_int(data, pos)
+        if num != tag:
+            raise UnexpectedDER(wanted_msg % num)
+        if pos + 1 < end and str_idx_as_int(data, pos + 1) < 0x80:
+            # short form of length, the most common case
+            length = str_idx_as_int(data, pos + 1)
+            start = pos + 2
+        else:
+            length, start = self._read_length(pos + 1)
+        if length > end - start:
+            raise UnexpectedDER(length_msg)
+        self._pos = start + length
+        return start, self._pos
+
+    def read_sequence(self):
+        """
+        Read a SEQUENCE.
+
+        :return: reader over the elements of the sequence
+        :rtype: Reader
+        """
+        start, end = self._read_tlv(
+            0x30,
+            "Empty string does not encode a sequence",
+            "wanted type 'sequence' (0x30), got 0x%02x",
+        )
+        return self._sub_reader(start, end)
+
+    def read_constructed(self):
+        """
+        Read an explicitly tagged, context-specific, object.
+
+        :return: tuple with the tag value and a reader over the object
+        :rtype: tuple(int, Reader)
+        """
+        if self.empty():
+            raise UnexpectedDER("Empty string does not encode a constructed")
+        s0 = str_idx_as_int(self._data, self._pos)
+        if (s0 & 0xE0) != 0xA0:
+            raise UnexpectedDER(
+                "wanted type 'constructed tag' (0xa0-0xbf), got 0x%02x" % s0
+            )
+        start, end = self._read_tlv(
+            s0,
+            "Empty string does not encode a constructed",
+            "wanted type 'constructed tag' (0xa0-0xbf), got 0x%02x",
+        )
+        return s0 & 0x1F, self._sub_reader(start, end)
+
+    def read_octet_string(self):
+        """
+        Read an OCTET STRING.
+
+        :rtype: memoryview
+        """
+        start, end = self._read_tlv(
+            0x04,
+            "Empty string does not encode an octet string",
+            "wanted type 'octetstring' (0x04), got 0x%02x",
+        )
+        return self._data[start:end]
+
+    def read_integer(self):
+        """
+        Read a non-negative INTEGER.
+
+        :rtype: int
+        """
+        start, end = self._read_tlv(
+            0x02,
+            "Empty string is an invalid encoding of an integer",
+            "wanted type 'integer' (0x02), got 0x%02x",
+            "Length longer than provided buffer",
+        )
+        data = self._data
+        if start == end:
+            raise UnexpectedDER("0-byte long encoding of integer")
+        msb = str_idx_as_int(data, start)
+        if not msb < 0x80:
+            raise UnexpectedDER("Negative integers are not supported")
+        # check if the encoding is the minimal one (DER requirement)
+        if end - start > 1 and not msb:
+            # leading zero byte is allowed if the integer would have been
+            # considered a negative number otherwise
+            if str_idx_as_int(data, start + 1) < 0x80:
+                raise UnexpectedDER(
+                    "Invalid encoding of integer, unnecessary "
+                    "zero padding bytes"
+                )
+        return bytes_to_int(data[start:end], "big")
+
+    def read_object(self):
+        """
+        Read an OBJECT IDENTIFIER.
+
+        :rtype: tuple(int, ...)
+        """
+        start, end = self._read_tlv(
+            0x06,
+            "Empty string does not encode an object identifier",
+            "wanted type 'object' (0x06), got 0x%02x",
+            "Length of object identifier longer than the provided buffer",
+        )
+        if start == end:
+            raise UnexpectedDER("Empty object identifier")
+        data = self._data
+        numbers = []
+        pos = start
+        while pos < end:
+            if str_idx_as_int(data, pos) == 0x80:
+                raise UnexpectedDER(
+                    "Non minimal encoding of OID subidentifier"
+                )
+            # base-128 big endian, with most significant bit set in all
+            # but the last byte
+            number = 0
+            while True:
+                if pos >= end:
+                    raise UnexpectedDER("ran out of length bytes")
+                d = str_idx_as_int(data, pos)
+                number = (number << 7) + (d & 0x7F)
+                pos += 1
+                if not d & 0x80:
+                    break
+            numbers.append(number)
+        n0 = numbers[0]
+        if n0 < 80:
+            first = n0 // 40
+        else:
+            first = 2
+        numbers[0] = n0 - (40 * first)
+        numbers.insert(0, first)
+        return tuple(numbers)
+
+    def read_bitstring(self, expect_unused):
+        """
+        Read a BIT STRING.
+
+        See :func:`remove_bitstring` for the meaning of `expect_unused`,
+        with the exception that it's not optional.
+
+        :rtype: memoryview or tuple(memoryview, int)
+        """
+        start, end = self._read_tlv(
+            0x03,
+            "Empty string does not encode a bitstring",
+            "wanted bitstring (0x03), got 0x%02x",
+        )
+        if start == end:
+            raise UnexpectedDER("Invalid length of bit string, can't be 0")
+        data = self._data
+        unused = str_idx_as_int(data, start)
+        if not 0 <= unused <= 7:
+            raise UnexpectedDER("Invalid encoding of unused bits")
+        if expect_unused is not None and expect_unused != unused:
+            raise UnexpectedDER("Unexpected number of unused bits")
+        body = data[start + 1 : end]
+        if unused:
+            if not body:
+                raise UnexpectedDER("Invalid encoding of empty bit string")
+            last = str_idx_as_int(body, -1)
+            # verify that all the unused bits are set to zero (DER requirement)
+            if last & (2**unused - 1):
+                raise UnexpectedDER("Non zero padding bits in bit string")
+        if expect_unused is None:
+            return body, unused
+        return body
+
+
+def decode_ecdsa_sig_value(string):
+    """
+    Decode the Ecdsa-Sig-Value structure with an ECDSA signature.
+
+    Equivalent of decoding the signature with :func:`remove_sequence`
+    and two calls to :func:`remove_integer`, with the same strictness,
+    but without copying the data. The whole `string` must be consumed.
+
+    :param string: DER encoded signature
+    :type string: :term:`bytes-like object`
+
+    :raises UnexpectedDER: when the encoding is invalid
+
+    :return: the ``r`` and ``s`` values of the signature
+    :rtype: tuple(int, int)
+    """
+    reader = Reader(string)
+    seq = reader.read_sequence()
+    if not reader.empty():
+        raise UnexpectedDER(
+            "trailing junk after DER sig: %s"
+            % binascii.hexlify(reader.remaining())
+        )
+    r = seq.read_integer()
+    s = seq.read_integer()
+    if not seq.empty():
+        raise UnexpectedDER(
+            "trailing junk after DER numbers: %s"
+            % binascii.hexlify(seq.remaining())
+        )
+    return r, s
+
+
 # SEQUENCE([1, STRING(secexp), cont[0], OBJECT(curvename), cont[1], BINTSTRING)
 
 
@@ -1,14 +1,26 @@
 """
 Class for performing Elliptic-curve Diffie-Hellman (ECDH) operations.
+
+Also includes the X25519 and X448 key agreement functions (RFC 7748) and
+the :class:`XDH` class for performing key agreement with them.
 """
 
+import os
+import threading
+from collections import deque
 from .util import number_to_string
-from .ellipticcurve import INFINITY
+from .ellipticcurve import INFINITY, PointJacobi
 from .keys import SigningKey, VerifyingKey
+from .numbertheory import inverse_mod
+from ._compat import bytes_to_int, int_to_bytes, normalise_bytes
 
 
 __all__ = [
     "ECDH",
+    "EphemeralKeyPool",
+    "XDH",
+    "x25519",
+    "x448",
     "NoKeyError",
     "NoCurveError",
     "InvalidCurveError",
@@ -50,7 +62,13 @@ class ECDH(object):
     pair, to establish a shared secret over an insecure channel
     """
 
-    def __init__(self, curve=None, private_key=None, public_key=None):
+    def __init__(
+        self,
+        curve=None,
+        private_key=None,
+        public_key=None,
+        use_ladder=False,
+    ):
         """
         ECDH init.
 
@@ -65,10 +83,17 @@ class ECDH(object):
         :type private_key: SigningKey
         :param public_key:  `their` public key for ECDH
         :type public_key: VerifyingKey
+        :param bool use_ladder: compute the shared secrets with the
+            co-Z Montgomery ladder of
+            :func:`ecdsa.ellipticcurve.PointJacobi.mul_x` (including its
+            fallbacks to the regular multiplication), which is slower than
+            the default multiplication. Note that neither method provides
+            protection against side-channel attacks.
         """
         self.curve = curve
         self.private_key = None
         self.public_key = None
+        self.use_ladder = use_ladder
         if private_key:
             self.load_private_key(private_key)
         if public_key:
@@ -83,21 +108,48 @@ class ECDH(object):
             raise NoKeyError(
                 "Public key needs to be set to create shared secret"
             )
-        if not (
-            self.private_key.curve == self.curve == remote_public_key.curve
-        ):
-            raise InvalidCurveError(
-                "Curves for public key and private key is not equal."
+        return self._get_shared_secrets([remote_public_key])[0]
+
+    def _get_shared_secrets(self, remote_public_keys):
+        if not self.private_key:
+            raise NoKeyError(
+                "Private key needs to be set to create shared secret"
             )
+        points = []
+        for remote_public_key in remote_public_keys:
+            if not (
+                self.private_key.curve == self.curve == remote_public_key.curve
+            ):
+                raise InvalidCurveError(
+                    "Curves for public key and private key is not equal."
+                )
+            points.append(remote_public_key.pubkey.point)
 
         # shared secret = PUBKEYtheirs * PRIVATEKEYours
-        result = (
-            remote_public_key.pubkey.point
-            * self.private_key.privkey.secret_multiplier
-        )
-        if result == INFINITY:
+        secret_multiplier = self.private_key.privkey.secret_multiplier
+        if (
+            not self.use_ladder
+            and len(points) > 1
+            and all(isinstance(point, PointJacobi) for point in points)
+        ):
+            # for a single point the setup of the batch doesn't pay off
+            results = PointJacobi.batch_mul_x(points, secret_multiplier)
+        else:
+            results = [
+                self._mul_x(point, secret_multiplier) for point in points
+            ]
+        if any(result is None for result in results):
             raise InvalidSharedSecretError("Invalid shared secret (INFINITY).")
 
+        return results
+
+    def _mul_x(self, point, multiplier):
+        """Return x coordinate of point * multiplier, None for infinity."""
+        if self.use_ladder and isinstance(point, PointJacobi):
+            return point.mul_x(multiplier)
+        result = point * multiplier
+        if result == INFINITY:
+            return None
         return result.x()
 
     def set_curve(self, key_curve):
@@ -109,15 +161,24 @@ class ECDH(object):
         """
         self.curve = key_curve
 
-    def generate_private_key(self):
+    def generate_private_key(self, pool=None):
         """
         Generate local private key for ecdh operation with curve that was set.
 
+        :param pool: pool of pre-generated key pairs to take the key
+            from, if the curve is not set, the curve of the pool is used
+        :type pool: EphemeralKeyPool
+
         :raises NoCurveError: Curve must be set before key generation.
+        :raises InvalidCurveError: pool uses different curve than self.curve
 
         :return: public (verifying) key from this private key.
         :rtype: VerifyingKey
         """
+        if pool is not None:
+            if self.curve and self.curve != pool.curve:
+                raise InvalidCurveError("Curve mismatch.")
+            return self.load_private_key(pool.get())
         if not self.curve:
             raise NoCurveError("Curve must be set prior to key generation.")
         return self.load_private_key(SigningKey.generate(curve=self.curve))
@@ -237,6 +298,30 @@ class ECDH(object):
             raise InvalidCurveError("Curve mismatch.")
         self.public_key = public_key
 
+    def precompute_public_key(self, lazy=False):
+        """
+        Precompute multiplication tables for the received public key.
+
+        Makes calculation of shared secrets with the received public key
+        as fast as generation of public keys, at the cost of time
+        comparable to calculating few dozen shared secrets. Useful when
+        the same remote public key is used with many local private keys,
+        like in ECIES encryption to a static recipient key: the tables
+        are kept when new private keys are generated or loaded.
+
+        The tables are stored in the VerifyingKey object of the received
+        public key, see :func:`~ecdsa.keys.VerifyingKey.precompute`.
+
+        :param bool lazy: whether to calculate the precomputation table now
+           (if set to False) or if it should be delayed to the time of first
+           use (when set to True)
+
+        :raises NoKeyError: public_key is not set
+        """
+        if not self.public_key:
+            raise NoKeyError("Public key needs to be set to precompute it")
+        self.public_key.precompute(lazy)
+
     def load_received_public_key_bytes(
         self, public_key_str, valid_encodings=None
     ):
@@ -334,3 +419,402 @@ class ECDH(object):
         :rtype: int
         """
         return self._get_shared_secret(self.public_key)
+
+    def generate_sharedsecrets(self, peer_keys):
+        """
+        Generate shared secrets from local private key and many public keys.
+
+        Faster than loading the public keys one by one and calling
+        :func:`generate_sharedsecret` for each of them, see
+        :func:`ecdsa.ellipticcurve.PointJacobi.batch_mul_x`. With
+        `use_ladder` set, the shared secrets are computed one by one.
+
+        The received public key (if any) is not used nor modified.
+
+        :param peer_keys: public keys of the remote parties
+        :type peer_keys: iterable of VerifyingKey
+
+        :raises InvalidCurveError: any of the public keys uses different
+            curve than the private key
+        :raises NoKeyError: private_key is not set
+        :raises InvalidSharedSecretError: any of the shared secrets is
+            the point at infinity
+
+        :return: shared secrets, in the order of the public keys
+        :rtype: list of int
+        """
+        return self._get_shared_secrets(peer_keys)
+
+    def generate_sharedsecrets_bytes(self, peer_keys):
+        """
+        Generate shared secrets from local private key and many public keys.
+
+        See :func:`generate_sharedsecrets` for details.
+
+        :param peer_keys: public keys of the remote parties
+        :type peer_keys: iterable of VerifyingKey
+
+        :raises InvalidCurveError: any of the public keys uses different
+            curve than the private key
+        :raises NoKeyError: private_key is not set
+        :raises InvalidSharedSecretError: any of the shared secrets is
+            the point at infinity
+
+        :return: shared secrets, in the order of the public keys
+        :rtype: list of bytes
+        """
+        secrets = self.generate_sharedsecrets(peer_keys)
+        p = self.private_key.curve.curve.p()
+        return [number_to_string(secret, p) for secret in secrets]
+
+
+class EphemeralKeyPool(object):
+    """
+    Pool of pre-generated key pairs for ephemeral ECDH.
+
+    Generation of a key pair needs a scalar multiplication of the curve
+    generator. The pool keeps up to `size` key pairs ready and generates
+    new ones in a background thread, so that handshakes that use
+    :func:`ECDH.generate_private_key` with the pool don't have to wait
+    for it. Note that the background thread still competes for the
+    interpreter with other threads, so the pool helps with latency of
+    the handshakes, not with throughput of a busy process.
+
+    Every key pair is returned just once. When the process forks, the
+    child process discards the key pairs inherited from the parent on
+    first use of the pool and starts its own background thread.
+
+    Example:
+
+    .. code-block:: python
+
+        pool = EphemeralKeyPool(NIST256p, size=32)
+        ecdh = ECDH(curve=NIST256p)
+        ecdh.generate_private_key(pool)
+        ...
+        pool.close()
+
+    :ivar curve: curve of the key pairs
+    :vartype curve: ~ecdsa.curves.Curve
+    :ivar int size: number of key pairs the pool keeps ready
+    """
+
+    def __init__(self, curve, size=16, entropy=None):
+        """
+        Create the pool and start the background thread.
+
+        :param curve: curve for the key pairs
+        :type curve: ~ecdsa.curves.Curve
+        :param int size: number of key pairs to keep ready
+        :param callable entropy: source of randomness for the private keys,
+            see :func:`~ecdsa.keys.SigningKey.generate`
+
+        :raises ValueError: when `size` is not positive
+        """
+        if size < 1:
+            raise ValueError("Pool size must be positive")
+        self.curve = curve
+        self.size = size
+        self._entropy = entropy
+        self._closed = False
+        self._reset()
+        self._start()
+
+    def _reset(self):
+        """Drop all key pairs and the synchronisation state."""
+        self._pid = os.getpid()
+        self._keys = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _generate(self):
+        return SigningKey.generate(curve=self.curve, entropy=self._entropy)
+
+    def _refill(self, cond, keys):
+        """Keep generating key pairs until the pool is full or closed."""
+        while True:
+            with cond:
+                while not self._closed and len(keys) >= self.size:
+                    cond.wait()
+                if self._closed:
+                    return
+            key = self._generate()
+            with cond:
+                keys.append(key)
+
+    def _start(self):
+        """Start the background thread, if it's not running already."""
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(
+                target=self._refill, args=(self._cond, self._keys)
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _check_fork(self):
+        # the background thread doesn't exist in a forked process and the
+        # key pairs must not be shared with the parent process
+        if self._pid != os.getpid():
+            self._reset()
+
+    def __len__(self):
+        """Return the number of key pairs ready in the pool."""
+        self._check_fork()
+        return len(self._keys)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self):
+        """
+        Take a key pair from the pool.
+
+        When the pool is empty, the key pair is generated in the calling
+        thread.
+
+        :raises ValueError: when the pool was closed
+
+        :return: private key with the public key already calculated
+        :rtype: ~ecdsa.keys.SigningKey
+        """
+        self._check_fork()
+        with self._cond:
+            if self._closed:
+                raise ValueError("Key pool is closed")
+            self._start()
+            key = self._keys.popleft() if self._keys else None
+            self._cond.notify()
+        if key is None:
+            key = self._generate()
+        return key
+
+    def close(self):
+        """
+        Stop the background thread and drop all the key pairs.
+
+        The thread is not waited for, it will exit after generating the
+        key pair it's working on (if any).
+        """
+        self._check_fork()
+        with self._cond:
+            self._closed = True
+            self._keys.clear()
+            self._cond.notify_all()
+
+
+# name: (p, a24, bit length of scalars, cofactor bits, encoding length,
+#        u coordinate of base point), from RFC 7748
+_XDH_CURVES = {
+    "X25519": (2**255 - 19, 121665, 255, 3, 32, 9),
+    "X448": (2**448 - 2**224 - 1, 39081, 448, 2, 56, 5),
+}
+
+
+def _xdh(name, scalar, u):
+    """Calculate the X25519 or X448 function."""
+    p, a24, bits, cofactor_bits, length, _ = _XDH_CURVES[name]
+    scalar = normalise_bytes(scalar)
+    u = normalise_bytes(u)
+    if len(scalar) != length or len(u) != length:
+        raise ValueError(
+            "{0} scalar and u coordinate must be {1} bytes long".format(
+                name, length
+            )
+        )
+    # clear the cofactor bits, set the highest bit
+    k = bytes_to_int(scalar, "little") & ((1 << bits) - 1)
+    k = k >> cofactor_bits << cofactor_bits | 1 << (bits - 1)
+    # for X25519, the unused most significant bit is ignored
+    x_1 = (bytes_to_int(u, "little") & ((1 << bits) - 1)) % p
+
+    # Montgomery ladder from section 5 of RFC 7748
+    x_2, z_2, x_3, z_3 = 1, 0, x_1, 1
+    swap = 0
+    for t in reversed(range(bits)):
+        k_t = (k >> t) & 1
+        if swap ^ k_t:
+            x_2, x_3, z_2, z_3 = x_3, x_2, z_3, z_2
+        swap = k_t
+        A = x_2 + z_2
+        AA = A * A % p
+        B = x_2 - z_2
+        BB = B * B % p
+        E = AA - BB
+        DA = (x_3 - z_3) * A % p
+        CB = (x_3 + z_3) * B % p
+        x_3 = (DA + CB) * (DA + CB) % p
+        z_3 = x_1 * (DA - CB) * (DA - CB) % p
+        x_2 = AA * BB % p
+        z_2 = E * (AA + a24 * E) % p
+    if swap:
+        x_2, z_2 = x_3, z_3
+
+    # for the point at infinity z_2 == 0, result is 0 then
+    return int_to_bytes(x_2 * inverse_mod(z_2, p) % p, length, "little")
+
+
+def x25519(scalar, u):
+    """
+    Calculate the X25519 function from RFC 7748.
+
+    :param scalar: the scalar, a private key, 32 bytes long
+    :type scalar: :term:`bytes-like object`
+    :param u: the u coordinate of the point, a public key, 32 bytes long
+    :type u: :term:`bytes-like object`
+
+    :raises ValueError: if the inputs have incorrect length
+
+    :return: the u coordinate of the point multiplied by the scalar
+    :rtype: bytes
+    """
+    return _xdh("X25519", scalar, u)
+
+
+def x448(scalar, u):
+    """
+    Calculate the X448 function from RFC 7748.
+
+    :param scalar: the scalar, a private key, 56 bytes long
+    :type scalar: :term:`bytes-like object`
+    :param u: the u coordinate of the point, a public key, 56 bytes long
+    :type u: :term:`bytes-like object`
+
+    :raises ValueError: if the inputs have incorrect length
+
+    :return: the u coordinate of the point multiplied by the scalar
+    :rtype: bytes
+    """
+    return _xdh("X448", scalar, u)
+
+
+class XDH(object):
+    """
+    Key agreement with the X25519 or X448 functions (RFC 7748).
+
+    The counterpart of :class:`ECDH` for Curve25519 and Curve448. As
+    defined in RFC 7748, both private and public keys are byte strings
+    (32 bytes for X25519, 56 bytes for X448).
+    """
+
+    def __init__(self, curve="X25519", private_key=None, public_key=None):
+        """
+        XDH init.
+
+        :param str curve: ``X25519`` or ``X448``
+        :param private_key: `my` private key
+        :type private_key: :term:`bytes-like object`
+        :param public_key: `their` public key
+        :type public_key: :term:`bytes-like object`
+
+        :raises InvalidCurveError: if the curve is not supported
+        """
+        if curve not in _XDH_CURVES:
+            raise InvalidCurveError(
+                "Only X25519 and X448 are supported, not {0!r}".format(curve)
+            )
+        self.curve = curve
+        self.private_key = None
+        self.public_key = None
+        if private_key:
+            self.load_private_key_bytes(private_key)
+        if public_key:
+            self.load_received_public_key_bytes(public_key)
+
+    def _length(self):
+        return _XDH_CURVES[self.curve][4]
+
+    def generate_private_key(self, entropy=None):
+        """
+        Generate local private key.
+
+        :param entropy: Source of randomness for generating the private
+            key, uses os.urandom() by default.
+        :type entropy: callable
+
+        :return: public key for the generated private key
+        :rtype: bytes
+        """
+        if not entropy:
+            entropy = os.urandom
+        return self.load_private_key_bytes(entropy(self._length()))
+
+    def load_private_key_bytes(self, private_key):
+        """
+        Load local private key.
+
+        :param private_key: private key
+        :type private_key: :term:`bytes-like object`
+
+        :raises ValueError: if the key has incorrect length
+
+        :return: public key for the private key
+        :rtype: bytes
+        """
+        private_key = bytes(private_key)
+        if len(private_key) != self._length():
+            raise ValueError(
+                "{0} private key must be {1} bytes long".format(
+                    self.curve, self._length()
+                )
+            )
+        self.private_key = private_key
+        return self.get_public_key()
+
+    def get_public_key(self):
+        """
+        Provides a public key that matches the local private key.
+
+        :raises NoKeyError: private_key is not set
+
+        :return: public key
+        :rtype: bytes
+        """
+        if not self.private_key:
+            raise NoKeyError("Private key needs to be set to get public key")
+        base = int_to_bytes(_XDH_CURVES[self.curve][5], self._length())
+        return _xdh(self.curve, self.private_key, base[::-1])
+
+    def load_received_public_key_bytes(self, public_key):
+        """
+        Load the public key of the remote party.
+
+        :param public_key: public key
+        :type public_key: :term:`bytes-like object`
+
+        :raises ValueError: if the key has incorrect length
+        """
+        public_key = bytes(public_key)
+        if len(public_key) != self._length():
+            raise ValueError(
+                "{0} public key must be {1} bytes long".format(
+                    self.curve, self._length()
+                )
+            )
+        self.public_key = public_key
+
+    def generate_sharedsecret_bytes(self):
+        """
+        Generate shared secret from local private key and remote public key.
+
+        :raises NoKeyError: public_key or private_key is not set
+        :raises InvalidSharedSecretError: if the shared secret is all zero
+            (the remote public key is a point of small order)
+
+        :return: shared secret
+        :rtype: bytes
+        """
+        if not self.private_key:
+            raise NoKeyError(
+                "Private key needs to be set to create shared secret"
+            )
+        if not self.public_key:
+            raise NoKeyError(
+                "Public key needs to be set to create shared secret"
+            )
+        secret = _xdh(self.curve, self.private_key, self.public_key)
+        if not any(bytearray(secret)):
+            raise InvalidSharedSecretError("Invalid shared secret (all zero).")
+        return secret
@@ -113,7 +113,7 @@ class Signature(object):
         alpha = (
             pow(x, 3, curve.p()) + (curve.a() * x) + curve.b()
         ) % curve.p()
-        beta = numbertheory.square_root_mod_prime(alpha, curve.p())
+        beta = curve.square_root(alpha)
         y = beta if beta % 2 == 0 else curve.p() - beta
 
         # Compute the public key
@@ -203,6 +203,11 @@ class Public_key(object):
             xy = G.mul_add(u1, self.point, u2)
         else:
             xy = u1 * G + u2 * self.point
+        if xy == ellipticcurve.INFINITY:
+            return False
+        if hasattr(xy, "x_mod_equals"):
+            # avoid the conversion to affine coordinates
+            return xy.x_mod_equals(r, n)
         v = xy.x() % n
         return v == r
 
@@ -685,6 +690,7 @@ curve_brainpoolp160t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp160t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp160t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp160r1.set_isomorphic_curve(curve_brainpoolp160t1)
 
 # Brainpool P-192-r1
 _a = 0x6A91174076B1E0E19C39C031FE8685C1CAE040E5C69A28EF
@@ -711,6 +717,7 @@ curve_brainpoolp192t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp192t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp192t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp192r1.set_isomorphic_curve(curve_brainpoolp192t1)
 
 # Brainpool P-224-r1
 _a = 0x68A5E62CA9CE6C1C299803A6C1530B514E182AD8B0042A59CAD29F43
@@ -737,6 +744,7 @@ curve_brainpoolp224t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp224t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp224t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp224r1.set_isomorphic_curve(curve_brainpoolp224t1)
 
 # Brainpool P-256-r1
 _a = 0x7D5A0975FC2C3057EEF67530417AFFE7FB8055C126DC5C6CE94A4B44F330B5D9
@@ -763,6 +771,7 @@ curve_brainpoolp256t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp256t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp256t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp256r1.set_isomorphic_curve(curve_brainpoolp256t1)
 
 # Brainpool P-320-r1
 _a = int(
@@ -873,6 +882,7 @@ curve_brainpoolp320t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp320t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp320t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp320r1.set_isomorphic_curve(curve_brainpoolp320t1)
 
 # Brainpool P-384-r1
 _a = int(
@@ -982,6 +992,7 @@ curve_brainpoolp384t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp384t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp384t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp384r1.set_isomorphic_curve(curve_brainpoolp384t1)
 
 # Brainpool P-512-r1
 _a = int(
@@ -1092,3 +1103,4 @@ curve_brainpoolp512t1 = ellipticcurve.CurveFp(_p, _a, _b, 1)
 generator_brainpoolp512t1 = ellipticcurve.PointJacobi(
     curve_brainpoolp512t1, _Gx, _Gy, 1, _q, generator=True
 )
+curve_brainpoolp512r1.set_isomorphic_curve(curve_brainpoolp512t1)
@@ -41,6 +41,11 @@ def _sha512(data):
     return hashlib.new("sha512", compat26_str(data)).digest()
 
 
+# length of the message digest used by Ed25519ph and Ed448ph, for Ed25519ph
+# it's the output of SHA-512, for Ed448ph it's the first 64 bytes of SHAKE256
+PREHASH_LENGTH = 64
+
+
 curve_ed25519 = ellipticcurve.CurveEdTw(_p, _a, _d, _h, _sha512)
 generator_ed25519 = ellipticcurve.PointEdwards(
     curve_ed25519, _Gx, _Gy, 1, _Gx * _Gy % _p, _r, generator=True
@@ -80,13 +85,42 @@ generator_ed448 = ellipticcurve.PointEdwards(
 )
 
 
+def _dom(curve, phflag, context):
+    """
+    Return the domain separation prefix for signing on the curve.
+
+    For Ed25519 it's the dom2() function from RFC 8032, empty for the
+    PureEdDSA without context. For Ed448 it's the dom4() function.
+    """
+    context = bytearray(context)
+    if len(context) > 255:
+        raise ValueError("Context can be at most 255 bytes long")
+    if curve == curve_ed448:
+        prefix = bytearray(b"SigEd448")
+    elif not phflag and not context:
+        return bytearray()
+    else:
+        prefix = bytearray(b"SigEd25519 no Ed25519 collisions")
+    return prefix + bytearray([phflag, len(context)]) + context
+
+
+def _check_prehash(digest):
+    """Verify that the message digest has size expected by Ed*ph."""
+    if len(digest) != PREHASH_LENGTH:
+        raise ValueError(
+            "Invalid length of message digest, expected: {0} bytes".format(
+                PREHASH_LENGTH
+            )
+        )
+
+
 class PublicKey(object):
     """Public key for the Edwards Digital Signature Algorithm."""
 
     def __init__(self, generator, public_key, public_point=None):
         self.generator = generator
         self.curve = generator.curve()
-        self.__encoded = public_key
+        self.__encoded = bytes(public_key)
         # plus one for the sign bit and round up
         self.baselen = (bit_length(self.curve.p()) + 1 + 7) // 8
         if len(public_key) != self.baselen:
@@ -130,6 +164,20 @@ class PublicKey(object):
 
     def verify(self, data, signature):
         """Verify a Pure EdDSA signature over data."""
+        return self._verify(data, signature, _dom(self.curve, 0, b""))
+
+    def verify_prehashed(self, digest, signature, context=b""):
+        """
+        Verify an Ed25519ph or Ed448ph signature over message digest.
+
+        The digest needs to be the SHA-512 hash of the message for Ed25519
+        and the 64 byte long SHAKE256 output for Ed448.
+        """
+        _check_prehash(digest)
+        return self._verify(digest, signature, _dom(self.curve, 1, context))
+
+    def _verify(self, data, signature, dom):
+        """Verify the signature over data with the dom prefix."""
         data = compat26_str(data)
         if len(signature) != 2 * self.baselen:
             raise ValueError(
@@ -144,16 +192,18 @@ class PublicKey(object):
         if S >= self.generator.order():
             raise ValueError("Invalid signature")
 
-        dom = bytearray()
-        if self.curve == curve_ed448:
-            dom = bytearray(b"SigEd448" + b"\x00\x00")
-
         k = bytes_to_int(
             self.curve.hash_func(dom + R.to_bytes() + self.__encoded + data),
             "little",
         )
 
-        if self.generator * S != self.__point * k + R:
+        # [S]B == R + [k]A, calculated as [S]B + [-k]A == R, the comparison
+        # is done in projective coordinates so no inversion is necessary
+        # negate the scalar rather than the point, so that the precomputation
+        # table of the public key (if any) is used; modulo the order of the
+        # whole group, so that it's correct also for points of mixed order
+        group_order = self.generator.order() * self.curve.cofactor()
+        if self.generator.mul_add(S, self.__point, -k % group_order) != R:
             raise ValueError("Invalid signature")
 
         return True
@@ -232,15 +282,25 @@ class PrivateKey(object):
 
     def sign(self, data):
         """Perform a Pure EdDSA signature over data."""
+        return self._sign(data, _dom(self.curve, 0, b""))
+
+    def sign_prehashed(self, digest, context=b""):
+        """
+        Perform an Ed25519ph or Ed448ph signature over message digest.
+
+        The digest needs to be the SHA-512 hash of the message for Ed25519
+        and the 64 byte long SHAKE256 output for Ed448.
+        """
+        _check_prehash(digest)
+        return self._sign(digest, _dom(self.curve, 1, context))
+
+    def _sign(self, data, dom):
+        """Sign the data using the dom prefix."""
         data = compat26_str(data)
         A = self.public_key().public_key()
 
         prefix = self.__h[self.baselen :]
 
-        dom = bytearray()
-        if self.curve == curve_ed448:
-            dom = bytearray(b"SigEd448" + b"\x00\x00")
-
         r = bytes_to_int(self.curve.hash_func(dom + prefix + data), "little")
         R = (self.generator * r).to_bytes()
 
@@ -47,6 +47,8 @@ except ImportError:  # pragma: no branch
         GMPY = False
 
 
+import threading
+from contextlib import contextmanager
 from six import python_2_unicode_compatible
 from . import numbertheory
 from ._compat import normalise_bytes, int_to_bytes, bit_length, bytes_to_int
@@ -61,6 +63,12 @@ class CurveFp(object):
     prime field.
     """
 
+    # created on first use, so that it's available also in curves
+    # unpickled from older releases
+    __sqrt = None
+    # set by set_isomorphic_curve(), class default for the same reason
+    __isomorphic = None
+
     if GMPY:  # pragma: no branch
 
         def __init__(self, p, a, b, h=None):
@@ -131,6 +139,71 @@ class CurveFp(object):
     def cofactor(self):
         return self.__h
 
+    def square_root(self, a):
+        """
+        Return a square root of `a` in the field of the curve.
+
+        :raises numbertheory.SquareRootError: if `a` is not a square
+        """
+        return self.__square_root_mod_p()(a)
+
+    def __square_root_mod_p(self):
+        sqrt = self.__sqrt
+        if sqrt is None:
+            sqrt = self.__sqrt = numbertheory.SquareRootModPrime(self.__p)
+        return sqrt
+
+    def set_isomorphic_curve(self, curve):
+        """
+        Make point arithmetic use an isomorphic curve.
+
+        Point multiplication on curves with a == -3 (or a == 0) is faster
+        than on curves with arbitrary `a`. When an isomorphic curve with
+        such `a` is set, the multiplications of points on this curve will
+        map the points to it, perform the calculation there and map the
+        result back.
+
+        The curves are isomorphic when there exists `u` such that
+        ``curve.a() == self.a() * u**4`` and
+        ``curve.b() == self.b() * u**6``, like the
+        brainpoolP256r1 and brainpoolP256t1 curves. The point (x, y)
+        on this curve then maps to the point (u**2 * x, u**3 * y) on the
+        other curve.
+
+        :param curve: the curve to perform the calculations on
+        :type curve: CurveFp
+
+        :raises ValueError: if the curves are not isomorphic
+        """
+        p = self.__p
+        if curve.p() != p or not self.__a % p or not self.__b % p:
+            raise ValueError("Curves are not isomorphic")
+        # u**2 == u**6 / u**4
+        u_2 = (
+            curve.b()
+            * self.__a
+            * numbertheory.inverse_mod(self.__b * curve.a(), p)
+            % p
+        )
+        try:
+            u = self.square_root(u_2)
+        except numbertheory.SquareRootError:
+            raise ValueError("Curves are not isomorphic")
+        if (self.__a * u_2 * u_2 - curve.a()) % p or (
+            self.__b * u_2 * u_2 * u_2 - curve.b()
+        ) % p:
+            raise ValueError("Curves are not isomorphic")
+        self.__isomorphic = (curve, u)
+
+    def isomorphic_curve(self):
+        """
+        Return the curve set with :func:`set_isomorphic_curve`.
+
+        :return: the curve and the `u` parameter of the isomorphism or None
+        :rtype: tuple(CurveFp, int) or None
+        """
+        return self.__isomorphic
+
     def contains_point(self, x, y):
         """Is the point (x,y) on this curve?"""
         return (y * y - ((x * x + self.__a) * x + self.__b)) % self.__p == 0
@@ -153,6 +226,9 @@ class CurveFp(object):
 class CurveEdTw(object):
     """Parameters for a Twisted Edwards Elliptic Curve"""
 
+    # created on first use, see CurveFp
+    __sqrt = None
+
     if GMPY:  # pragma: no branch
 
         def __init__(self, p, a, d, h=None, hash_func=None):
@@ -224,6 +300,28 @@ class CurveEdTw(object):
     def cofactor(self):
         return self.__h
 
+    def square_root(self, a):
+        """
+        Return a square root of `a` in the field of the curve.
+
+        :raises numbertheory.SquareRootError: if `a` is not a square
+        """
+        return self.__square_root_mod_p()(a)
+
+    def __square_root_mod_p(self):
+        sqrt = self.__sqrt
+        if sqrt is None:
+            sqrt = self.__sqrt = numbertheory.SquareRootModPrime(self.__p)
+        return sqrt
+
+    def square_root_ratio(self, u, v):
+        """
+        Return a square root of `u/v` in the field of the curve.
+
+        :raises numbertheory.SquareRootError: if `u/v` is not a square
+        """
+        return self.__square_root_mod_p().ratio(u, v)
+
     def __str__(self):
         if self.__h is not None:
             return "CurveEdTw(p={0}, a={1}, d={2}, h={3})".format(
@@ -239,6 +337,61 @@ class CurveEdTw(object):
         )
 
 
+_pickle_options = threading.local()
+
+
+@contextmanager
+def pickle_with_precompute():
+    """
+    Include the precomputation tables when pickling points in this thread.
+
+    By default, points pickle as just their affine coordinates, curve,
+    order and the flag whether they should have a precomputation table,
+    which is then recalculated on first use after unpickling.
+    Inside the context, the tables that are already calculated are pickled
+    too, in a compact binary form, saving the recalculation at the cost
+    of a bigger pickle (about 16 KiB for a NIST256p point).
+
+    Example:
+
+    .. code-block:: python
+
+        vk.precompute()
+        with pickle_with_precompute():
+            data = pickle.dumps(vk)
+    """
+    previous = getattr(_pickle_options, "precompute", False)
+    _pickle_options.precompute = True
+    try:
+        yield
+    finally:
+        _pickle_options.precompute = previous
+
+
+def _encode_precompute(precompute, p):
+    """Convert the precomputation table to a string of fixed-size integers."""
+    if not precompute or not getattr(_pickle_options, "precompute", False):
+        return None
+    return b"".join(
+        number_to_string(i, p) for entry in precompute for i in entry
+    )
+
+
+def _decode_precompute(data, p, entry_len):
+    """Convert the string from _encode_precompute() back to a table."""
+    width = orderlen(p)
+    values = [
+        string_to_number(data[i : i + width])
+        for i in range(0, len(data), width)
+    ]
+    if GMPY:  # pragma: no branch
+        values = [mpz(i) for i in values]
+    return [
+        tuple(values[i : i + entry_len])
+        for i in range(0, len(values), entry_len)
+    ]
+
+
 class AbstractPoint(object):
     """Class for common methods of elliptic curve points."""
 
@@ -274,7 +427,7 @@ class AbstractPoint(object):
         p = curve.p()
         alpha = (pow(x, 3, p) + (curve.a() * x) + curve.b()) % p
         try:
-            beta = numbertheory.square_root_mod_prime(alpha, p)
+            beta = curve.square_root(alpha)
         except numbertheory.Error as e:
             raise MalformedPointError(
                 "Encoding does not correspond to a point on curve", e
@@ -322,14 +475,13 @@ class AbstractPoint(object):
         if GMPY:
             y = mpz(y)
 
-        x2 = (
-            (y * y - 1)
-            * numbertheory.inverse_mod(curve.d() * y * y - curve.a(), p)
-            % p
-        )
+        # x^2 = (y^2 - 1) / (d*y^2 - a)
+        y2 = y * y
+        u = (y2 - 1) % p
+        v = (curve.d() * y2 - curve.a()) % p
 
         try:
-            x = numbertheory.square_root_mod_prime(x2, p)
+            x = curve.square_root_ratio(u, v)
         except numbertheory.Error as e:
             raise MalformedPointError(
                 "Encoding does not correspond to a point on curve", e
@@ -502,6 +654,23 @@ class AbstractPoint(object):
             mult //= 2
         return ret
 
+    @staticmethod
+    def _wnaf(mult, width):
+        """Calculate width-`width` non-adjacent form of number."""
+        ret = []
+        window = 1 << width
+        while mult:
+            if mult % 2:
+                nd = mult % window
+                if nd >= window // 2:
+                    nd -= window
+                ret.append(nd)
+                mult -= nd
+            else:
+                ret.append(0)
+            mult //= 2
+        return ret
+
 
 class PointJacobi(AbstractPoint):
     """
@@ -591,7 +760,7 @@ class PointJacobi(AbstractPoint):
 
     def _maybe_precompute(self):
         if not self.__generator or self.__precompute:
-            return
+            return self.__precompute
 
         # since this code will execute just once, and it's fully deterministic,
         # depend on atomicity of the last assignment to switch from empty
@@ -614,17 +783,48 @@ class PointJacobi(AbstractPoint):
             precompute.append((doubler.x(), doubler.y()))
 
         self.__precompute = precompute
+        return self.__precompute
+
+    def _set_precompute(self, table):
+        """
+        Replace the precomputation table of a generator point.
 
-    def __getstate__(self):
+        Used by :py:mod:`ecdsa.shared` to place the tables in shared memory.
+        """
+        if not self.__generator:
+            raise ValueError("Only generator points have precomputed tables")
+        self.__precompute = table
+
+    def __reduce__(self):
+        # pickle just the affine coordinates and, on request, the table in
+        # compact form, see pickle_with_precompute()
         # while this code can execute at the same time as _maybe_precompute()
         # is updating the __precompute or scale() is updating the __coords,
         # there is no requirement for consistency between __coords and
         # __precompute
-        state = self.__dict__.copy()
-        return state
+        x, y, z = self.__coords
+        if z:
+            x, y, z = self.scale().__coords
+        order = self.__order
+        return (
+            PointJacobi,
+            (
+                self.__curve,
+                int(x),
+                int(y),
+                int(z),
+                order and int(order),
+                self.__generator,
+            ),
+            _encode_precompute(self.__precompute, self.__curve.p()),
+        )
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        if isinstance(state, dict):
+            # pickles from older versions
+            self.__dict__.update(state)
+        else:
+            self.__precompute = _decode_precompute(state, self.__curve.p(), 2)
 
     def __eq__(self, other):
         """Compare for equality two points with each-other.
@@ -685,6 +885,36 @@ class PointJacobi(AbstractPoint):
         z = numbertheory.inverse_mod(z, p)
         return x * z**2 % p
 
+    def x_mod_equals(self, value, modulus):
+        """
+        Check if the affine x coordinate reduced modulo `modulus` is `value`.
+
+        Equivalent to ``self.x() % modulus == value``, but the comparison is
+        done in Jacobi coordinates, so no modular inversion is needed.
+        Useful for checking ECDSA signatures, where the `modulus` is the
+        order of the curve.
+
+        :param int value: the expected value, in range [0, modulus)
+        :param int modulus: the modulus
+
+        :rtype: bool
+        """
+        x, _, z = self.__coords
+        if not z:
+            return False
+        p = self.__curve.p()
+        if z == 1:
+            return x % p % modulus == value
+        # as 0 <= x < p, x % modulus == value iff x is one of value,
+        # value + modulus, value + 2*modulus, ... that are smaller than p
+        zz = z * z % p
+        x = x % p
+        while value < p:
+            if value * zz % p == x:
+                return True
+            value += modulus
+        return False
+
     def y(self):
         """
         Return affine y coordinate.
@@ -744,6 +974,24 @@ class PointJacobi(AbstractPoint):
             point.curve(), point.x(), point.y(), 1, point.order(), generator
         )
 
+    def _to_isomorphic(self, curve, u):
+        """Map the point to the isomorphic curve."""
+        X1, Y1, Z1 = self.__coords
+        p = curve.p()
+        u_2 = u * u % p
+        return PointJacobi(
+            curve, X1 * u_2 % p, Y1 * u_2 * u % p, Z1, self.__order
+        )
+
+    @staticmethod
+    def _from_isomorphic(point, curve, u):
+        """Map the point from the isomorphic curve back to `curve`."""
+        if point is INFINITY:
+            return INFINITY
+        X1, Y1, Z1 = point.__coords
+        # (X, Y, Z*u) represents (x/u**2, y/u**3)
+        return PointJacobi(curve, X1, Y1, Z1 * u % curve.p(), point.__order)
+
     # please note that all the methods that use the equations from
     # hyperelliptic
     # are formatted in a way to maximise performance.
@@ -793,6 +1041,55 @@ class PointJacobi(AbstractPoint):
 
         return T, Y3, Z3
 
+    def _double_a_m3(self, X1, Y1, Z1, p, a):
+        """Add a point to itself, curve with a == -3, arbitrary z."""
+        if Z1 == 1:
+            return self._double_with_z_1(X1, Y1, p, a)
+        if not Z1:
+            return 0, 0, 0
+        # after:
+        # http://hyperelliptic.org/EFD/g1p/auto-shortw-jacobian-3.html#doubling-dbl-2001-b
+        delta, gamma = Z1 * Z1 % p, Y1 * Y1 % p
+        if not gamma:
+            return 0, 0, 0
+        beta = X1 * gamma % p
+        alpha = 3 * (X1 - delta) * (X1 + delta) % p
+        X3 = (alpha * alpha - 8 * beta) % p
+        Y3 = (alpha * (4 * beta - X3) - 8 * gamma * gamma) % p
+        Z3 = ((Y1 + Z1) ** 2 - gamma - delta) % p
+
+        return X3, Y3, Z3
+
+    def _double_a_0(self, X1, Y1, Z1, p, a):
+        """Add a point to itself, curve with a == 0, arbitrary z."""
+        if Z1 == 1:
+            return self._double_with_z_1(X1, Y1, p, a)
+        if not Z1:
+            return 0, 0, 0
+        # after:
+        # http://hyperelliptic.org/EFD/g1p/auto-shortw-jacobian-0.html#doubling-dbl-2009-l
+        A, B = X1 * X1 % p, Y1 * Y1 % p
+        if not B:
+            return 0, 0, 0
+        C = B * B % p
+        D = 2 * ((X1 + B) ** 2 - A - C) % p
+        E = 3 * A
+        X3 = (E * E - 2 * D) % p
+        Y3 = (E * (D - X3) - 8 * C) % p
+        Z3 = 2 * Y1 * Z1 % p
+
+        return X3, Y3, Z3
+
+    def _doubler(self):
+        """Select the fastest doubling formulas for the curve of the point."""
+        curve = self.__curve
+        p, a = curve.p(), curve.a()
+        if not a % p:
+            return self._double_a_0
+        if (a + 3) % p == 0:
+            return self._double_a_m3
+        return self._double
+
     def double(self):
         """Add a point to itself."""
         X1, Y1, Z1 = self.__coords
@@ -802,7 +1099,7 @@ class PointJacobi(AbstractPoint):
 
         p, a = self.__curve.p(), self.__curve.a()
 
-        X3, Y3, Z3 = self._double(X1, Y1, Z1, p, a)
+        X3, Y3, Z3 = self._doubler()(X1, Y1, Z1, p, a)
 
         if not Z3:
             return INFINITY
@@ -931,8 +1228,12 @@ class PointJacobi(AbstractPoint):
         """Multiply point by integer with precomputation table."""
         X3, Y3, Z3, p = 0, 0, 0, self.__curve.p()
         _add = self._add
-        for X2, Y2 in self.__precompute:
+        precompute = self.__precompute
+        # index the table only for non-zero NAF digits, as entries of tables
+        # in shared memory (see ecdsa.shared) are decoded on access
+        for i in range(len(precompute)):
             if other % 2:
+                X2, Y2 = precompute[i]
                 if other % 4 >= 2:
                     other = (other + 1) // 2
                     X3, Y3, Z3 = _add(X3, Y3, Z3, X2, -Y2, 1, p)
@@ -959,11 +1260,18 @@ class PointJacobi(AbstractPoint):
         if self.__precompute:
             return self._mul_precompute(other)
 
+        isomorphic = self.__curve.isomorphic_curve()
+        if isomorphic:
+            curve, u = isomorphic
+            return self._from_isomorphic(
+                self._to_isomorphic(curve, u) * other, self.__curve, u
+            )
+
         self = self.scale()
         X2, Y2, _ = self.__coords
         X3, Y3, Z3 = 0, 0, 0
         p, a = self.__curve.p(), self.__curve.a()
-        _double = self._double
+        _double = self._doubler()
         _add = self._add
         # since adding points when at least one of them is scaled
         # is quicker, reverse the NAF order
@@ -979,6 +1287,244 @@ class PointJacobi(AbstractPoint):
 
         return PointJacobi(self.__curve, X3, Y3, Z3, self.__order)
 
+    def mul_x(self, other):
+        """
+        Multiply point by an integer, return affine x coordinate of result.
+
+        Uses the Montgomery ladder with (X, Y)-only co-Z addition formulas
+        (Goundar, Joye, Miyaji, Rivain, Venelli, "Scalar multiplication on
+        Weierstrass elliptic curves from Co-Z arithmetic"), so neither
+        the Z coordinate nor the y coordinate of the result is computed.
+        Suitable for ECDH, where only the x coordinate of the result is used.
+
+        Points with precomputation tables (generator points, like public
+        keys after :func:`~ecdsa.keys.VerifyingKey.precompute`) are
+        multiplied using the tables instead. Special cases the ladder
+        doesn't handle (a point with x equal 0, or intermediate points with
+        equal x coordinates) are calculated with the regular multiplication.
+        The implementation is not constant time.
+
+        :param int other: the multiplier
+
+        :return: the x coordinate of the result or None if the result is
+            the point at infinity
+        :rtype: int or None
+        """
+        if not self.__coords[1] or not other:
+            return None
+        if self.__generator:
+            ret = self._mul_x_precompute(other)
+            if ret is None:
+                return None
+        else:
+            other = self._ladder_multiplier(other)
+            ret = self._ladder_x(other)
+            if ret is None:
+                return self._mul_x_fallback(other)
+        p = self.__curve.p()
+        numerator, denominator = ret
+        return numerator * numbertheory.inverse_mod(denominator, p) % p
+
+    @staticmethod
+    def batch_mul_x(points, other):
+        """
+        Multiply many points by the same integer, return affine x
+        coordinates of results.
+
+        Faster than multiplying the points one by one: the multiplier is
+        converted to the width-5 non-adjacent form just once, the
+        multiplications use tables of small odd multiples of the points
+        (so they need fewer point additions than the NAF
+        multiplication of :func:`__mul__`), and the conversions of all the
+        tables and of all the results to affine coordinates use a single
+        modular inversion each (with Montgomery's trick).
+        Points with precomputation tables are multiplied using them.
+
+        :param points: points to multiply, all on the same curve
+        :type points: iterable of PointJacobi
+        :param int other: the multiplier
+
+        :return: the x coordinates of the results, None for results that
+            are the point at infinity
+        :rtype: list of int or None
+        """
+        points = list(points)
+        if not points:
+            return []
+        p = points[0].__curve.p()
+        # X and Z coordinates of the results, None for the infinity
+        results = [None] * len(points)
+        # for the points multiplied with the windowed NAF: the position,
+        # the point (on the isomorphic curve if there is one) and the
+        # parameter of the isomorphism, and the Jacobi coordinates of the
+        # odd multiples of the point, P, 3P, ..., 15P
+        jobs = []
+        table_coords = []
+        for i, point in enumerate(points):
+            if not point.__coords[1] or not other:
+                continue
+            if point.__generator:
+                result = point * other
+                if result is not INFINITY:
+                    results[i] = result.__coords[0], result.__coords[2]
+                continue
+            u = 1
+            isomorphic = point.__curve.isomorphic_curve()
+            if isomorphic:
+                curve, u = isomorphic
+                point = point._to_isomorphic(curve, u)
+            X1, Y1, Z1 = point.__coords
+            a = point.__curve.a()
+            X2, Y2, Z2 = point._doubler()(X1, Y1, Z1, p, a)
+            table = [(X1, Y1, Z1)]
+            for _ in range(7):
+                table.append(point._add(X1, Y1, Z1, X2, Y2, Z2, p))
+                X1, Y1, Z1 = table[-1]
+            if not Z2 or not all(z for _, _, z in table):
+                # points of small order, rather than handling them in
+                # the windowed multiplication, use the regular one
+                result = points[i] * other
+                if result is not INFINITY:
+                    results[i] = result.__coords[0], result.__coords[2]
+                continue
+            jobs.append((i, point, u))
+            table_coords.append(table)
+
+        # convert the tables to affine coordinates, so the additions in
+        # the multiplication are the faster mixed additions
+        inverses = numbertheory.inverse_mod_batch(
+            [z for table in table_coords for _, _, z in table], p
+        )
+        multipliers = {}
+        inverses = iter(inverses)
+        for (i, point, u), table in zip(jobs, table_coords):
+            affine = []
+            for X1, Y1, _ in table:
+                z_inv = next(inverses)
+                z_inv_2 = z_inv * z_inv % p
+                affine.append((X1 * z_inv_2 % p, Y1 * z_inv_2 * z_inv % p))
+
+            order = point.__order
+            if order not in multipliers:
+                # order*2 as a protection for Minerva, like in __mul__()
+                mult = other % (order * 2) if order else other
+                multipliers[order] = list(reversed(point._wnaf(mult, 5)))
+            X3, Y3, Z3 = 0, 0, 0
+            a = point.__curve.a()
+            _double = point._doubler()
+            _add = point._add
+            for digit in multipliers[order]:
+                X3, Y3, Z3 = _double(X3, Y3, Z3, p, a)
+                if digit > 0:
+                    X2, Y2 = affine[digit // 2]
+                    X3, Y3, Z3 = _add(X3, Y3, Z3, X2, Y2, 1, p)
+                elif digit < 0:
+                    X2, Y2 = affine[-digit // 2]
+                    X3, Y3, Z3 = _add(X3, Y3, Z3, X2, -Y2, 1, p)
+            if Z3:
+                # (X, Y, Z*u) on the curve of the point represents
+                # the result on the isomorphic curve
+                results[i] = X3, Z3 * u % p
+
+        inverses = numbertheory.inverse_mod_batch(
+            [result[1] for result in results if result], p
+        )
+        inverses = iter(inverses)
+        for i, result in enumerate(results):
+            if result:
+                z_inv = next(inverses)
+                results[i] = result[0] * z_inv * z_inv % p
+        return results
+
+    def _mul_x_precompute(self, other):
+        """
+        Calculate x coordinate of self * other as a fraction, using the
+        precomputation table.
+
+        Returns None if the result is the point at infinity.
+        """
+        result = self * other
+        if result is INFINITY:
+            return None
+        X, _, Z = result.__coords
+        return X, Z * Z
+
+    def _ladder_multiplier(self, other):
+        """Prepare the multiplier for _ladder_x()."""
+        if self.__order:
+            # extend the multiplier so that it has always the same bit
+            # length, see _maybe_precompute() for Minerva
+            order = self.__order
+            other = other % order + order
+            if other.bit_length() <= order.bit_length():
+                other += order
+        return other
+
+    def _ladder_x(self, other):
+        """
+        Calculate x coordinate of self * other as a fraction.
+
+        Returns None in the special cases the ladder doesn't handle.
+        """
+        p = self.__curve.p()
+        x_p, y_p = self.x() % p, self.y() % p
+        if not x_p or not y_p or other < 2:
+            return None
+
+        # R0 = P, R1 = 2P, with the same Z
+        X1, Y1, Z = self._double_with_z_1(x_p, y_p, p, self.__curve.a())
+        ZZ = Z * Z % p
+        X0, Y0 = x_p * ZZ % p, y_p * ZZ * Z % p
+
+        for bit in bin(other)[3:]:
+            # R_b, R_(1-b) <- 2R_b, R_0 + R_1
+            if bit == "1":
+                Xa, Ya, Xb, Yb = X1, Y1, X0, Y0
+            else:
+                Xa, Ya, Xb, Yb = X0, Y0, X1, Y1
+            # conjugate co-Z addition: R_a + R_b and R_a - R_b
+            C = (Xa - Xb) * (Xa - Xb) % p
+            if not C:
+                return None
+            Wa, Wb = Xa * C % p, Xb * C % p
+            Aa = Ya * (Wa - Wb) % p
+            D = Ya - Yb
+            Xs = (D * D - Wa - Wb) % p
+            Ys = (D * (Wa - Xs) - Aa) % p
+            D = Ya + Yb
+            Xd = (D * D - Wa - Wb) % p
+            Yd = (D * (Wa - Xd) - Aa) % p
+            # co-Z addition: 2R_a == (R_a + R_b) + (R_a - R_b)
+            C = (Xs - Xd) * (Xs - Xd) % p
+            if not C:
+                return None
+            Ws, Wd = Xs * C % p, Xd * C % p
+            As = Ys * (Ws - Wd) % p
+            D = Ys - Yd
+            Xa = (D * D - Ws - Wd) % p
+            Ya = (D * (Ws - Xa) - As) % p
+            if bit == "1":
+                X1, Y1, X0, Y0 = Xa, Ya, Ws, As
+            else:
+                X0, Y0, X1, Y1 = Xa, Ya, Ws, As
+
+        # R1 - R0 == P, so X of R1 - R0 is equal to x_p * Z'**2, and X of
+        # R0 with the same Z' is W0
+        C = (X1 - X0) * (X1 - X0) % p
+        if not C:
+            return None
+        W1, W0 = X1 * C % p, X0 * C % p
+        D = Y1 + Y0
+        X_d = (D * D - W1 - W0) % p
+        return W0 * x_p % p, X_d
+
+    def _mul_x_fallback(self, other):
+        """Handle the special cases of mul_x()."""
+        result = self * other
+        if result == INFINITY:
+            return None
+        return result.x()
+
     def mul_add(self, self_mul, other, other_mul):
         """
         Do two multiplications at the same time, add results.
@@ -998,6 +1544,17 @@ class PointJacobi(AbstractPoint):
         if self.__precompute and other.__precompute:
             return self * self_mul + other * other_mul
 
+        isomorphic = self.__curve.isomorphic_curve()
+        if isomorphic:
+            curve, u = isomorphic
+            return self._from_isomorphic(
+                self._to_isomorphic(curve, u).mul_add(
+                    self_mul, other._to_isomorphic(curve, u), other_mul
+                ),
+                self.__curve,
+                u,
+            )
+
         if self.__order:
             self_mul = self_mul % self.__order
             other_mul = other_mul % self.__order
@@ -1013,7 +1570,7 @@ class PointJacobi(AbstractPoint):
         other.scale()
         X2, Y2, Z2 = other.__coords
 
-        _double = self._double
+        _double = self._doubler()
         _add = self._add
 
         # with NAF we have 3 options: no add, subtract, add
@@ -1369,11 +1926,27 @@ class PointEdwards(AbstractPoint):
         # point more always
         order *= 4
 
+        # for curves with a == -1 store the points in the form used by
+        # _add_a_m1_with_precomputed(), (y+x, y-x, 2*d*t), for other curves
+        # store them as affine (x, y, t)
+        curve = self.__curve
+        a_m1 = (curve.a() + 1) % prime == 0
+        d2 = 2 * curve.d() % prime
+
         while i < order:
             doubler = doubler.scale()
             coord_x, coord_y = doubler.x(), doubler.y()
             coord_t = coord_x * coord_y % prime
-            precompute.append((coord_x, coord_y, coord_t))
+            if a_m1:
+                precompute.append(
+                    (
+                        (coord_y + coord_x) % prime,
+                        (coord_y - coord_x) % prime,
+                        coord_t * d2 % prime,
+                    )
+                )
+            else:
+                precompute.append((coord_x, coord_y, coord_t))
 
             i *= 2
             doubler = doubler.double()
@@ -1381,6 +1954,44 @@ class PointEdwards(AbstractPoint):
         self.__precompute = precompute
         return self.__precompute
 
+    def _set_precompute(self, table):
+        """
+        Replace the precomputation table of a generator point.
+
+        Used by :py:mod:`ecdsa.shared` to place the tables in shared memory.
+        """
+        if not self.__generator:
+            raise ValueError("Only generator points have precomputed tables")
+        self.__precompute = table
+
+    def __reduce__(self):
+        # pickle just the affine coordinates and, on request, the table in
+        # compact form, see pickle_with_precompute()
+        x, y, z, t = self.scale().__coords
+        order = self.__order
+        return (
+            PointEdwards,
+            (
+                self.__curve,
+                int(x),
+                int(y),
+                int(z),
+                int(t),
+                order and int(order),
+                self.__generator,
+            ),
+            _encode_precompute(self.__precompute, self.__curve.p()),
+        )
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # pickles from older versions, their precomputation tables use
+            # a different format, so let _maybe_precompute() recreate it
+            self.__dict__.update(state)
+            self.__precompute = []
+        else:
+            self.__precompute = _decode_precompute(state, self.__curve.p(), 3)
+
     def x(self):
         """Return affine x coordinate."""
         X1, _, Z1, _ = self.__coords
@@ -1451,11 +2062,30 @@ class PointEdwards(AbstractPoint):
         """Compare for inequality two points with each-other."""
         return not self == other
 
+    def _formulas(self):
+        """
+        Select the point arithmetic for the curve of the point.
+
+        Returns the curve constant the formulas use (`a` in general, `2*d`
+        for curves with a == -1), and the methods for point addition,
+        point addition with Z2 == 1 and point doubling. All of them
+        have the same signatures.
+        """
+        curve = self.__curve
+        p, a = curve.p(), curve.a()
+        if (a + 1) % p == 0:
+            return (
+                2 * curve.d() % p,
+                self._add_a_m1,
+                self._add_a_m1_with_z2_1,
+                self._double_a_m1,
+            )
+        return a, self._add, self._add_with_z2_1, self._double
+
     def _add(self, X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, a):
         """add two points, assume sane parameters."""
         # after add-2008-hwcd-2
         # from https://hyperelliptic.org/EFD/g1p/auto-twisted-extended.html
-        # NOTE: there are more efficient formulas for Z1 or Z2 == 1
         A = X1 * X2 % p
         B = Y1 * Y2 % p
         C = Z1 * T2 % p
@@ -1473,6 +2103,87 @@ class PointEdwards(AbstractPoint):
 
         return X3, Y3, Z3, T3
 
+    def _add_with_z2_1(self, X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, a):
+        """add two points when Z2 == 1 (Z2 is ignored)."""
+        # after madd-2008-hwcd-2
+        # from https://hyperelliptic.org/EFD/g1p/auto-twisted-extended.html
+        A = X1 * X2 % p
+        B = Y1 * Y2 % p
+        C = Z1 * T2 % p
+        E = T1 + C
+        F = ((X1 - Y1) * (X2 + Y2) + B - A) % p
+        G = B + a * A
+        H = T1 - C
+        if not H % p:
+            return self._double(X1, Y1, Z1, T1, p, a)
+        X3 = E * F % p
+        Y3 = G * H % p
+        T3 = E * H % p
+        Z3 = F * G % p
+
+        return X3, Y3, Z3, T3
+
+    def _add_a_m1(self, X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, d2):
+        """add two points on curve with a == -1, d2 == 2*d."""
+        # after add-2008-hwcd-3
+        # from https://hyperelliptic.org/EFD/g1p/auto-twisted-extended-1.html
+        # the formulas are unified, so they work for doubling too
+        A = (Y1 - X1) * (Y2 - X2) % p
+        B = (Y1 + X1) * (Y2 + X2) % p
+        C = T1 * T2 % p * d2 % p
+        D = 2 * Z1 * Z2 % p
+        E = B - A
+        F = D - C
+        G = D + C
+        H = B + A
+        X3 = E * F % p
+        Y3 = G * H % p
+        T3 = E * H % p
+        Z3 = F * G % p
+
+        return X3, Y3, Z3, T3
+
+    def _add_a_m1_with_z2_1(self, X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, d2):
+        """add two points on curve with a == -1 when Z2 == 1."""
+        # after madd-2008-hwcd-3
+        # from https://hyperelliptic.org/EFD/g1p/auto-twisted-extended-1.html
+        A = (Y1 - X1) * (Y2 - X2) % p
+        B = (Y1 + X1) * (Y2 + X2) % p
+        C = T1 * T2 % p * d2 % p
+        D = 2 * Z1
+        E = B - A
+        F = D - C
+        G = D + C
+        H = B + A
+        X3 = E * F % p
+        Y3 = G * H % p
+        T3 = E * H % p
+        Z3 = F * G % p
+
+        return X3, Y3, Z3, T3
+
+    def _add_a_m1_with_precomputed(self, X1, Y1, Z1, T1, YpX2, YmX2, T2d2, p):
+        """
+        add two points on curve with a == -1, the second point in the
+        precomputed form: YpX2 == y2 + x2, YmX2 == y2 - x2, T2d2 == 2*d*t2.
+        """
+        # after madd-2008-hwcd-3
+        # from https://hyperelliptic.org/EFD/g1p/auto-twisted-extended-1.html
+        A = (Y1 - X1) * YmX2 % p
+        B = (Y1 + X1) * YpX2 % p
+        C = T1 * T2d2 % p
+        D = 2 * Z1
+        E = B - A
+        F = D - C
+        G = D + C
+        H = B + A
+        X3 = E * F % p
+        Y3 = G * H % p
+        T3 = E * H % p
+        Z3 = F * G % p
+
+        return X3, Y3, Z3, T3
+
     def __add__(self, other):
         """Add point to another."""
         if other == INFINITY:
@@ -1483,11 +2194,12 @@ class PointEdwards(AbstractPoint):
         ):
             raise ValueError("The other point is on a different curve.")
 
-        p, a = self.__curve.p(), self.__curve.a()
+        p = self.__curve.p()
+        k, _add, _, _ = self._formulas()
         X1, Y1, Z1, T1 = self.__coords
         X2, Y2, Z2, T2 = other.__coords
 
-        X3, Y3, Z3, T3 = self._add(X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, a)
+        X3, Y3, Z3, T3 = _add(X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, k)
 
         if not X3 or not T3:
             return INFINITY
@@ -1501,7 +2213,6 @@ class PointEdwards(AbstractPoint):
         """Double the point, assume sane parameters."""
         # after "dbl-2008-hwcd"
         # from https://hyperelliptic.org/EFD/g1p/auto-twisted-extended.html
-        # NOTE: there are more efficient formulas for Z1 == 1
         A = X1 * X1 % p
         B = Y1 * Y1 % p
         C = 2 * Z1 * Z1 % p
@@ -1517,6 +2228,23 @@ class PointEdwards(AbstractPoint):
 
         return X3, Y3, Z3, T3
 
+    def _double_a_m1(self, X1, Y1, Z1, T1, p, d2):
+        """Double the point on curve with a == -1 (d2 is ignored)."""
+        # after "dbl-2008-hwcd" with D = a * A = -A
+        A = X1 * X1 % p
+        B = Y1 * Y1 % p
+        C = 2 * Z1 * Z1 % p
+        E = ((X1 + Y1) * (X1 + Y1) - A - B) % p
+        G = B - A
+        F = G - C
+        H = -A - B
+        X3 = E * F % p
+        Y3 = G * H % p
+        T3 = E * H % p
+        Z3 = F * G % p
+
+        return X3, Y3, Z3, T3
+
     def double(self):
         """Return point added to itself."""
         X1, Y1, Z1, T1 = self.__coords
@@ -1524,9 +2252,10 @@ class PointEdwards(AbstractPoint):
         if not X1 or not T1:
             return INFINITY
 
-        p, a = self.__curve.p(), self.__curve.a()
+        p = self.__curve.p()
+        k, _, _, _double = self._formulas()
 
-        X3, Y3, Z3, T3 = self._double(X1, Y1, Z1, T1, p, a)
+        X3, Y3, Z3, T3 = _double(X1, Y1, Z1, T1, p, k)
 
         # both Ed25519 and Ed448 have prime order, so no point added to
         # itself will equal zero
@@ -1538,26 +2267,53 @@ class PointEdwards(AbstractPoint):
         """Multiply point by an integer."""
         return self * other
 
-    def _mul_precompute(self, other):
-        """Multiply point by integer with precomputation table."""
-        X3, Y3, Z3, T3, p, a = 0, 1, 1, 0, self.__curve.p(), self.__curve.a()
-        _add = self._add
-        for X2, Y2, T2 in self.__precompute:
+    def _mul_precompute(self, other, X3=0, Y3=1, Z3=1, T3=0):
+        """
+        Multiply point by integer with precomputation table.
+
+        Adds the result to the point (X3, Y3, Z3, T3) (INFINITY by default)
+        and returns the coordinates of the sum.
+        """
+        p = self.__curve.p()
+        precompute = self.__precompute
+        # index the table only for non-zero NAF digits, as entries of tables
+        # in shared memory (see ecdsa.shared) are decoded on access
+        if (self.__curve.a() + 1) % p == 0:
+            _add = self._add_a_m1_with_precomputed
+            # -P == (-x, y) so y+x and y-x swap places
+            for i in range(len(precompute)):
+                rem = other % 4
+                if rem == 0 or rem == 2:
+                    other //= 2
+                elif rem == 3:
+                    other = (other + 1) // 2
+                    YpX2, YmX2, T2d2 = precompute[i]
+                    X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, YmX2, YpX2, -T2d2, p)
+                else:
+                    assert rem == 1
+                    other = (other - 1) // 2
+                    YpX2, YmX2, T2d2 = precompute[i]
+                    X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, YpX2, YmX2, T2d2, p)
+
+            return X3, Y3, Z3, T3
+
+        # the table has affine points
+        k, _, _add, _ = self._formulas()
+        for i in range(len(precompute)):
             rem = other % 4
             if rem == 0 or rem == 2:
                 other //= 2
             elif rem == 3:
                 other = (other + 1) // 2
-                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, -X2, Y2, 1, -T2, p, a)
+                X2, Y2, T2 = precompute[i]
+                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, -X2, Y2, 1, -T2, p, k)
             else:
                 assert rem == 1
                 other = (other - 1) // 2
-                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, X2, Y2, 1, T2, p, a)
-
-        if not X3 or not T3:
-            return INFINITY
+                X2, Y2, T2 = precompute[i]
+                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, X2, Y2, 1, T2, p, k)
 
-        return PointEdwards(self.__curve, X3, Y3, Z3, T3, self.__order)
+        return X3, Y3, Z3, T3
 
     def __mul__(self, other):
         """Multiply point by an integer."""
@@ -1570,25 +2326,169 @@ class PointEdwards(AbstractPoint):
             # order*2 as a "protection" for Minerva
             other = other % (self.__order * 2)
         if self._maybe_precompute():
-            return self._mul_precompute(other)
+            X3, Y3, Z3, T3 = self._mul_precompute(other)
+            if not X3 or not T3:
+                return INFINITY
+            return PointEdwards(self.__curve, X3, Y3, Z3, T3, self.__order)
 
         X3, Y3, Z3, T3 = 0, 1, 1, 0  # INFINITY in extended coordinates
-        p, a = self.__curve.p(), self.__curve.a()
-        _double = self._double
-        _add = self._add
+        p = self.__curve.p()
+        k, _add, _add_with_z2_1, _double = self._formulas()
+        if Z2 == 1:
+            _add = _add_with_z2_1
 
         for i in reversed(self._naf(other)):
-            X3, Y3, Z3, T3 = _double(X3, Y3, Z3, T3, p, a)
+            X3, Y3, Z3, T3 = _double(X3, Y3, Z3, T3, p, k)
             if i < 0:
-                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, -X2, Y2, Z2, -T2, p, a)
+                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, -X2, Y2, Z2, -T2, p, k)
             elif i > 0:
-                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, X2, Y2, Z2, T2, p, a)
+                X3, Y3, Z3, T3 = _add(X3, Y3, Z3, T3, X2, Y2, Z2, T2, p, k)
 
         if not X3 or not T3:
             return INFINITY
 
         return PointEdwards(self.__curve, X3, Y3, Z3, T3, self.__order)
 
+    def mul_add(self, self_mul, other, other_mul):
+        """
+        Do two multiplications at the same time, add results.
+
+        calculates self*self_mul + other*other_mul
+        """
+        if other == INFINITY or other_mul == 0:
+            return self * self_mul
+        if self_mul == 0:
+            return other * other_mul
+        if (
+            not isinstance(other, PointEdwards)
+            or self.__curve != other.__curve
+        ):
+            raise ValueError("The other point is on a different curve.")
+        X1, Y1, Z1, T1 = self.__coords
+        if not X1 or not T1:
+            return other * other_mul
+        X2, Y2, Z2, T2 = other.__coords
+        if not X2 or not T2:
+            return self * self_mul
+
+        if self.__order:
+            # order*2 as a "protection" for Minerva
+            self_mul = self_mul % (self.__order * 2)
+        if other.__order:
+            other_mul = other_mul % (other.__order * 2)
+
+        # multiplication with precomputation table doesn't need doublings,
+        # so calculate it separately, but accumulate in the same coordinates
+        # to avoid creating intermediate objects
+        self_table = self._maybe_precompute()
+        other_table = other._maybe_precompute()
+        if self_table and other_table:
+            X3, Y3, Z3, T3 = self._mul_precompute(self_mul)
+            X3, Y3, Z3, T3 = other._mul_precompute(other_mul, X3, Y3, Z3, T3)
+            if not X3 or not T3:
+                return INFINITY
+            return PointEdwards(self.__curve, X3, Y3, Z3, T3, self.__order)
+
+        p = self.__curve.p()
+        k, _add, _add_with_z2_1, _double = self._formulas()
+
+        # the points with precomputation tables are used often, so
+        # scale them once, instead of every time they are used
+        if self_table and Z1 != 1:
+            X1, Y1, Z1, T1 = self.scale().__coords
+        if other_table and Z2 != 1:
+            X2, Y2, Z2, T2 = other.scale().__coords
+        # use the faster formulas for affine points
+        _add_1 = _add_with_z2_1 if Z1 == 1 else _add
+        _add_2 = _add_with_z2_1 if Z2 == 1 else _add
+
+        # with NAF we have 3 options: no add, subtract, add
+        # so with 2 points, we have 9 combinations:
+        # 0, -A, +A, -B, -A-B, +A-B, +B, -A+B, +A+B
+        # -P = (-X, Y, Z, -T), so we need just 2 combined points
+        pApB_X, pApB_Y, pApB_Z, pApB_T = _add_2(
+            X1, Y1, Z1, T1, X2, Y2, Z2, T2, p, k
+        )
+        pAmB_X, pAmB_Y, pAmB_Z, pAmB_T = _add_2(
+            X1, Y1, Z1, T1, -X2, Y2, Z2, -T2, p, k
+        )
+        # when the self and other sum to infinity, we need to add them
+        # one by one to get correct result but as that's very unlikely to
+        # happen in regular operation, we don't need to optimise this case
+        if not pApB_X or not pApB_T or not pAmB_X or not pAmB_T:
+            return self * self_mul + other * other_mul
+
+        # gmp object creation has cumulatively higher overhead than the
+        # speedup we get from calculating the NAF using gmp so ensure use
+        # of int()
+        self_naf = list(reversed(self._naf(int(self_mul))))
+        other_naf = list(reversed(self._naf(int(other_mul))))
+        # ensure that the lists are the same length (zip() will truncate
+        # longer one otherwise)
+        if len(self_naf) < len(other_naf):
+            self_naf = [0] * (len(other_naf) - len(self_naf)) + self_naf
+        elif len(self_naf) > len(other_naf):
+            other_naf = [0] * (len(self_naf) - len(other_naf)) + other_naf
+
+        X3, Y3, Z3, T3 = 0, 1, 1, 0  # INFINITY in extended coordinates
+
+        for A, B in zip(self_naf, other_naf):
+            X3, Y3, Z3, T3 = _double(X3, Y3, Z3, T3, p, k)
+
+            # conditions ordered from most to least likely
+            if A == 0:
+                if B == 0:
+                    pass
+                elif B < 0:
+                    X3, Y3, Z3, T3 = _add_2(
+                        X3, Y3, Z3, T3, -X2, Y2, Z2, -T2, p, k
+                    )
+                else:
+                    assert B > 0
+                    X3, Y3, Z3, T3 = _add_2(
+                        X3, Y3, Z3, T3, X2, Y2, Z2, T2, p, k
+                    )
+            elif A < 0:
+                if B == 0:
+                    X3, Y3, Z3, T3 = _add_1(
+                        X3, Y3, Z3, T3, -X1, Y1, Z1, -T1, p, k
+                    )
+                elif B < 0:
+                    X3, Y3, Z3, T3 = _add(
+                        X3, Y3, Z3, T3, -pApB_X, pApB_Y, pApB_Z, -pApB_T, p, k
+                    )
+                else:
+                    assert B > 0
+                    X3, Y3, Z3, T3 = _add(
+                        X3, Y3, Z3, T3, -pAmB_X, pAmB_Y, pAmB_Z, -pAmB_T, p, k
+                    )
+            else:
+                assert A > 0
+                if B == 0:
+                    X3, Y3, Z3, T3 = _add_1(
+                        X3, Y3, Z3, T3, X1, Y1, Z1, T1, p, k
+                    )
+                elif B < 0:
+                    X3, Y3, Z3, T3 = _add(
+                        X3, Y3, Z3, T3, pAmB_X, pAmB_Y, pAmB_Z, pAmB_T, p, k
+                    )
+                else:
+                    assert B > 0
+                    X3, Y3, Z3, T3 = _add(
+                        X3, Y3, Z3, T3, pApB_X, pApB_Y, pApB_Z, pApB_T, p, k
+                    )
+
+        if not X3 or not T3:
+            return INFINITY
+
+        return PointEdwards(self.__curve, X3, Y3, Z3, T3, self.__order)
+
+    def __neg__(self):
+        """Return negated point."""
+        x, y, z, t = self.__coords
+        p = self.__curve.p()
+        return PointEdwards(self.__curve, -x % p, y, z, -t % p, self.__order)
+
 
 # This one point is the Point At Infinity for all purposes:
 INFINITY = Point(None, None, None)
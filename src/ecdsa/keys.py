@@ -5,12 +5,14 @@ Primary classes for performing signing and verification operations.
 import binascii
 from hashlib import sha1
 import os
+import timeit
 from six import PY2
 from . import ecdsa, eddsa
 from . import der, ssh
 from . import rfc6979
 from . import ellipticcurve
 from .curves import NIST192p, Curve, Ed25519, Ed448
+from .curves import curves as _known_curves, _get_index as _curve_index
 from .ecdsa import RSZeroError
 from .util import string_to_number, number_to_string, randrange
 from .util import sigencode_string, sigdecode_string, bit_length
@@ -32,6 +34,7 @@ __all__ = [
     "VerifyingKey",
     "SigningKey",
     "MalformedPointError",
+    "warmup",
 ]
 
 
@@ -88,6 +91,32 @@ def _truncate_and_convert_digest(digest, curve, allow_truncate):
     return number
 
 
+def _unpickle_verifying_key(curve, point, hashfunc, encoded):
+    """Recreate VerifyingKey from the values from its __reduce__()."""
+    if isinstance(curve.curve, CurveEdTw):
+        self = VerifyingKey(_error__please_use_generate=True)
+        self.curve = curve
+        self.default_hashfunc = hashfunc
+        self.pubkey = eddsa.PublicKey(curve.generator, encoded, point)
+        return self
+    return VerifyingKey.from_public_point(point, curve, hashfunc, False)
+
+
+def _unpickle_signing_key(curve, private, verifying_key, hashfunc):
+    """Recreate SigningKey from the values from its __reduce__()."""
+    self = SigningKey(_error__please_use_generate=True)
+    self.curve = curve
+    self.default_hashfunc = hashfunc
+    self.baselen = curve.baselen
+    self.verifying_key = verifying_key
+    if isinstance(curve.curve, CurveEdTw):
+        self.privkey = eddsa.PrivateKey(curve.generator, private)
+    else:
+        self.privkey = ecdsa.Private_key(verifying_key.pubkey, private)
+        self.privkey.order = curve.order
+    return self
+
+
 class VerifyingKey(object):
     """
     Class for handling keys that can verify signatures (public keys).
@@ -131,6 +160,17 @@ class VerifyingKey(object):
         """Return False if the points are identical, True otherwise."""
         return not self == other
 
+    def __reduce__(self):
+        # the curve is pickled by OID and the point by its coordinates, see
+        # ~ecdsa.ellipticcurve.pickle_with_precompute() for the table
+        encoded = None
+        if isinstance(self.curve.curve, CurveEdTw):
+            encoded = self.pubkey.public_key()
+        return (
+            _unpickle_verifying_key,
+            (self.curve, self.pubkey.point, self.default_hashfunc, encoded),
+        )
+
     @classmethod
     def from_public_point(
         cls, point, curve=NIST192p, hashfunc=sha1, validate_point=True
@@ -369,24 +409,25 @@ class VerifyingKey(object):
         """
         if valid_encodings is None:
             valid_encodings = set(["uncompressed", "compressed", "hybrid"])
-        string = normalise_bytes(string)
+        reader = der.Reader(string)
         # [[oid_ecPublicKey,oid_curve], point_str_bitstring]
-        s1, empty = der.remove_sequence(string)
-        if empty != b"":
+        s1 = reader.read_sequence()
+        if not reader.empty():
             raise der.UnexpectedDER(
-                "trailing junk after DER pubkey: %s" % binascii.hexlify(empty)
+                "trailing junk after DER pubkey: %s"
+                % binascii.hexlify(reader.remaining())
             )
-        s2, point_str_bitstring = der.remove_sequence(s1)
+        s2 = s1.read_sequence()
         # s2 = oid_ecPublicKey,oid_curve
-        oid_pk, rest = der.remove_object(s2)
+        oid_pk = s2.read_object()
         if oid_pk in (Ed25519.oid, Ed448.oid):
             if oid_pk == Ed25519.oid:
                 curve = Ed25519
             else:
                 assert oid_pk == Ed448.oid
                 curve = Ed448
-            point_str, empty = der.remove_bitstring(point_str_bitstring, 0)
-            if empty:
+            point_str = s1.read_bitstring(0)
+            if not s1.empty():
                 raise der.UnexpectedDER("trailing junk after public key")
             return cls.from_string(point_str, curve, None)
         if not oid_pk == oid_ecPublicKey:
@@ -394,12 +435,12 @@ class VerifyingKey(object):
                 "Unexpected object identifier in DER "
                 "encoding: {0!r}".format(oid_pk)
             )
-        curve = Curve.from_der(rest, valid_curve_encodings)
-        point_str, empty = der.remove_bitstring(point_str_bitstring, 0)
-        if empty != b"":
+        curve = Curve.from_der(s2.remaining(), valid_curve_encodings)
+        point_str = s1.read_bitstring(0)
+        if not s1.empty():
             raise der.UnexpectedDER(
                 "trailing junk after pubkey pointstring: %s"
-                % binascii.hexlify(empty)
+                % binascii.hexlify(s1.remaining())
             )
         # raw encoding of point is invalid in DER files
         if len(point_str) == curve.verifying_key_length:
@@ -740,6 +781,79 @@ class VerifyingKey(object):
             return True
         raise BadSignatureError("Signature verification failed")
 
+    def verify_prehashed(self, signature, digest, context=b""):
+        """
+        Verify an Ed25519ph or Ed448ph signature made over message digest.
+
+        The HashEdDSA variants from RFC 8032 sign the hash of the message
+        rather than the message itself, so the message can be hashed
+        incrementally, without keeping it whole in memory.
+        The `digest` needs to be the SHA-512 hash of the message for
+        Ed25519 (e.g. ``hashlib.sha512(data).digest()``) or the 64 byte
+        long SHAKE256 output for Ed448
+        (e.g. ``hashlib.shake_256(data).digest(64)``).
+
+        Note: signatures created with Ed25519ph or Ed448ph do not verify
+        using :func:`~VerifyingKey.verify` and vice versa.
+
+        :param signature: encoding of the signature
+        :type signature: :term:`bytes-like object`
+        :param digest: hash of the message signed by the `signature`
+        :type digest: :term:`bytes-like object`
+        :param context: context string the signature was created with,
+            up to 255 bytes long, empty by default
+        :type context: :term:`bytes-like object`
+
+        :raises BadSignatureError: if the signature is invalid or malformed
+        :raises ValueError: if the key is not on an Edwards curve
+
+        :return: True if the verification was successful
+        :rtype: bool
+        """
+        if not isinstance(self.curve.curve, CurveEdTw):
+            raise ValueError("Method supported only for Edwards curves")
+        digest = normalise_bytes(digest)
+        signature = normalise_bytes(signature)
+        context = normalise_bytes(context)
+        try:
+            return self.pubkey.verify_prehashed(digest, signature, context)
+        except (ValueError, MalformedPointError) as e:
+            raise BadSignatureError("Signature verification failed", e)
+
+    def averify(
+        self,
+        signature,
+        data,
+        hashfunc=None,
+        sigdecode=sigdecode_string,
+        allow_truncate=True,
+    ):
+        """
+        Verify a signature made over provided data, without blocking the
+        event loop.
+
+        Asynchronous version of :func:`verify`, to be awaited in
+        :py:mod:`asyncio` coroutines. The verification is performed in an
+        executor, together with other concurrent requests that use the same
+        key, see :py:mod:`ecdsa.aio` for configuration. Requires Python 3.5
+        or later.
+
+        See :func:`verify` for description of parameters.
+
+        :raises BadSignatureError: if the signature is invalid or malformed
+
+        :return: awaitable that returns True if the verification was
+            successful
+        :rtype: awaitable
+        """
+        from . import aio
+
+        return aio.submit(
+            self,
+            self.verify,
+            (signature, data, hashfunc, sigdecode, allow_truncate),
+        )
+
 
 class SigningKey(object):
     """
@@ -779,6 +893,16 @@ class SigningKey(object):
         """Return False if the points are identical, True otherwise."""
         return not self == other
 
+    def __reduce__(self):
+        if isinstance(self.curve.curve, CurveEdTw):
+            private = self.privkey.private_key
+        else:
+            private = self.privkey.secret_multiplier
+        return (
+            _unpickle_signing_key,
+            (self.curve, private, self.verifying_key, self.default_hashfunc),
+        )
+
     @classmethod
     def _twisted_edwards_keygen(cls, curve, entropy):
         """Generate a private key on a Twisted Edwards curve."""
@@ -1040,49 +1164,50 @@ class SigningKey(object):
         :return: Initialised SigningKey object
         :rtype: SigningKey
         """
-        s = normalise_bytes(string)
+        reader = der.Reader(string)
         curve = None
 
-        s, empty = der.remove_sequence(s)
-        if empty != b"":
+        s = reader.read_sequence()
+        if not reader.empty():
             raise der.UnexpectedDER(
-                "trailing junk after DER privkey: %s" % binascii.hexlify(empty)
+                "trailing junk after DER privkey: %s"
+                % binascii.hexlify(reader.remaining())
             )
 
-        version, s = der.remove_integer(s)
+        version = s.read_integer()
 
         # At this point, PKCS #8 has a sequence containing the algorithm
         # identifier and the curve identifier. The ssleay format instead has
         # an octet string containing the key data, so this is how we can
         # distinguish the two formats.
-        if der.is_sequence(s):
+        if s.is_sequence():
             if version not in (0, 1):
                 raise der.UnexpectedDER(
                     "expected version '0' or '1' at start of privkey, got %d"
                     % version
                 )
 
-            sequence, s = der.remove_sequence(s)
-            algorithm_oid, algorithm_identifier = der.remove_object(sequence)
+            sequence = s.read_sequence()
+            algorithm_oid = sequence.read_object()
 
             if algorithm_oid in (Ed25519.oid, Ed448.oid):
-                if algorithm_identifier:
+                if not sequence.empty():
                     raise der.UnexpectedDER(
                         "Non NULL parameters for a EdDSA key"
                     )
-                key_str_der, s = der.remove_octet_string(s)
+                key_str_der = der.Reader(s.read_octet_string())
 
                 # As RFC5958 describe, there are may be optional Attributes
                 # and Publickey. Don't raise error if something after
                 # Privatekey
 
                 # TODO parse attributes or validate publickey
-                # if s:
+                # if not s.empty():
                 #     raise der.UnexpectedDER(
                 #         "trailing junk inside the privateKey"
                 #     )
-                key_str, s = der.remove_octet_string(key_str_der)
-                if s:
+                key_str = key_str_der.read_octet_string()
+                if not key_str_der.empty():
                     raise der.UnexpectedDER(
                         "trailing junk after the encoded private key"
                     )
@@ -1100,22 +1225,22 @@ class SigningKey(object):
                     "unexpected algorithm identifier '%s'" % (algorithm_oid,)
                 )
 
-            curve = Curve.from_der(algorithm_identifier, valid_curve_encodings)
+            curve = Curve.from_der(sequence.remaining(), valid_curve_encodings)
 
             # Up next is an octet string containing an ECPrivateKey. Ignore
             # the optional "attributes" and "publicKey" fields that come after.
-            s, _ = der.remove_octet_string(s)
+            ec_private_key = der.Reader(s.read_octet_string())
 
             # Unpack the ECPrivateKey to get to the key data octet string,
             # and rejoin the ssleay parsing path.
-            s, empty = der.remove_sequence(s)
-            if empty != b"":
+            s = ec_private_key.read_sequence()
+            if not ec_private_key.empty():
                 raise der.UnexpectedDER(
                     "trailing junk after DER privkey: %s"
-                    % binascii.hexlify(empty)
+                    % binascii.hexlify(ec_private_key.remaining())
                 )
 
-            version, s = der.remove_integer(s)
+            version = s.read_integer()
 
         # The version of the ECPrivateKey must be 1.
         if version != 1:
@@ -1124,27 +1249,30 @@ class SigningKey(object):
                 % version
             )
 
-        privkey_str, s = der.remove_octet_string(s)
+        privkey_str = s.read_octet_string()
 
         if not curve:
-            tag, curve_oid_str, s = der.remove_constructed(s)
+            tag, curve_oid = s.read_constructed()
             if tag != 0:
                 raise der.UnexpectedDER(
                     "expected tag 0 in DER privkey, got %d" % tag
                 )
-            curve = Curve.from_der(curve_oid_str, valid_curve_encodings)
+            curve = Curve.from_der(
+                curve_oid.remaining(), valid_curve_encodings
+            )
 
         # we don't actually care about the following fields
         #
-        # tag, pubkey_bitstring, s = der.remove_constructed(s)
+        # tag, pubkey_bitstring = s.read_constructed()
         # if tag != 1:
         #     raise der.UnexpectedDER("expected tag 1 in DER privkey, got %d"
         #                             % tag)
-        # pubkey_str = der.remove_bitstring(pubkey_bitstring, 0)
-        # if empty != "":
+        # pubkey_str = pubkey_bitstring.read_bitstring(0)
+        # if not pubkey_bitstring.empty():
         #     raise der.UnexpectedDER("trailing junk after DER privkey "
         #                             "pubkeystr: %s"
-        #                             % binascii.hexlify(empty))
+        #                             % binascii.hexlify(
+        #                                 pubkey_bitstring.remaining()))
 
         # our from_string method likes fixed-length privkey strings
         if len(privkey_str) < curve.baselen:
@@ -1454,6 +1582,40 @@ class SigningKey(object):
 
         return sigencode(r, s, order)
 
+    def sign_prehashed(self, digest, context=b""):
+        """
+        Create an Ed25519ph or Ed448ph signature over message digest.
+
+        The HashEdDSA variants from RFC 8032 sign the hash of the message
+        rather than the message itself, so the message can be hashed
+        incrementally, without keeping it whole in memory.
+        The `digest` needs to be the SHA-512 hash of the message for
+        Ed25519 (e.g. ``hashlib.sha512(data).digest()``) or the 64 byte
+        long SHAKE256 output for Ed448
+        (e.g. ``hashlib.shake_256(data).digest(64)``).
+
+        Note: the created signatures can be verified only with
+        :func:`VerifyingKey.verify_prehashed`, they are not PureEdDSA
+        signatures.
+
+        :param digest: hash of the message that will be signed
+        :type digest: :term:`bytes-like object`
+        :param context: context string to bind the signature to, up to 255
+            bytes long, empty by default
+        :type context: :term:`bytes-like object`
+
+        :raises ValueError: if the key is not on an Edwards curve, the
+            digest has unexpected length or the context is too long
+
+        :return: encoded signature over the `digest`
+        :rtype: bytes
+        """
+        if not isinstance(self.curve.curve, CurveEdTw):
+            raise ValueError("Method supported only for Edwards curves")
+        digest = normalise_bytes(digest)
+        context = normalise_bytes(context)
+        return self.privkey.sign_prehashed(digest, context)
+
     def sign(
         self,
         data,
@@ -1536,6 +1698,41 @@ class SigningKey(object):
         h = hashfunc(data).digest()
         return self.sign_digest(h, entropy, sigencode, k, allow_truncate)
 
+    def asign(
+        self,
+        data,
+        entropy=None,
+        hashfunc=None,
+        sigencode=sigencode_string,
+        k=None,
+        allow_truncate=True,
+    ):
+        """
+        Create signature over data, without blocking the event loop.
+
+        Asynchronous version of :func:`sign`, to be awaited in
+        :py:mod:`asyncio` coroutines. The signing is performed in an
+        executor, together with other concurrent requests that use the same
+        key, see :py:mod:`ecdsa.aio` for configuration. Requires Python 3.5
+        or later.
+
+        See :func:`sign` for description of parameters.
+
+        :raises RSZeroError: in the unlikely event when *r* parameter or
+            *s* parameter of the created signature is equal 0
+
+        :return: awaitable that returns the encoded signature of the hash
+            of `data`
+        :rtype: awaitable
+        """
+        from . import aio
+
+        return aio.submit(
+            self,
+            self.sign,
+            (data, entropy, hashfunc, sigencode, k, allow_truncate),
+        )
+
     def sign_digest(
         self,
         digest,
@@ -1629,3 +1826,60 @@ class SigningKey(object):
         assert 1 <= _k < order
         sig = self.privkey.sign(number, _k)
         return sig.r, sig.s
+
+
+def _warmup_curve(curve):
+    """Calculate the lazily initialised data of the curve."""
+    generator = curve.generator
+    generator * 2
+    # the square root helper of the curve (and the Tonelli-Shanks
+    # parameters, if the prime needs them) used in decoding of compressed
+    # and Edwards points
+    curve.curve.square_root(generator.y() ** 2 % curve.curve.p())
+
+
+def warmup(curves=None, keys=None):
+    """
+    Calculate ahead of time the data that is normally created on first use.
+
+    The multiplication tables of the curve generators (and of precomputed
+    public keys) are calculated on first use. In a server that forks the
+    worker processes (like gunicorn or uwsgi with a master process),
+    calling this function in the master process before the fork means that
+    the workers don't have to calculate the tables on the first request
+    and they can share them, copy-on-write, with the master.
+    Note that as Python updates the reference counts of the objects in
+    the tables, pages with them will still get copied to the workers over
+    time, see :py:mod:`ecdsa.shared` for tables shared in their entirety.
+    The indexes used to look up curves when decoding keys are rebuilt
+    too, if the :data:`ecdsa.curves.curves` list was modified directly.
+
+    :param curves: curves to prepare; all known curves
+        (:data:`ecdsa.curves.curves`) by default
+    :type curves: iterable of ~ecdsa.curves.Curve
+    :param keys: keys to prepare; the public keys are precomputed (see
+        :func:`VerifyingKey.precompute`), for private keys
+        the generator of their curve is prepared
+    :type keys: iterable of VerifyingKey or SigningKey
+
+    :return: time spent on every curve and key, in seconds, in the order
+        they were prepared (curves first)
+    :rtype: list of tuple(Curve or VerifyingKey or SigningKey, float)
+    """
+    if curves is None:
+        curves = _known_curves
+    # the lookup indexes used when decoding keys
+    _curve_index()
+    report = []
+    for curve in curves:
+        start = timeit.default_timer()
+        _warmup_curve(curve)
+        report.append((curve, timeit.default_timer() - start))
+    for key in keys or ():
+        start = timeit.default_timer()
+        if isinstance(key, SigningKey):
+            _warmup_curve(key.curve)
+        elif not key.pubkey.point._maybe_precompute():
+            key.precompute()
+        report.append((key, timeit.default_timer() - start))
+    return report
@@ -218,20 +218,248 @@ def square_root_mod_prime(a, p):
         assert d == p - 1
         return (2 * a * pow(4 * a, (p - 5) // 8, p)) % p
 
+    return _tonelli_shanks(a, p)
+
+
+class SquareRootModPrime(object):
+    """
+    Modular square root for a fixed prime modulus.
+
+    Selects the cheapest method for the given prime once, so that it doesn't
+    have to be done for every calculated root. In contrast to
+    :func:`square_root_mod_prime`, the Jacobi symbol is not calculated,
+    instead the candidate root is checked (for p = 3 mod 4 and p = 5 mod 8)
+    or Euler's criterion falls out of the calculation (for other primes).
+    Because of that, p must be a prime.
+
+    :param int p: the prime modulus
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.__mod8 = p % 8
+        if self.__mod8 % 4 == 3:
+            self.__exp = (p + 1) // 4
+        elif self.__mod8 == 5:
+            self.__exp = (p - 1) // 4
+            # 2 is a quadratic non-residue for p = 5 mod 8
+            self.__sqrt_m1 = pow(2, self.__exp, p)
+        else:
+            self.__exp = None
+
+    def __call__(self, a):
+        """
+        Calculate square root of a modulo p.
+
+        :param int a: the square, must be in the range [0, p)
+
+        :raises SquareRootError: when a is not a quadratic residue modulo p
+
+        :rtype: int
+        """
+        p = self.p
+        if a == 0:
+            return 0
+
+        if self.__mod8 % 4 == 3:
+            root = pow(a, self.__exp, p)
+            if root * root % p != a:
+                raise SquareRootError(
+                    "%d has no square root modulo %d" % (a, p)
+                )
+            return root
+
+        if self.__mod8 == 5:
+            d = pow(a, self.__exp, p)
+            if d == 1:
+                return pow(a, (p + 3) // 8, p)
+            if d != p - 1:
+                raise SquareRootError(
+                    "%d has no square root modulo %d" % (a, p)
+                )
+            return (2 * a * pow(4 * a, (p - 5) // 8, p)) % p
+
+        return _tonelli_shanks(a, p)
+
+    def ratio(self, u, v):
+        """
+        Calculate square root of u/v modulo p.
+
+        For p = 3 mod 4 and p = 5 mod 8 this uses the formulas from
+        RFC 8032 (sections 5.2.3 and 5.1.3 respectively) that calculate the
+        inverse and the square root with a single exponentiation.
+
+        :param int u: the numerator, must be in the range [0, p)
+        :param int v: the denominator, must be in the range [1, p)
+
+        :raises SquareRootError: when u/v is not a quadratic residue modulo p
+
+        :rtype: int
+        """
+        p = self.p
+        if self.__mod8 % 4 == 3:
+            # x = u^3 * v * (u^5 * v^3)^((p-3)/4)
+            uv = u * v % p
+            u3v = u * u * uv % p
+            x = u3v * pow(u3v * uv * uv % p, (p - 3) // 4, p) % p
+            if v * x * x % p != u:
+                raise SquareRootError(
+                    "%d/%d has no square root modulo %d" % (u, v, p)
+                )
+            return x
+
+        if self.__mod8 == 5:
+            # x = u * v^3 * (u * v^7)^((p-5)/8)
+            v3 = v * v * v % p
+            uv3 = u * v3 % p
+            x = uv3 * pow(uv3 * v3 * v % p, (p - 5) // 8, p) % p
+            vx2 = v * x * x % p
+            if vx2 == u:
+                return x
+            if vx2 == p - u:
+                return x * self.__sqrt_m1 % p
+            raise SquareRootError(
+                "%d/%d has no square root modulo %d" % (u, v, p)
+            )
+
+        return self(u * inverse_mod(v, p) % p)
+
+
+# cache of the Tonelli-Shanks parameters (see _tonelli_shanks_params())
+# for the recently used primes
+_TONELLI_SHANKS_CACHE_SIZE = 64
+# size (in bits) of the discrete logarithm lookup tables
+_TONELLI_SHANKS_WINDOW = 5
+_tonelli_shanks_cache = {}
+
+
+def _tonelli_shanks_params(p):
+    """
+    Return the parameters of Tonelli-Shanks algorithm for prime p.
+
+    With p - 1 = q * 2**s (q odd) and g being the q-th power of a quadratic
+    non-residue, g generates the subgroup of order 2**s. The square root
+    of `a` is then found by computing the discrete logarithm of a**q in
+    that subgroup, `w` bits at a time.
+
+    :return: tuple with: the exponent s, odd q, sizes of the consecutive
+        digits of the discrete logarithm, dictionary with discrete logarithms
+        of g**(2**(s-w) * d) for all d < 2**w, dictionary with lists of
+        g**(-d * 2**i) for d < 2**w and all i that are needed, and the inverse
+        of g
+    """
+    try:
+        return _tonelli_shanks_cache[p]
+    except KeyError:
+        pass
+
+    q = p - 1
+    s = 0
+    while not q & 1:
+        q >>= 1
+        s += 1
+
     if PY2:
         # xrange on python2 can take integers representable as C long only
         range_top = min(0x7FFFFFFF, p)
     else:
         range_top = p
-    for b in xrange(2, range_top):  # pragma: no branch
-        if jacobi(b * b - 4 * a, p) == -1:
-            f = (a, -b, 1)
-            ff = polynomial_exp_mod((0, 1), (p + 1) // 2, f, p)
-            if ff[1]:
-                raise SquareRootError("p is not prime")
-            return ff[0]
-    # just an assertion
-    raise RuntimeError("No b found.")  # pragma: no cover
+    for z in xrange(2, range_top):  # pragma: no branch
+        if jacobi(z, p) == -1:
+            break
+    else:
+        raise SquareRootError("p is not prime")
+
+    g = pow(z, q, p)
+    g_powers = [g]
+    for _ in xrange(s - 1):
+        g_powers.append(g_powers[-1] * g_powers[-1] % p)
+
+    w = min(s, _TONELLI_SHANKS_WINDOW)
+    h = g_powers[s - w]
+    dlog = {}
+    acc = 1
+    for d in xrange(1 << w):
+        dlog[acc] = d
+        acc = acc * h % p
+
+    # the lowest digit is the short one so that all steps can use the
+    # same lookup table
+    count = (s + w - 1) // w
+    sizes = [s - w * (count - 1)] + [w] * (count - 1)
+
+    positions = set()
+    k = 0
+    for j, size in enumerate(sizes):
+        e = s - k - size
+        k_i = 0
+        for size_i in sizes[:j]:
+            positions.add(k_i + e)
+            k_i += size_i
+        k += size
+    tables = {}
+    for pos in positions:
+        inv = inverse_mod(g_powers[pos], p)
+        table = [1]
+        for _ in xrange((1 << w) - 1):
+            table.append(table[-1] * inv % p)
+        tables[pos] = table
+
+    params = (s, q, sizes, dlog, tables, inverse_mod(g, p))
+    if len(_tonelli_shanks_cache) >= _TONELLI_SHANKS_CACHE_SIZE:
+        _tonelli_shanks_cache.clear()
+    _tonelli_shanks_cache[p] = params
+    return params
+
+
+def _tonelli_shanks(a, p):
+    """Square root of a quadratic residue a modulo prime p."""
+    s, q, sizes, dlog, tables, g_inv = _tonelli_shanks_params(p)
+    w = sizes[-1]
+
+    a_q1 = pow(a, (q - 1) // 2, p)
+    root = a_q1 * a % p
+    # t = a**q = g**x, as a is a quadratic residue, x is even and
+    # the square root is a**((q+1)/2) * g**(-x/2)
+    t = a_q1 * root % p
+
+    t_powers = [t]
+    for _ in xrange(s - 1):
+        t_powers.append(t_powers[-1] * t_powers[-1] % p)
+    # Euler's criterion: a**((p-1)/2) == t**(2**(s-1)) == 1 iff a is a square
+    if t_powers[-1] != 1:
+        if t_powers[-1] == p - 1:
+            raise SquareRootError("%d has no square root modulo %d" % (a, p))
+        raise SquareRootError("p is not prime")
+
+    # find x digit by digit, from the least significant one: with xlow
+    # being the already known k bits of x,
+    # (t * g**(-xlow))**(2**(s - k - size)) = g**(2**(s - size) * digit)
+    x = 0
+    digits = []
+    k = 0
+    for size in sizes:
+        e = s - k - size
+        u = t_powers[e]
+        for k_i, d_i in digits:
+            u = u * tables[k_i + e][d_i] % p
+        try:
+            d = dlog[u]
+        except KeyError:
+            raise SquareRootError("p is not prime")
+        if d & ((1 << (w - size)) - 1):
+            raise SquareRootError("p is not prime")
+        d >>= w - size
+        digits.append((k, d))
+        x += d << k
+        k += size
+
+    if x & 1:
+        raise SquareRootError("p is not prime")
+    root = root * pow(g_inv, x >> 1, p) % p
+    if root * root % p != a:
+        raise SquareRootError("p is not prime")
+    return root
 
 
 # because all the inverse_mod code is arch/environment specific, and coveralls
@@ -291,6 +519,40 @@ else:  # pragma: no branch
         return lm % m
 
 
+def inverse_mod_batch(values, m):
+    """
+    Inverses of all the values mod m.
+
+    Uses Montgomery's trick, so just one modular inversion is performed,
+    all the values must be invertible, or 0 (like in :func:`inverse_mod`,
+    inverse of 0 is 0).
+
+    :param values: the values to invert
+    :type values: list of int
+    :param int m: the modulus
+
+    :rtype: list of int
+    """
+    # prefix products of the non-zero values
+    products = []
+    acc = 1
+    for value in values:
+        if value:
+            acc = acc * value % m
+        products.append(acc)
+
+    inverse = inverse_mod(acc, m)
+    results = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        value = values[i]
+        if not value:
+            continue
+        prev = products[i - 1] if i else 1
+        results[i] = inverse * prev % m
+        inverse = inverse * value % m
+    return results
+
+
 try:
     gcd2 = math.gcd
 except AttributeError:
@@ -0,0 +1,198 @@
+"""
+Verification of many signatures using multiple processes.
+
+As the library is implemented in pure Python, a single process can use
+just one CPU core. The :class:`VerificationPool` spreads the verification
+of signatures over a :py:class:`multiprocessing.Pool` of worker processes.
+
+The public keys are sent to every worker process just once, when it's
+started, and every worker precomputes the multiplication tables of the
+keys it uses (see :func:`~ecdsa.keys.VerifyingKey.precompute`), so the
+verification in the workers is faster than with plain keys. The
+signatures are sent to the workers in chunks, to amortise the cost of
+inter-process communication.
+
+Example:
+
+.. code-block:: python
+
+    from ecdsa.parallel import VerificationPool
+
+    with VerificationPool({"alice": vk_a, "bob": vk_b}, processes=32) as pool:
+        results = pool.verify(
+            [("alice", sig1, data1), ("bob", sig2, data2)]
+        )
+"""
+
+from .keys import BadSignatureError
+from .util import sigdecode_string
+
+
+__all__ = ["VerificationPool"]
+
+
+# state of the worker process, set by _init_worker()
+_worker_keys = None
+_worker_options = None
+
+
+def _init_worker(keys, precompute, options):
+    """Save the keys and verification options in the worker process."""
+    global _worker_keys, _worker_options
+    if precompute:
+        for key in keys.values():
+            # calculate the tables on first use of the key, not every
+            # worker will see signatures made with every key
+            key.precompute(lazy=True)
+    _worker_keys = keys
+    _worker_options = options
+
+
+def _verify(item):
+    """Verify a single (key id, signature, data) request in a worker."""
+    key_id, signature, data = item
+    hashfunc, sigdecode, allow_truncate, _ = _worker_options
+    try:
+        return _worker_keys[key_id].verify(
+            signature, data, hashfunc, sigdecode, allow_truncate
+        )
+    except BadSignatureError:
+        return False
+
+
+def _verify_digest(item):
+    """Verify a single (key id, signature, digest) request in a worker."""
+    key_id, signature, digest = item
+    _, sigdecode, _, allow_truncate = _worker_options
+    try:
+        return _worker_keys[key_id].verify_digest(
+            signature, digest, sigdecode, allow_truncate
+        )
+    except BadSignatureError:
+        return False
+
+
+class VerificationPool(object):
+    """
+    Pool of worker processes for verification of signatures.
+
+    Works with both ECDSA and EdDSA keys, for EdDSA keys the `hashfunc`,
+    `sigdecode`, `allow_truncate` and `digest_allow_truncate` options are
+    ignored (as in
+    :func:`~ecdsa.keys.VerifyingKey.verify`).
+
+    :ivar keys: the public keys available in the workers
+    :vartype keys: dict
+    """
+
+    def __init__(
+        self,
+        keys,
+        processes=None,
+        chunksize=64,
+        precompute=True,
+        hashfunc=None,
+        sigdecode=sigdecode_string,
+        allow_truncate=True,
+        digest_allow_truncate=False,
+    ):
+        """
+        Start the worker processes.
+
+        :param keys: public keys to use for verification, either a
+            dictionary (the keys of the dictionary are then used to select
+            the public key in the requests) or a list (the index in the
+            list is then used)
+        :type keys: dict or list of VerifyingKey
+        :param int processes: number of worker processes, by default the
+            number of CPUs
+        :param int chunksize: number of requests sent to a worker process
+            at a time
+        :param bool precompute: whether the workers should precompute
+            multiplication tables of the public keys
+        :param hashfunc: hash function to use for :func:`verify`, by default
+            the default hash function of the key, see
+            :func:`~ecdsa.keys.VerifyingKey.verify`
+        :type hashfunc: callable
+        :param sigdecode: Callable to decode the signatures, see
+            :func:`~ecdsa.keys.VerifyingKey.verify`
+        :type sigdecode: callable
+        :param bool allow_truncate: if True, the hashes of the data in
+            :func:`verify` can have bigger bit-size than the order of the
+            curve, see :func:`~ecdsa.keys.VerifyingKey.verify`
+        :param bool digest_allow_truncate: if True, the digests passed to
+            :func:`verify_digest` can have bigger bit-size than the order
+            of the curve, see
+            :func:`~ecdsa.keys.VerifyingKey.verify_digest`
+        """
+        import multiprocessing
+
+        if not isinstance(keys, dict):
+            keys = dict(enumerate(keys))
+        self.keys = keys
+        self._chunksize = chunksize
+        self._pool = multiprocessing.Pool(
+            processes,
+            _init_worker,
+            (
+                keys,
+                precompute,
+                (hashfunc, sigdecode, allow_truncate, digest_allow_truncate),
+            ),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _map(self, func, requests):
+        requests = list(requests)
+        for key_id, _, _ in requests:
+            if key_id not in self.keys:
+                raise KeyError("Unknown key: {0!r}".format(key_id))
+        return self._pool.map(func, requests, self._chunksize)
+
+    def verify(self, requests):
+        """
+        Verify signatures made over provided data.
+
+        :param requests: tuples with the identifier of the public key
+            (key in the `keys` dictionary or index in the `keys` list),
+            the signature and the signed data
+        :type requests: iterable of tuples
+
+        :raises KeyError: if any of the requests uses unknown key
+
+        :return: results of verification, in the order of the requests,
+            False for invalid or malformed signatures
+        :rtype: list of bool
+        """
+        return self._map(_verify, requests)
+
+    def verify_digest(self, requests):
+        """
+        Verify signatures made over provided hash values.
+
+        Supported for ECDSA keys only.
+
+        :param requests: tuples with the identifier of the public key
+            (key in the `keys` dictionary or index in the `keys` list),
+            the signature and the signed digest
+        :type requests: iterable of tuples
+
+        :raises KeyError: if any of the requests uses unknown key
+        :raises BadDigestError: if any of the digests is too big for the
+            curve of its key and `digest_allow_truncate` was not set
+
+        :return: results of verification, in the order of the requests,
+            False for invalid or malformed signatures
+        :rtype: list of bool
+        """
+        return self._map(_verify_digest, requests)
+
+    def close(self):
+        """Stop the worker processes."""
+        self._pool.terminate()
+        self._pool.join()
@@ -0,0 +1,275 @@
+"""
+Precomputation tables in memory shared between processes.
+
+The generators of the curves and the precomputed public keys (see
+:func:`~ecdsa.keys.VerifyingKey.precompute`) use multiplication tables
+that take tens of kilobytes per point when stored as Python objects.
+In a pre-fork server or a process pool, every worker holds its own copy
+of them: even tables created before fork are copied, page by page, as the
+reference counts of the objects in them get updated.
+
+:class:`SharedPrecompute` stores the tables in a compact binary form (fixed
+size integers) in a single memory-mapped block and makes the points read
+the tables from it, so the tables occupy memory just once for all the
+workers. Use an anonymous mapping (the default) for workers created with
+:py:func:`os.fork`, or a file for unrelated processes or for
+the ``spawn`` start method of :py:mod:`multiprocessing`.
+
+Reading the integers from the shared block on every multiplication makes
+multiplication with a precomputed point about 10 to 15% slower than with a
+regular table.
+
+Example:
+
+.. code-block:: python
+
+    from ecdsa import NIST256p
+    from ecdsa.shared import SharedPrecompute
+
+    # in the parent process, before starting the workers
+    tables = SharedPrecompute.create([NIST256p, vk1, vk2], "/run/ecdsa.tbl")
+
+    # in workers started with "spawn", after loading the keys
+    tables = SharedPrecompute.open("/run/ecdsa.tbl")
+    tables.attach(NIST256p, vk1, vk2)
+"""
+
+import hashlib
+import mmap
+import struct
+from .curves import Curve
+from .keys import VerifyingKey
+from .ellipticcurve import PointJacobi, PointEdwards
+from .util import number_to_string, orderlen
+from ._compat import bytes_to_int
+
+
+__all__ = ["SharedPrecompute"]
+
+
+_MAGIC = b"ECDSAPRE"
+_HEADER = struct.Struct(">8sI")
+# id of the point, length of table entry, size of integers, number of
+# entries and offset of the table in the block
+_INDEX_ENTRY = struct.Struct(">32sBHIQ")
+
+
+class _SharedTable(object):
+    """Read-only precomputation table stored in a shared memory block."""
+
+    __slots__ = ("_block", "_offset", "_width", "_entry_len", "_count")
+
+    def __init__(self, block, offset, width, entry_len, count):
+        self._block = block
+        self._offset = offset
+        self._width = width
+        self._entry_len = entry_len
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._count:
+            raise IndexError("table index out of range")
+        width = self._width
+        i = self._offset + index * width * self._entry_len
+        j = i + width
+        if self._entry_len == 2:
+            return (
+                bytes_to_int(self._block[i:j], "big"),
+                bytes_to_int(self._block[j : j + width], "big"),
+            )
+        k = j + width
+        return (
+            bytes_to_int(self._block[i:j], "big"),
+            bytes_to_int(self._block[j:k], "big"),
+            bytes_to_int(self._block[k : k + width], "big"),
+        )
+
+
+def _object_point(obj):
+    """Return the point of the object, without changing the object."""
+    if isinstance(obj, Curve):
+        return obj.generator
+    if isinstance(obj, VerifyingKey):
+        return obj.pubkey.point
+    if isinstance(obj, (PointJacobi, PointEdwards)):
+        return obj
+    raise TypeError("Unsupported object type: {0}".format(type(obj).__name__))
+
+
+def _get_point(obj, compute):
+    """
+    Return the generator point that holds the table of the object.
+
+    Calculates the table when `compute` is set, otherwise just makes sure
+    the point can have one.
+    """
+    point = _object_point(obj)
+    if isinstance(obj, VerifyingKey):
+        if not compute or not point._maybe_precompute():
+            obj.precompute(lazy=True)
+        point = obj.pubkey.point
+    if compute and not point._maybe_precompute():
+        raise ValueError("Only generator points have precomputed tables")
+    return point
+
+
+def _point_id(point):
+    """Return identifier of the point, independent of the object."""
+    p = point.curve().p()
+    point = point.scale()
+    return hashlib.sha256(
+        type(point).__name__.encode()
+        + number_to_string(p, p)
+        + number_to_string(point.x(), p)
+        + number_to_string(point.y(), p)
+    ).digest()
+
+
+class SharedPrecompute(object):
+    """
+    Precomputation tables stored in a shared, memory-mapped block.
+
+    Use :func:`create` or :func:`open` to get an instance.
+
+    The block needs to stay mapped for as long as the points that use
+    the tables are used, so :func:`close` should be called only when
+    exiting.
+    """
+
+    def __init__(self, block, index):
+        """Do not use directly, use :func:`create` or :func:`open`."""
+        self._block = block
+        self._index = index
+
+    @classmethod
+    def create(cls, objects, path=None):
+        """
+        Calculate the tables and store them in a shared block.
+
+        The tables are then used by the points of the objects in the
+        calling process and in processes forked from it later.
+
+        :param objects: curves (for their generators), public keys
+            (precomputed automatically if necessary) or generator points
+        :type objects: iterable of Curve, VerifyingKey, PointJacobi or
+            PointEdwards
+        :param str path: file to save the tables to, for use with
+            :func:`open`; anonymous shared memory is used when ``None``
+
+        :raises TypeError: when an object of unsupported type is passed
+        :raises ValueError: when a point without precomputation is passed
+
+        :rtype: SharedPrecompute
+        """
+        tables = []
+        seen = set()
+        for obj in objects:
+            point = _get_point(obj, True)
+            point_id = _point_id(point)
+            if point_id in seen:
+                continue
+            seen.add(point_id)
+            tables.append((point, point_id, list(point._maybe_precompute())))
+
+        offset = _HEADER.size + _INDEX_ENTRY.size * len(tables)
+        header = [_HEADER.pack(_MAGIC, len(tables))]
+        data = []
+        for point, point_id, table in tables:
+            p = point.curve().p()
+            width = orderlen(p)
+            entry_len = len(table[0])
+            header.append(
+                _INDEX_ENTRY.pack(
+                    point_id, entry_len, width, len(table), offset
+                )
+            )
+            encoded = b"".join(
+                number_to_string(i, p) for entry in table for i in entry
+            )
+            data.append(encoded)
+            offset += len(encoded)
+        contents = b"".join(header + data)
+
+        if path is None:
+            block = mmap.mmap(-1, len(contents))
+            block.write(contents)
+        else:
+            with open(path, "wb") as f:
+                f.write(contents)
+            with open(path, "rb") as f:
+                block = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self = cls(block, cls._read_index(block))
+        self.attach(*(point for point, _, _ in tables))
+        return self
+
+    @classmethod
+    def open(cls, path):
+        """
+        Map the tables saved with :func:`create` from a file.
+
+        :param str path: file with the tables
+
+        :raises ValueError: when the file doesn't contain the tables
+
+        :rtype: SharedPrecompute
+        """
+        with open(path, "rb") as f:
+            block = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(block, cls._read_index(block))
+
+    @staticmethod
+    def _read_index(block):
+        if len(block) < _HEADER.size:
+            raise ValueError("Not a precomputation table file")
+        magic, count = _HEADER.unpack(block[: _HEADER.size])
+        if magic != _MAGIC:
+            raise ValueError("Not a precomputation table file")
+        index = {}
+        for i in range(count):
+            start = _HEADER.size + i * _INDEX_ENTRY.size
+            point_id, entry_len, width, entries, offset = _INDEX_ENTRY.unpack(
+                block[start : start + _INDEX_ENTRY.size]
+            )
+            if offset + entries * entry_len * width > len(block):
+                raise ValueError("Truncated precomputation table file")
+            index[point_id] = (offset, width, entry_len, entries)
+        return index
+
+    def __contains__(self, obj):
+        """Check if the table for the object is in the shared block."""
+        return _point_id(_object_point(obj)) in self._index
+
+    def attach(self, *objects):
+        """
+        Make the points of the objects use the tables from the shared block.
+
+        :param objects: curves, public keys or generator points, as in
+            :func:`create`
+
+        :raises KeyError: when the block doesn't have the table for any
+            of the objects
+        :raises ValueError: when any of the points is not a generator point
+        """
+        points = []
+        for obj in objects:
+            point = _get_point(obj, False)
+            point_id = _point_id(point)
+            if point_id not in self._index:
+                raise KeyError("No shared table for {0!r}".format(obj))
+            points.append((point, self._index[point_id]))
+        for point, (offset, width, entry_len, count) in points:
+            point._set_precompute(
+                _SharedTable(self._block, offset, width, entry_len, count)
+            )
+
+    def close(self):
+        """
+        Unmap the shared block.
+
+        The points attached to it can't be multiplied afterwards.
+        """
+        self._block.close()
@@ -0,0 +1,243 @@
+import sys
+import threading
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import pytest
+
+if sys.version_info < (3, 5):  # pragma: no cover
+    pytest.skip("asyncio API requires Python 3.5", allow_module_level=True)
+
+import asyncio
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+)
+from . import aio
+from .curves import NIST256p, Ed25519
+from .keys import SigningKey, BadSignatureError
+from .util import sigencode_der, sigdecode_der
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Executor that records sizes of the batches."""
+
+    def __init__(self):
+        super(RecordingExecutor, self).__init__(1)
+        self.batches = []
+
+    def submit(self, fn, calls):
+        self.batches.append(len(calls))
+        return super(RecordingExecutor, self).submit(fn, calls)
+
+
+class CancellingExecutor(ThreadPoolExecutor):
+    """Executor that cancels all the jobs."""
+
+    def submit(self, fn, calls):
+        future = Future()
+        future.cancel()
+        return future
+
+
+class TestAsyncAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sk = SigningKey.generate(NIST256p)
+        cls.vk = cls.sk.verifying_key
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.executor = RecordingExecutor()
+        aio.configure(executor=self.executor, max_batch=4, max_queue=2)
+
+    def tearDown(self):
+        aio.configure()
+        self.executor.shutdown()
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_loop(self, *coros, **kwargs):
+        return self.loop.run_until_complete(asyncio.gather(*coros, **kwargs))
+
+    def test_averify(self):
+        sig = self.sk.sign(b"message")
+
+        results = self.run_loop(self.vk.averify(sig, b"message"))
+
+        self.assertEqual(results, [True])
+
+    def test_averify_with_invalid_signature(self):
+        sig = self.sk.sign(b"message")
+
+        with self.assertRaises(BadSignatureError):
+            self.run_loop(self.vk.averify(sig, b"other message"))
+
+    def test_averify_with_options(self):
+        sig = self.sk.sign(b"message", sigencode=sigencode_der)
+
+        results = self.run_loop(
+            self.vk.averify(sig, b"message", sigdecode=sigdecode_der)
+        )
+
+        self.assertEqual(results, [True])
+
+    def test_asign(self):
+        sigs = self.run_loop(*[self.sk.asign(b"message") for _ in range(3)])
+
+        self.assertEqual(len(set(sigs)), 3)
+        for sig in sigs:
+            self.assertTrue(self.vk.verify(sig, b"message"))
+
+    def test_asign_eddsa(self):
+        sk = SigningKey.generate(Ed25519)
+
+        sigs = self.run_loop(sk.asign(b"message"))
+
+        self.assertEqual(sigs, [sk.sign(b"message")])
+
+    def test_requests_are_batched(self):
+        messages = [str(i).encode() for i in range(10)]
+        sigs = [self.sk.sign(m) for m in messages]
+
+        results = self.run_loop(
+            *[self.vk.averify(s, m) for s, m in zip(sigs, messages)]
+        )
+
+        self.assertEqual(results, [True] * 10)
+        self.assertEqual(sum(self.executor.batches), 10)
+        self.assertLess(len(self.executor.batches), 10)
+        self.assertLessEqual(max(self.executor.batches), 4)
+        self.assertEqual(aio._batchers.get(self.loop), {})
+
+    def test_callers_wait_for_space_in_queue(self):
+        aio.configure(executor=self.executor, max_batch=1, max_queue=2)
+        key = object()
+        release = threading.Event()
+
+        def work(i):
+            release.wait(10)
+            return i
+
+        tasks = [
+            asyncio.ensure_future(aio.submit(key, work, (i,)), loop=self.loop)
+            for i in range(6)
+        ]
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        batcher = aio._batchers[self.loop][id(key)]
+        # one request is in the executor, two in the queue, the rest
+        # of the callers wait for space
+        self.assertEqual(self.executor.batches, [1])
+        self.assertEqual([args for _, args, _ in batcher.queue], [(1,), (2,)])
+        self.assertEqual(len(batcher.waiting), 3)
+
+        release.set()
+        results = self.loop.run_until_complete(asyncio.gather(*tasks))
+
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(self.executor.batches, [1] * 6)
+
+    def test_cancelled_caller_waiting_for_space(self):
+        aio.configure(executor=self.executor, max_batch=1, max_queue=1)
+        key = object()
+        release = threading.Event()
+
+        def work(i):
+            release.wait(10)
+            return i
+
+        tasks = [
+            asyncio.ensure_future(aio.submit(key, work, (i,)), loop=self.loop)
+            for i in range(4)
+        ]
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        batcher = aio._batchers[self.loop][id(key)]
+        self.assertEqual(len(batcher.waiting), 2)
+        tasks[2].cancel()
+        release.set()
+        results = self.loop.run_until_complete(
+            asyncio.gather(*tasks, return_exceptions=True)
+        )
+
+        self.assertEqual(results[:2] + results[3:], [0, 1, 3])
+        self.assertIsInstance(results[2], asyncio.CancelledError)
+        self.assertEqual(self.executor.batches, [1] * 3)
+        self.assertEqual(aio._batchers.get(self.loop), {})
+
+    def test_mixed_results_in_batch(self):
+        sig = self.sk.sign(b"message")
+
+        results = self.run_loop(
+            *[
+                self.vk.averify(sig, m)
+                for m in (b"message", b"other", b"message")
+            ],
+            return_exceptions=True
+        )
+
+        self.assertIs(results[0], True)
+        self.assertIsInstance(results[1], BadSignatureError)
+        self.assertIs(results[2], True)
+
+    def test_await_twice(self):
+        sig = self.sk.sign(b"message")
+        call = self.vk.averify(sig, b"message")
+
+        self.assertIs(self.loop.run_until_complete(call), True)
+        self.assertIs(self.loop.run_until_complete(call), True)
+        self.assertEqual(self.executor.batches, [1])
+
+    def test_cancelled_batch(self):
+        sig = self.sk.sign(b"message")
+        executor = CancellingExecutor(1)
+        aio.configure(executor=executor)
+        try:
+            results = self.run_loop(
+                self.vk.averify(sig, b"message"),
+                self.vk.averify(sig, b"message"),
+                return_exceptions=True,
+            )
+        finally:
+            executor.shutdown()
+
+        for result in results:
+            self.assertIsInstance(result, asyncio.CancelledError)
+        self.assertEqual(aio._batchers.get(self.loop), {})
+
+    def test_configure_with_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            aio.configure(max_batch=0)
+        with self.assertRaises(ValueError):
+            aio.configure(max_queue=0)
+
+
+class TestAsyncAPIWithProcesses(unittest.TestCase):
+    def test_averify(self):
+        sk = SigningKey.generate(NIST256p)
+        sig = sk.sign(b"message")
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        executor = ProcessPoolExecutor(1)
+        aio.configure(executor=executor)
+        try:
+            results = loop.run_until_complete(
+                asyncio.gather(
+                    sk.verifying_key.averify(sig, b"message"),
+                    sk.verifying_key.averify(sig, b"other"),
+                    return_exceptions=True,
+                )
+            )
+        finally:
+            aio.configure()
+            executor.shutdown()
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        self.assertIs(results[0], True)
+        self.assertIsInstance(results[1], BadSignatureError)
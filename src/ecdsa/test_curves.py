@@ -4,6 +4,9 @@ except ImportError:
     import unittest
 
 import base64
+import pickle
+import sys
+import threading
 import pytest
 from .curves import (
     Curve,
@@ -12,6 +15,8 @@ from .curves import (
     UnknownCurveError,
     PRIME_FIELD_OID,
     curve_by_name,
+    find_curve,
+    register_curve,
 )
 from .ellipticcurve import CurveFp, PointJacobi, CurveEdTw
 from . import der
@@ -325,6 +330,140 @@ class TestCurveSearching(unittest.TestCase):
         )
 
 
+class TestCurvePickle(unittest.TestCase):
+    @pytest.mark.skipif(
+        sys.version_info < (3, 0),
+        reason="old-style classes are pickled by value on Python 2",
+    )
+    def test_named_curve(self):
+        self.assertIs(pickle.loads(pickle.dumps(NIST256p)), NIST256p)
+
+    def test_named_curve_equality(self):
+        unpickled = pickle.loads(pickle.dumps(NIST256p))
+
+        self.assertEqual(unpickled, NIST256p)
+        self.assertEqual(unpickled.name, "NIST256p")
+
+    def test_curve_without_oid(self):
+        curve = Curve(
+            "custom", NIST256p.curve, NIST256p.generator, None, "custom"
+        )
+
+        unpickled = pickle.loads(pickle.dumps(curve))
+
+        self.assertEqual(unpickled, curve)
+        self.assertEqual(unpickled.name, "custom")
+        self.assertIsNone(unpickled.oid)
+
+    def test_curve_with_unknown_oid(self):
+        curve = Curve("custom", NIST256p.curve, NIST256p.generator, (1, 2, 3))
+
+        unpickled = pickle.loads(pickle.dumps(curve))
+
+        self.assertEqual(unpickled, curve)
+        self.assertEqual(unpickled.oid, (1, 2, 3))
+
+
+class TestCurveRegistration(unittest.TestCase):
+    def setUp(self):
+        gen = NIST256p.generator * 2
+        gen = PointJacobi(
+            NIST256p.curve, gen.x(), gen.y(), 1, gen.order(), generator=True
+        )
+        self.curve = Curve(
+            "TestCurve",
+            NIST256p.curve,
+            gen,
+            (1, 3, 6, 1, 4, 1, 56266, 1),
+            "testcurve",
+        )
+
+    def tearDown(self):
+        if self.curve in curves:
+            curves.remove(self.curve)
+
+    def test_unregistered(self):
+        with self.assertRaises(UnknownCurveError):
+            find_curve(self.curve.oid)
+        self.assertEqual(
+            Curve.from_der(self.curve.to_der("explicit")).name, "unknown"
+        )
+
+    def test_register(self):
+        register_curve(self.curve)
+
+        self.assertIs(find_curve(self.curve.oid), self.curve)
+        self.assertIs(curve_by_name("TestCurve"), self.curve)
+        self.assertIs(curve_by_name("testcurve"), self.curve)
+        self.assertIs(Curve.from_der(self.curve.to_der()), self.curve)
+        self.assertIs(
+            Curve.from_der(self.curve.to_der("explicit")), self.curve
+        )
+
+    def test_register_twice(self):
+        register_curve(self.curve)
+        register_curve(self.curve)
+
+        self.assertEqual(sum(1 for i in curves if i is self.curve), 1)
+
+    def test_register_with_duplicate_oid(self):
+        self.curve.oid = NIST256p.oid
+
+        with self.assertRaises(ValueError) as e:
+            register_curve(self.curve)
+
+        self.assertIn("OID", str(e.exception))
+        self.assertIs(find_curve(NIST256p.oid), NIST256p)
+
+    def test_register_with_duplicate_name(self):
+        self.curve.openssl_name = "prime256v1"
+
+        with self.assertRaises(ValueError) as e:
+            register_curve(self.curve)
+
+        self.assertIn("prime256v1", str(e.exception))
+        self.assertIs(curve_by_name("prime256v1"), NIST256p)
+
+    def test_appended_directly_to_curves(self):
+        curves.append(self.curve)
+
+        self.assertIs(find_curve(self.curve.oid), self.curve)
+        self.assertIs(
+            Curve.from_der(self.curve.to_der("explicit")), self.curve
+        )
+
+    def test_lookups_during_index_rebuild(self):
+        errors = []
+        stop = threading.Event()
+
+        def lookup():
+            try:
+                while not stop.is_set():
+                    curve_by_name("NIST256p")
+                    find_curve(NIST256p.oid)
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(200):
+                # every change of the list causes rebuild of the index
+                curves.append(self.curve)
+                curve_by_name("TestCurve")
+                curves.remove(self.curve)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_explicit_parameters_of_well_known_curve(self):
+        self.assertIs(Curve.from_der(NIST256p.to_der("explicit")), NIST256p)
+
+
 @pytest.mark.parametrize("curve", curves, ids=[i.name for i in curves])
 def test_curve_params_encode_decode_named(curve):
     ret = Curve.from_der(curve.to_der("named_curve"))
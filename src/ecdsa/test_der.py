@@ -26,8 +26,15 @@ from .der import (
     remove_octet_string,
     remove_sequence,
     encode_implicit,
+    encode_integer,
+    encode_octet_string,
+    encode_sequence,
+    encode_constructed,
+    encode_ecdsa_sig_value,
+    decode_ecdsa_sig_value,
     unpem,
     topem,
+    Reader,
 )
 
 
@@ -567,6 +574,310 @@ class TestRemoveSequence(unittest.TestCase):
         self.assertIn("Length longer", str(e.exception))
 
 
+class TestReader(unittest.TestCase):
+    def test_read_sequence(self):
+        reader = Reader(b"\x30\x02\xff\xaa")
+        seq = reader.read_sequence()
+
+        self.assertTrue(reader.empty())
+        self.assertEqual(seq.remaining(), b"\xff\xaa")
+
+    def test_read_sequence_returns_view_of_input(self):
+        data = bytearray(b"\x30\x02\xff\xaa")
+        seq = Reader(data).read_sequence()
+
+        data[2] = 0x00
+
+        self.assertEqual(seq.remaining(), b"\x00\xaa")
+
+    def test_read_sequence_with_trailing_data(self):
+        reader = Reader(b"\x30\x01\xff\x04\x00")
+        reader.read_sequence()
+
+        self.assertFalse(reader.empty())
+        self.assertEqual(reader.remaining(), b"\x04\x00")
+
+    def test_read_sequence_with_empty_string(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"").read_sequence()
+
+        self.assertIn("Empty string", str(e.exception))
+
+    def test_read_sequence_with_wrong_tag(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"\x20\x02\xff\xaa").read_sequence()
+
+        self.assertIn("wanted type 'sequence'", str(e.exception))
+
+    def test_read_sequence_with_wrong_length(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"\x30\x03\xff\xaa").read_sequence()
+
+        self.assertIn("Length longer", str(e.exception))
+
+    def test_nested_reader_does_not_read_past_its_end(self):
+        reader = Reader(b"\x30\x03\x02\x01\x05\x02\x01\x06")
+        seq = reader.read_sequence()
+
+        self.assertEqual(seq.read_integer(), 5)
+        self.assertTrue(seq.empty())
+        with self.assertRaises(UnexpectedDER):
+            seq.read_integer()
+        self.assertEqual(reader.read_integer(), 6)
+
+    def test_is_sequence(self):
+        self.assertTrue(Reader(b"\x30\x00").is_sequence())
+        self.assertFalse(Reader(b"\x02\x01\x00").is_sequence())
+        self.assertFalse(Reader(b"").is_sequence())
+
+    def test_read_integer(self):
+        reader = Reader(b"\x02\x02\x00\x80\x02\x01\x01")
+
+        self.assertEqual(reader.read_integer(), 0x80)
+        self.assertEqual(reader.read_integer(), 1)
+        self.assertTrue(reader.empty())
+
+    def test_read_integer_with_empty_integer(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"\x02\x00").read_integer()
+
+        self.assertIn("0-byte long encoding of integer", str(e.exception))
+
+    def test_read_integer_negative(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"\x02\x01\x80").read_integer()
+
+        self.assertIn("Negative integers", str(e.exception))
+
+    def test_read_integer_with_non_minimal_encoding(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"\x02\x02\x00\x01").read_integer()
+
+        self.assertIn("Invalid encoding of integer", str(e.exception))
+
+    def test_read_integer_with_truncated_length(self):
+        with self.assertRaises(UnexpectedDER):
+            Reader(b"\x02\x82\x01").read_integer()
+
+    def test_read_object(self):
+        oid = (1, 2, 840, 10045, 3, 1, 7)
+        reader = Reader(encode_oid(*oid))
+
+        self.assertEqual(reader.read_object(), oid)
+        self.assertTrue(reader.empty())
+
+    def test_read_object_with_padded_subidentifier(self):
+        with self.assertRaises(UnexpectedDER):
+            Reader(b"\x06\x03\x2a\x80\x01").read_object()
+
+    def test_read_octet_string(self):
+        reader = Reader(b"\x04\x03\xaa\xbb\xcc")
+
+        self.assertEqual(reader.read_octet_string(), b"\xaa\xbb\xcc")
+        self.assertTrue(reader.empty())
+
+    def test_read_octet_string_with_malformed_tag(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            Reader(b"\x03\x03\xaa\xbb\xcc").read_octet_string()
+
+        self.assertIn("octetstring", str(e.exception))
+
+    def test_read_bitstring(self):
+        reader = Reader(b"\x03\x02\x00\xff")
+
+        self.assertEqual(reader.read_bitstring(0), b"\xff")
+        self.assertTrue(reader.empty())
+
+    def test_read_bitstring_with_unused_bits(self):
+        body, unused = Reader(b"\x03\x02\x01\xfe").read_bitstring(None)
+
+        self.assertEqual(body, b"\xfe")
+        self.assertEqual(unused, 1)
+
+    def test_read_bitstring_with_unexpected_unused_bits(self):
+        with self.assertRaises(UnexpectedDER):
+            Reader(b"\x03\x02\x01\xfe").read_bitstring(0)
+
+    def test_read_bitstring_with_truncated_body(self):
+        with self.assertRaises(UnexpectedDER):
+            Reader(b"\x03\x03\x00\xff").read_bitstring(0)
+
+    def test_read_constructed(self):
+        reader = Reader(encode_constructed(1, encode_integer(3)))
+        tag, body = reader.read_constructed()
+
+        self.assertEqual(tag, 1)
+        self.assertEqual(body.read_integer(), 3)
+        self.assertTrue(reader.empty())
+
+    def test_read_constructed_with_wrong_tag(self):
+        with self.assertRaises(UnexpectedDER):
+            Reader(b"\x30\x00").read_constructed()
+
+    def test_error_messages_match_remove_functions(self):
+        cases = [
+            (remove_sequence, Reader.read_sequence, b""),
+            (remove_sequence, Reader.read_sequence, b"\x31\x00"),
+            (remove_sequence, Reader.read_sequence, b"\x30\x02\x00"),
+            (remove_integer, Reader.read_integer, b""),
+            (remove_integer, Reader.read_integer, b"\x03\x01\x00"),
+            (remove_integer, Reader.read_integer, b"\x02\x02\x00"),
+            (remove_integer, Reader.read_integer, b"\x02\x00"),
+            (remove_object, Reader.read_object, b""),
+            (remove_object, Reader.read_object, b"\x05\x00"),
+            (remove_object, Reader.read_object, b"\x06\x00"),
+            (remove_object, Reader.read_object, b"\x06\x02\x2a"),
+            (remove_octet_string, Reader.read_octet_string, b"\x03\x00"),
+            (remove_octet_string, Reader.read_octet_string, b"\x04\x01"),
+            (remove_constructed, Reader.read_constructed, b"\x30\x00"),
+            (remove_constructed, Reader.read_constructed, b"\xa0\x01"),
+        ]
+        for unused in (0, None):
+            cases.extend(
+                (
+                    lambda d, u=unused: remove_bitstring(d, u),
+                    lambda r, u=unused: r.read_bitstring(u),
+                    data,
+                )
+                for data in (
+                    b"",
+                    b"\x04\x01\x00",
+                    b"\x03\x00",
+                    b"\x03\x02\x08\x00",
+                    b"\x03\x01\x01",
+                    b"\x03\x02\x01\x01",
+                )
+            )
+        cases.append(
+            (
+                lambda d: remove_bitstring(d, 0),
+                lambda r: r.read_bitstring(0),
+                b"\x03\x02\x01\x00",
+            )
+        )
+
+        for remove, read, data in cases:
+            with self.assertRaises(UnexpectedDER) as old:
+                remove(data)
+            with self.assertRaises(UnexpectedDER) as new:
+                read(Reader(data))
+
+            self.assertEqual(
+                str(new.exception), str(old.exception), repr(data)
+            )
+
+    def test_consistent_with_remove_functions(self):
+        data = encode_sequence(
+            encode_integer(1),
+            encode_octet_string(b"\x01\x02"),
+            encode_constructed(0, encode_oid(1, 3, 132, 0, 34)),
+        )
+        seq, _ = remove_sequence(data)
+        version, rest = remove_integer(seq)
+        octet, rest = remove_octet_string(rest)
+        tag, body, rest = remove_constructed(rest)
+        oid, _ = remove_object(body)
+
+        reader = Reader(data).read_sequence()
+        self.assertEqual(reader.read_integer(), version)
+        self.assertEqual(reader.read_octet_string(), octet)
+        r_tag, r_body = reader.read_constructed()
+        self.assertEqual(r_tag, tag)
+        self.assertEqual(r_body.read_object(), oid)
+        self.assertTrue(reader.empty())
+
+
+class TestEcdsaSigValue(unittest.TestCase):
+    def test_encode(self):
+        self.assertEqual(
+            encode_ecdsa_sig_value(1, 0x80),
+            b"\x30\x07\x02\x01\x01\x02\x02\x00\x80",
+        )
+
+    def test_encode_zero(self):
+        self.assertEqual(
+            encode_ecdsa_sig_value(0, 0),
+            b"\x30\x06\x02\x01\x00\x02\x01\x00",
+        )
+
+    def test_encode_returns_bytes(self):
+        for r in (0, 1, 0x80, 2**255 + 1):
+            self.assertIs(type(encode_integer(r)), bytes)
+            self.assertIs(type(encode_ecdsa_sig_value(r, r)), bytes)
+            self.assertIs(
+                type(encode_sequence(encode_integer(r), encode_integer(r))),
+                bytes,
+            )
+
+    def test_encode_with_long_form_length(self):
+        r = 2**520
+        sig = encode_ecdsa_sig_value(r, r)
+
+        self.assertEqual(
+            sig, encode_sequence(encode_integer(r), encode_integer(r))
+        )
+        self.assertEqual(sig[:3], b"\x30\x81\x88")
+
+    def test_decode(self):
+        sig = b"\x30\x07\x02\x01\x01\x02\x02\x00\x80"
+
+        self.assertEqual(decode_ecdsa_sig_value(sig), (1, 0x80))
+
+    def test_decode_with_empty_string(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"")
+
+        self.assertIn("Empty string", str(e.exception))
+
+    def test_decode_with_wrong_tag(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x31\x06\x02\x01\x01\x02\x01\x01")
+
+        self.assertIn("wanted type 'sequence'", str(e.exception))
+
+    def test_decode_with_trailing_junk(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x06\x02\x01\x01\x02\x01\x01\x00")
+
+        self.assertIn("trailing junk after DER sig", str(e.exception))
+
+    def test_decode_with_junk_after_numbers(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x08\x02\x01\x01\x02\x01\x01\x05\x00")
+
+        self.assertIn("trailing junk after DER numbers", str(e.exception))
+
+    def test_decode_with_missing_integer(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x03\x02\x01\x01")
+
+        self.assertIn("Empty string", str(e.exception))
+
+    def test_decode_with_integer_longer_than_sequence(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x05\x02\x01\x01\x02\x01")
+
+        self.assertIn("Length longer", str(e.exception))
+
+    def test_decode_with_negative_integer(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x06\x02\x01\x81\x02\x01\x01")
+
+        self.assertIn("Negative integers", str(e.exception))
+
+    def test_decode_with_padded_integer(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x07\x02\x01\x01\x02\x02\x00\x01")
+
+        self.assertIn("zero padding", str(e.exception))
+
+    def test_decode_with_non_minimal_length(self):
+        with self.assertRaises(UnexpectedDER) as e:
+            decode_ecdsa_sig_value(b"\x30\x81\x06\x02\x01\x01\x02\x01\x01")
+
+        self.assertIn("Not minimal encoding of length", str(e.exception))
+
+
 @st.composite
 def st_oid(draw, max_value=2**512, max_size=50):
     """
@@ -604,6 +915,26 @@ def test_oids(ids):
     assert decoded_oid == ids
 
 
+@settings(**HYP_SETTINGS)
+@given(st_oid())
+def test_oids_with_reader(ids):
+    reader = Reader(encode_oid(*ids))
+    assert reader.read_object() == ids
+    assert reader.empty()
+
+
+@settings(**HYP_SETTINGS)
+@given(
+    st.integers(min_value=0, max_value=2**528),
+    st.integers(min_value=0, max_value=2**528),
+)
+def test_ecdsa_sig_value_matches_generic_coders(r, s):
+    sig = encode_ecdsa_sig_value(r, s)
+
+    assert sig == encode_sequence(encode_integer(r), encode_integer(s))
+    assert decode_ecdsa_sig_value(sig) == (r, s)
+
+
 def test_remove_octet_string_rejects_truncated_length():
     # OCTET STRING: declared length 4096, but only 3 bytes present
     bad = b"\x04\x82\x10\x00" + b"ABC"
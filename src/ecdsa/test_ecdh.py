@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 import shutil
 import subprocess
 import pytest
@@ -23,13 +24,17 @@ from .curves import (
 from .curves import curves
 from .ecdh import (
     ECDH,
+    EphemeralKeyPool,
+    XDH,
+    x25519,
+    x448,
     InvalidCurveError,
     InvalidSharedSecretError,
     NoKeyError,
     NoCurveError,
 )
 from .keys import SigningKey, VerifyingKey
-from .ellipticcurve import CurveEdTw
+from .ellipticcurve import CurveEdTw, PointJacobi
 
 
 if "--fast" in sys.argv:  # pragma: no cover
@@ -155,6 +160,241 @@ def test_ecdh_invalid_shared_secret_curve():
         ecdh1.generate_sharedsecret_bytes()
 
 
+@pytest.mark.parametrize(
+    "vcurve", [NIST256p, BRAINPOOLP160r1], ids=lambda curve: curve.name
+)
+def test_ecdh_use_ladder(vcurve):
+    sk1 = SigningKey.generate(vcurve)
+    sk2 = SigningKey.generate(vcurve)
+
+    ecdh1 = ECDH(
+        private_key=sk1, public_key=sk2.verifying_key, use_ladder=True
+    )
+    ecdh2 = ECDH(private_key=sk2, public_key=sk1.verifying_key)
+
+    assert ecdh1.use_ladder
+    assert not ecdh2.use_ladder
+    assert ecdh1.generate_sharedsecret() == ecdh2.generate_sharedsecret()
+
+
+def test_ecdh_default_doesnt_use_ladder(monkeypatch):
+    def mul_x(self, other):  # pragma: no cover
+        raise AssertionError("mul_x() called")
+
+    monkeypatch.setattr(PointJacobi, "mul_x", mul_x)
+    sk1 = SigningKey.generate(NIST256p)
+    sk2 = SigningKey.generate(NIST256p)
+
+    ecdh1 = ECDH(private_key=sk1, public_key=sk2.verifying_key)
+
+    assert (
+        ecdh1.generate_sharedsecret()
+        == (sk2.verifying_key.pubkey.point * sk1.privkey.secret_multiplier).x()
+    )
+
+
+def test_ecdh_generate_sharedsecrets():
+    ecdh = ECDH(curve=NIST256p)
+    ecdh.generate_private_key()
+    peers = [SigningKey.generate(NIST256p) for _ in range(3)]
+
+    secrets = ecdh.generate_sharedsecrets(p.verifying_key for p in peers)
+
+    assert secrets == [
+        ECDH(
+            private_key=p, public_key=ecdh.get_public_key()
+        ).generate_sharedsecret()
+        for p in peers
+    ]
+    assert ecdh.public_key is None
+
+
+def test_ecdh_generate_sharedsecrets_use_ladder():
+    ecdh = ECDH(curve=NIST256p, use_ladder=True)
+    ecdh.generate_private_key()
+    peers = [SigningKey.generate(NIST256p).verifying_key for _ in range(3)]
+
+    secrets = ecdh.generate_sharedsecrets(peers)
+
+    assert secrets == ECDH(
+        private_key=ecdh.private_key
+    ).generate_sharedsecrets(peers)
+
+
+def test_ecdh_generate_sharedsecrets_bytes():
+    ecdh = ECDH(curve=NIST256p)
+    ecdh.generate_private_key()
+    peer = SigningKey.generate(NIST256p)
+    ecdh.load_received_public_key(peer.verifying_key)
+
+    secrets = ecdh.generate_sharedsecrets_bytes([peer.verifying_key] * 2)
+
+    assert secrets == [ecdh.generate_sharedsecret_bytes()] * 2
+
+
+def test_ecdh_generate_sharedsecrets_without_peers():
+    ecdh = ECDH(curve=NIST256p)
+    ecdh.generate_private_key()
+
+    assert ecdh.generate_sharedsecrets([]) == []
+
+
+def test_ecdh_generate_sharedsecrets_no_private_key():
+    ecdh = ECDH(curve=NIST256p)
+
+    with pytest.raises(NoKeyError):
+        ecdh.generate_sharedsecrets(
+            [SigningKey.generate(NIST256p).verifying_key]
+        )
+
+
+def test_ecdh_generate_sharedsecrets_wrong_curve():
+    ecdh = ECDH(curve=NIST256p)
+    ecdh.generate_private_key()
+    peers = [
+        SigningKey.generate(NIST256p).verifying_key,
+        SigningKey.generate(NIST192p).verifying_key,
+    ]
+
+    with pytest.raises(InvalidCurveError):
+        ecdh.generate_sharedsecrets(peers)
+
+
+def _wait_for_pool(pool, count):
+    deadline = time.time() + 30
+    while len(pool) < count:
+        assert time.time() < deadline, "pool was not refilled"
+        time.sleep(0.01)
+
+
+def test_ephemeral_key_pool():
+    with EphemeralKeyPool(NIST256p, size=4) as pool:
+        _wait_for_pool(pool, 4)
+        time.sleep(0.05)
+        assert len(pool) == 4
+
+        keys = [pool.get() for _ in range(6)]
+
+        assert all(key.curve == NIST256p for key in keys)
+        assert len(set(key.to_string() for key in keys)) == 6
+        _wait_for_pool(pool, 4)
+
+
+def test_ephemeral_key_pool_with_ecdh():
+    with EphemeralKeyPool(NIST256p, size=2) as pool:
+        ecdh = ECDH()
+        peer = SigningKey.generate(NIST256p)
+
+        pub = ecdh.generate_private_key(pool)
+        ecdh.load_received_public_key(peer.verifying_key)
+
+        assert ecdh.curve == NIST256p
+        assert pub == ecdh.private_key.verifying_key
+        assert (
+            ecdh.generate_sharedsecret()
+            == ECDH(private_key=peer, public_key=pub).generate_sharedsecret()
+        )
+
+
+def test_ephemeral_key_pool_with_wrong_curve():
+    with EphemeralKeyPool(NIST256p, size=1) as pool:
+        ecdh = ECDH(curve=NIST192p)
+
+        with pytest.raises(InvalidCurveError):
+            ecdh.generate_private_key(pool)
+
+
+def test_ephemeral_key_pool_closed():
+    pool = EphemeralKeyPool(NIST256p, size=1)
+    pool.close()
+
+    assert len(pool) == 0
+    with pytest.raises(ValueError):
+        pool.get()
+
+
+def test_ephemeral_key_pool_invalid_size():
+    with pytest.raises(ValueError):
+        EphemeralKeyPool(NIST256p, size=0)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork()")
+def test_ephemeral_key_pool_after_fork():
+    with EphemeralKeyPool(NIST256p, size=2) as pool:
+        _wait_for_pool(pool, 2)
+        parent_keys = set(k.to_string() for k in pool._keys)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:  # pragma: no cover
+            try:
+                os.close(read_fd)
+                if len(pool) == 0:
+                    os.write(write_fd, pool.get().to_string())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        child_key = b""
+        while True:
+            data = os.read(read_fd, 1024)
+            if not data:
+                break
+            child_key += data
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert len(child_key) == NIST256p.baselen
+        assert child_key not in parent_keys
+        assert len(pool) == 2
+
+
+def test_ecdh_precompute_public_key():
+    peer = SigningKey.generate(NIST256p)
+    ecdh = ECDH(curve=NIST256p, public_key=peer.verifying_key)
+
+    ecdh.precompute_public_key()
+
+    for _ in range(3):
+        ecdh.generate_private_key()
+        expected = ECDH(
+            private_key=peer, public_key=ecdh.get_public_key()
+        ).generate_sharedsecret_bytes()
+        assert ecdh.generate_sharedsecret_bytes() == expected
+
+
+def test_ecdh_precompute_public_key_lazy():
+    peer = SigningKey.generate(NIST256p)
+    ecdh = ECDH(curve=NIST256p, public_key=peer.verifying_key)
+    ecdh.precompute_public_key(lazy=True)
+    ecdh.generate_private_key()
+
+    secret = ecdh.generate_sharedsecret()
+
+    assert (
+        secret
+        == (
+            peer.privkey.secret_multiplier
+            * ecdh.private_key.verifying_key.pubkey.point
+        ).x()
+    )
+
+
+def test_ecdh_precompute_public_key_no_public_key():
+    ecdh = ECDH(curve=NIST256p)
+
+    with pytest.raises(NoKeyError):
+        ecdh.precompute_public_key()
+
+
+def test_ecdh_generate_sharedsecrets_infinity():
+    ecdh = ECDH(curve=NIST256p)
+    ecdh.generate_private_key()
+    ecdh.private_key.privkey.secret_multiplier = NIST256p.order
+    peers = [SigningKey.generate(NIST256p).verifying_key]
+
+    with pytest.raises(InvalidSharedSecretError):
+        ecdh.generate_sharedsecrets(peers)
+
+
 # https://github.com/scogliani/ecc-test-vectors/blob/master/ecdh_kat/secp192r1.txt
 # https://github.com/scogliani/ecc-test-vectors/blob/master/ecdh_kat/secp256r1.txt
 # https://github.com/coruus/nist-testvectors/blob/master/csrc.nist.gov/groups/STM/cavp/documents/components/ecccdhtestvectors/KAS_ECC_CDH_PrimitiveTest.txt
@@ -346,6 +586,164 @@ def test_ecdh_der():
     assert sharedsecret == unhexlify(gshared_secret)
 
 
+# RFC 7748, Section 5.2
+@pytest.mark.parametrize(
+    "function,scalar,u,result",
+    [
+        pytest.param(
+            x25519,
+            "a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4",
+            "e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c",
+            "c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552",
+            id="X25519",
+        ),
+        pytest.param(
+            x25519,
+            "0900000000000000000000000000000000000000000000000000000000000000",
+            "0900000000000000000000000000000000000000000000000000000000000000",
+            "422c8e7a6227d7bca1350b3e2bb7279f7897b87bb6854b783c60e80311ae3079",
+            id="X25519-1-iteration",
+        ),
+        pytest.param(
+            x448,
+            "9a8f4925d1519f5775cf46b04b5800d4ee9ee8bae8bc5565d498c28d"
+            "d9c9baf574a9419744897391006382a6f127ab1d9ac2d8c0a598726b",
+            "0500000000000000000000000000000000000000000000000000000000"
+            "000000000000000000000000000000000000000000000000000000",
+            "9b08f7cc31b7e3e67d22d5aea121074a273bd2b83de09c63faa73d2c"
+            "22c5d9bbc836647241d953d40c5b12da88120d53177f80e532c41fa0",
+            id="X448-base-point",
+        ),
+    ],
+)
+def test_xdh_function(function, scalar, u, result):
+    assert function(unhexlify(scalar), unhexlify(u)) == unhexlify(result)
+
+
+def test_x25519_ignores_most_significant_bit_of_u():
+    scalar = unhexlify(
+        "a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4"
+    )
+    u = bytearray(
+        unhexlify(
+            "e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c"
+        )
+    )
+    result = x25519(scalar, u)
+    u[31] |= 0x80
+
+    assert x25519(scalar, u) == result
+
+
+def test_x25519_wrong_length():
+    with pytest.raises(ValueError):
+        x25519(b"\x09" * 31, b"\x09" * 32)
+
+
+# RFC 7748, Section 6
+@pytest.mark.parametrize(
+    "curve,priv_a,pub_a,priv_b,pub_b,secret",
+    [
+        pytest.param(
+            "X25519",
+            "77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a",
+            "8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a",
+            "5dab087e624a8a4b79e17f8b83800ee66f3bb1292618b6fd1c2f8b27ff88e0eb",
+            "de9edb7d7b7dc1b4d35b61c2ece435373f8343c85b78674dadfc7e146f882b4f",
+            "4a5d9d5ba4ce2de1728e3bf480350f25e07e21c947d19e3376f09b3c1e161742",
+            id="X25519",
+        ),
+        pytest.param(
+            "X448",
+            "9a8f4925d1519f5775cf46b04b5800d4ee9ee8bae8bc5565d498c28d"
+            "d9c9baf574a9419744897391006382a6f127ab1d9ac2d8c0a598726b",
+            "9b08f7cc31b7e3e67d22d5aea121074a273bd2b83de09c63faa73d2c"
+            "22c5d9bbc836647241d953d40c5b12da88120d53177f80e532c41fa0",
+            "1c306a7ac2a0e2e0990b294470cba339e6453772b075811d8fad0d1d"
+            "6927c120bb5ee8972b0d3e21374c9c921b09d1b0366f10b65173992d",
+            "3eb7a829b0cd20f5bcfc0b599b6feccf6da4627107bdb0d4f345b430"
+            "27d8b972fc3e34fb4232a13ca706dcb57aec3dae07bdc1c67bf33609",
+            "07fff4181ac6cc95ec1c16a94a0f74d12da232ce40a77552281d282b"
+            "b60c0b56fd2464c335543936521c24403085d59a449a5037514a879d",
+            id="X448",
+        ),
+    ],
+)
+def test_xdh_rfc7748(curve, priv_a, pub_a, priv_b, pub_b, secret):
+    alice = XDH(curve, private_key=unhexlify(priv_a))
+    bob = XDH(curve)
+
+    assert bob.load_private_key_bytes(unhexlify(priv_b)) == unhexlify(pub_b)
+    assert alice.get_public_key() == unhexlify(pub_a)
+
+    alice.load_received_public_key_bytes(unhexlify(pub_b))
+    bob.load_received_public_key_bytes(unhexlify(pub_a))
+
+    assert alice.generate_sharedsecret_bytes() == unhexlify(secret)
+    assert bob.generate_sharedsecret_bytes() == unhexlify(secret)
+
+
+@pytest.mark.parametrize("curve", ["X25519", "X448"])
+def test_xdh_generated_keys(curve):
+    alice = XDH(curve)
+    bob = XDH(curve)
+    pub_a = alice.generate_private_key()
+    pub_b = bob.generate_private_key()
+
+    alice.load_received_public_key_bytes(pub_b)
+    bob.load_received_public_key_bytes(bytearray(pub_a))
+
+    assert alice.generate_sharedsecret_bytes() == (
+        bob.generate_sharedsecret_bytes()
+    )
+
+
+def test_xdh_with_entropy():
+    xdh = XDH()
+
+    pub = xdh.generate_private_key(entropy=lambda n: b"\x01" * n)
+
+    assert xdh.private_key == b"\x01" * 32
+    assert pub == x25519(b"\x01" * 32, b"\x09" + b"\x00" * 31)
+
+
+@pytest.mark.parametrize("curve", ["X25519", "X448"])
+def test_xdh_small_order_public_key(curve):
+    xdh = XDH(curve)
+    xdh.generate_private_key()
+    xdh.load_received_public_key_bytes(b"\x00" * len(xdh.private_key))
+
+    with pytest.raises(InvalidSharedSecretError):
+        xdh.generate_sharedsecret_bytes()
+
+
+def test_xdh_unsupported_curve():
+    with pytest.raises(InvalidCurveError):
+        XDH("Ed25519")
+
+
+def test_xdh_wrong_key_length():
+    xdh = XDH("X448")
+
+    with pytest.raises(ValueError):
+        xdh.load_private_key_bytes(b"\x01" * 32)
+    with pytest.raises(ValueError):
+        xdh.load_received_public_key_bytes(b"\x01" * 32)
+
+
+def test_xdh_no_keys():
+    xdh = XDH()
+
+    with pytest.raises(NoKeyError):
+        xdh.get_public_key()
+    with pytest.raises(NoKeyError):
+        xdh.generate_sharedsecret_bytes()
+
+    xdh.generate_private_key()
+    with pytest.raises(NoKeyError):
+        xdh.generate_sharedsecret_bytes()
+
+
 # Exception classes used by run_openssl.
 class RunOpenSslError(Exception):
     pass
@@ -1,4 +1,5 @@
 import sys
+import base64
 import pickle
 import hashlib
 import pytest
@@ -9,7 +10,12 @@ except ImportError:
     import unittest
 from hypothesis import given, settings, example
 import hypothesis.strategies as st
-from .ellipticcurve import PointEdwards, INFINITY, CurveEdTw
+from .ellipticcurve import (
+    PointEdwards,
+    INFINITY,
+    CurveEdTw,
+    pickle_with_precompute,
+)
 from .eddsa import (
     generator_ed25519,
     curve_ed25519,
@@ -21,6 +27,12 @@ from .eddsa import (
 from .ecdsa import generator_256, curve_256
 from .errors import MalformedPointError
 from ._compat import a2b_hex, compat26_str
+from ._sha3 import shake_256
+
+try:
+    buffer
+except NameError:
+    buffer = memoryview
 
 
 class TestA2B_Hex(unittest.TestCase):
@@ -369,11 +381,268 @@ def test_ed25519_mul_custom_point():
     assert z == g * 11
 
 
+def test_ed25519_neg():
+    g = generator_ed25519
+
+    assert -g + g == INFINITY
+    assert -(-g) == g
+    assert (-g).x() == (-g.x()) % curve_ed25519.p()
+
+
+def test_ed25519_mul_add_with_generator():
+    g = generator_ed25519
+    a = g * 7
+
+    assert g.mul_add(5, a, 11) == g * (5 + 7 * 11)
+
+
+def test_ed25519_mul_add_without_precompute():
+    g = generator_ed25519
+    a = PointEdwards(curve_ed25519, g.x(), g.y(), 1, g.x() * g.y())
+    b = g * 7
+
+    assert a.mul_add(5, b, -3) == g * 5 + b * -3
+
+
+def test_ed25519_mul_add_both_precomputed():
+    g = generator_ed25519
+
+    assert g.mul_add(5, g, 6) == g * 11
+
+
+def test_ed25519_mul_add_to_infinity():
+    g = generator_ed25519
+    a = PointEdwards(curve_ed25519, g.x(), g.y(), 1, g.x() * g.y())
+
+    assert g.mul_add(2, a, -2) == INFINITY
+
+
+def test_ed25519_mul_add_with_negated_point():
+    g = generator_ed25519
+
+    assert g.mul_add(5, -g, 2) == g * 3
+
+
+def test_ed25519_mul_add_with_zero_multipliers():
+    g = generator_ed25519
+    a = g * 3
+
+    assert g.mul_add(0, a, 2) == g * 6
+    assert g.mul_add(2, a, 0) == g * 2
+    assert g.mul_add(2, INFINITY, 5) == g * 2
+
+
+def test_ed25519_mul_add_with_infinity_in_extended_coords():
+    g = generator_ed25519
+    inf = PointEdwards(curve_ed25519, 0, 1, 1, 0)
+
+    assert g.mul_add(3, inf, 5) == g * 3
+    assert inf.mul_add(3, g, 5) == g * 5
+
+
+def test_ed25519_mul_add_different_curve():
+    with pytest.raises(ValueError):
+        generator_ed25519.mul_add(1, generator_ed448, 1)
+
+
+def test_ed25519_uses_a_minus_1_formulas():
+    k, _add, _add_with_z2_1, _double = generator_ed25519._formulas()
+
+    assert k == 2 * curve_ed25519.d() % curve_ed25519.p()
+    assert _add == generator_ed25519._add_a_m1
+    assert _add_with_z2_1 == generator_ed25519._add_a_m1_with_z2_1
+    assert _double == generator_ed25519._double_a_m1
+
+
+def test_ed448_uses_generic_formulas():
+    k, _add, _add_with_z2_1, _double = generator_ed448._formulas()
+
+    assert k == curve_ed448.a()
+    assert _add == generator_ed448._add
+    assert _add_with_z2_1 == generator_ed448._add_with_z2_1
+    assert _double == generator_ed448._double
+
+
+def test_ed25519_a_minus_1_formulas_match_generic():
+    g = generator_ed25519
+    p, a = curve_ed25519.p(), curve_ed25519.a()
+    d2 = 2 * curve_ed25519.d() % p
+    # points with Z != 1
+    pa = g * 3 + g * 2
+    pb = g * 7 + g * 4
+    pb_x, pb_y, pb_z, pb_t = pb._PointEdwards__coords
+    # points with Z == 1
+    pc = (g * 11).scale()
+    pc_x, pc_y, pc_z, pc_t = pc._PointEdwards__coords
+    coords = pa._PointEdwards__coords
+
+    def point(xyzt):
+        return PointEdwards(curve_ed25519, *xyzt)
+
+    assert point(g._add_a_m1(*coords + (pb_x, pb_y, pb_z, pb_t, p, d2))) == (
+        point(g._add(*coords + (pb_x, pb_y, pb_z, pb_t, p, a)))
+    )
+    assert point(
+        g._add_a_m1_with_z2_1(*coords + (pc_x, pc_y, 1, pc_t, p, d2))
+    ) == point(g._add_with_z2_1(*coords + (pc_x, pc_y, 1, pc_t, p, a)))
+    assert point(
+        g._add_a_m1_with_z2_1(*coords + (pc_x, pc_y, 1, pc_t, p, d2))
+    ) == point(g._add(*coords + (pc_x, pc_y, 1, pc_t, p, a)))
+    assert point(g._double_a_m1(*coords + (p, d2))) == point(
+        g._double(*coords + (p, a))
+    )
+    assert point(g._double_a_m1(*coords + (p, d2))) == g * 10
+
+
+def test_ed25519_a_minus_1_add_as_double():
+    g = generator_ed25519
+    p = curve_ed25519.p()
+    d2 = 2 * curve_ed25519.d() % p
+    coords = (g * 3 + g * 2)._PointEdwards__coords
+
+    ret = PointEdwards(curve_ed25519, *g._add_a_m1(*coords + coords + (p, d2)))
+
+    assert ret == g * 10
+
+
+def test_ed448_add_with_z2_1_as_double():
+    g = generator_ed448
+    p, a = curve_ed448.p(), curve_ed448.a()
+    x, y, z, t = g._PointEdwards__coords
+
+    ret = PointEdwards(
+        curve_ed448, *g._add_with_z2_1(x, y, z, t, x, y, z, t, p, a)
+    )
+
+    assert ret == g * 2
+
+
+def test_ed25519_precompute_table_form():
+    g = generator_ed25519
+    p = curve_ed25519.p()
+    table = g._maybe_precompute()
+    x, y = g.x(), g.y()
+
+    assert table[0] == (
+        (y + x) % p,
+        (y - x) % p,
+        2 * curve_ed25519.d() * x * y % p,
+    )
+
+
+def test_ed448_precompute_table_form():
+    g = generator_ed448
+    table = g._maybe_precompute()
+    x, y = g.x(), g.y()
+
+    assert table[0] == (x, y, x * y % curve_ed448.p())
+
+
+def test_ed25519_mul_with_and_without_precompute():
+    g = generator_ed25519
+    g_no_table = PointEdwards(
+        curve_ed25519, g.x(), g.y(), 1, g.x() * g.y() % curve_ed25519.p()
+    )
+    k = generator_ed25519.order() - 0xA8
+
+    assert g * k == g_no_table * k
+    assert g * k == -(g_no_table * 0xA8)
+
+
 def test_ed25519_pickle():
     g = generator_ed25519
     assert pickle.loads(pickle.dumps(g)) == g
 
 
+@pytest.mark.parametrize(
+    "generator", [generator_ed25519, generator_ed448], ids=["Ed25519", "Ed448"]
+)
+def test_edwards_pickle_precompute(generator):
+    generator * 2
+    table = generator._PointEdwards__precompute
+    assert table
+
+    unpickled = pickle.loads(pickle.dumps(generator))
+    assert unpickled._PointEdwards__precompute == []
+    assert unpickled * 0xA8 == generator * 0xA8
+
+    with pickle_with_precompute():
+        unpickled = pickle.loads(pickle.dumps(generator))
+    assert unpickled._PointEdwards__precompute == table
+    assert unpickled * 0xA8 == generator * 0xA8
+
+
+# generator_ed25519 * 0xA8 pickled by python-ecdsa 0.19
+ED25519_POINT_PICKLE = base64.b64decode(
+    "gAJjZWNkc2EuZWxsaXB0aWNjdXJ2ZQpQb2ludEVkd2FyZHMKcQApgXEBfXECKFgUAAAAX1Bv"
+    "aW50RWR3YXJkc19fY3VydmVxA2NlY2RzYS5lbGxpcHRpY2N1cnZlCkN1cnZlRWRUdwpxBCmB"
+    "cQV9cQYoWA0AAABfQ3VydmVFZFR3X19wcQeKIO3/////////////////////////////////"
+    "//////9/WA0AAABfQ3VydmVFZFR3X19hcQhK/////1gNAAAAX0N1cnZlRWRUd19fZHEJiiCj"
+    "eFkTyk3rdavYQUFNCnAAmOh5d3lAx4xz/m8r7mwDUlgNAAAAX0N1cnZlRWRUd19faHEKSwhY"
+    "FQAAAF9DdXJ2ZUVkVHdfX2hhc2hfZnVuY3ELY2VjZHNhLmVkZHNhCl9zaGE1MTIKcQx1YlgV"
+    "AAAAX1BvaW50RWR3YXJkc19fY29vcmRzcQ0oiiB8XFILQfrlj7J2pltbJlwLYRGmsAJYQIdc"
+    "CY0Y3aK5IIogtDdpELcS3oHjLsDYAbTbNz2zwrj9svbSC15c475thgWKIC8WbIm/sLqxgoZJ"
+    "SOFe900/IGhj6fqlVbYIyXjkTPt5iiBo+Uhv39oebWmNM3mphy/AUgXzT2+XIpc2qA+HOXCG"
+    "SXRxDlgUAAAAX1BvaW50RWR3YXJkc19fb3JkZXJxD4og7dP1XBpjEljWnPei3vneFAAAAAAA"
+    "AAAAAAAAAAAAABBYGAAAAF9Qb2ludEVkd2FyZHNfX2dlbmVyYXRvcnEQiVgZAAAAX1BvaW50"
+    "RWR3YXJkc19fcHJlY29tcHV0ZXERXXESdWIu"
+)
+
+
+# generator point of order 7 on the curve -x^2 + y^2 = 1 + 2*x^2*y^2
+# (mod 29), with its precomputation table, pickled by python-ecdsa 0.19
+ED_29_GENERATOR_PICKLE = base64.b64decode(
+    "gAJjZWNkc2EuZWxsaXB0aWNjdXJ2ZQpQb2ludEVkd2FyZHMKcQApgXEBfXECKFgUAAAAX1Bv"
+    "aW50RWR3YXJkc19fY3VydmVxA2NlY2RzYS5lbGxpcHRpY2N1cnZlCkN1cnZlRWRUdwpxBCmB"
+    "cQV9cQYoWA0AAABfQ3VydmVFZFR3X19wcQdLHVgNAAAAX0N1cnZlRWRUd19fYXEISv////9Y"
+    "DQAAAF9DdXJ2ZUVkVHdfX2RxCUsCWA0AAABfQ3VydmVFZFR3X19ocQpOWBUAAABfQ3VydmVF"
+    "ZFR3X19oYXNoX2Z1bmNxC051YlgVAAAAX1BvaW50RWR3YXJkc19fY29vcmRzcQwoSxJLA0sB"
+    "Sxl0cQ1YFAAAAF9Qb2ludEVkd2FyZHNfX29yZGVycQ5LB1gYAAAAX1BvaW50RWR3YXJkc19f"
+    "Z2VuZXJhdG9ycQ+IWBkAAABfUG9pbnRFZHdhcmRzX19wcmVjb21wdXRlcRBdcREoSxJLA0sZ"
+    "h3ESSxtLFksOh3ETSwlLE0sah3EUSxJLA0sZh3EVSxtLFksOh3EWSwlLE0sah3EXZXViLg=="
+)
+
+
+def test_edwards_unpickle_from_older_release():
+    point = pickle.loads(ED25519_POINT_PICKLE)
+
+    assert point == generator_ed25519 * 0xA8
+    assert point * 0xA8 == generator_ed25519 * (0xA8 * 0xA8)
+    assert pickle.loads(pickle.dumps(point)) == point
+
+
+def test_edwards_unpickle_with_table_from_older_release():
+    curve = CurveEdTw(29, -1, 2)
+    point = PointEdwards(curve, 18, 3, 1, 18 * 3 % 29, 7)
+
+    generator = pickle.loads(ED_29_GENERATOR_PICKLE)
+
+    assert generator == point
+    for k in range(1, 15):
+        assert generator * k == point * k
+    assert generator._PointEdwards__precompute
+
+
+def test_edwards_pickle_scaled():
+    point = generator_ed25519.double()
+
+    unpickled = pickle.loads(pickle.dumps(point))
+
+    assert unpickled == point
+    assert unpickled._PointEdwards__coords[2] == 1
+
+
+def test_ed25519_public_key_from_buffer_pickle():
+    encoded = bytearray(
+        PrivateKey(generator_ed25519, b"\x01" * 32).public_key().public_key()
+    )
+    pub = PublicKey(generator_ed25519, buffer(encoded))
+    encoded[0] ^= 0xFF
+
+    assert pickle.loads(pickle.dumps(pub)) == pub
+    assert pub.public_key() != bytes(encoded)
+
+
 def test_ed448_eq_against_different_curve():
     assert generator_ed25519 != generator_ed448
 
@@ -727,6 +996,20 @@ def test_ed25519_mul_precompute_vs_naf(multiple):
     assert g * multiple == multiple * new_g
 
 
+@settings(**HYP_SETTINGS)
+@example(1, 1)
+@example(int(generator_ed448.order() - 1), 2)
+@given(
+    st.integers(min_value=1, max_value=int(generator_ed448.order() - 1)),
+    st.integers(min_value=1, max_value=int(generator_ed448.order() - 1)),
+)
+def test_ed448_mul_add_vs_mul(mul1, mul2):
+    g = generator_ed448
+    a = g * 12345
+
+    assert g.mul_add(mul1, a, mul2) == g * mul1 + a * mul2
+
+
 # Test vectors from RFC 8032
 TEST_VECTORS = [
     # TEST 1
@@ -1122,3 +1405,133 @@ def test_vectors(generator, private_key, public_key, message, signature):
     assert gen_sig == signature
 
     assert ver_key.verify(message, signature)
+
+
+# Test vectors from RFC 8032, for the Ed25519ph and Ed448ph
+PREHASH_TEST_VECTORS = [
+    # Ed25519ph TEST abc
+    (
+        generator_ed25519,
+        "833fe62409237b9d62ec77587520911e" "9a759cec1d19755b7da901b96dca3d42",
+        "ec172b93ad5e563bf4932c70e1245034" "c35467ef2efd4d64ebf819683467e2bf",
+        "616263",
+        "",
+        "98a70222f0b8121aa9d30f813d683f80"
+        "9e462b469c7ff87639499bb94e6dae41"
+        "31f85042463c2a355a2003d062adf5aa"
+        "a10b8c61e636062aaad11c2a26083406",
+    ),
+    # Ed448ph TEST abc
+    (
+        generator_ed448,
+        "833fe62409237b9d62ec77587520911e"
+        "9a759cec1d19755b7da901b96dca3d42"
+        "ef7822e0d5104127dc05d6dbefde69e3"
+        "ab2cec7c867c6e2c49",
+        "259b71c19f83ef77a7abd26524cbdb31"
+        "61b590a48f7d17de3ee0ba9c52beb743"
+        "c09428a131d6b1b57303d90d8132c276"
+        "d5ed3d5d01c0f53880",
+        "616263",
+        "",
+        "822f6901f7480f3d5f562c592994d969"
+        "3602875614483256505600bbc281ae38"
+        "1f54d6bce2ea911574932f52a4e6cadd"
+        "78769375ec3ffd1b801a0d9b3f4030cd"
+        "433964b6457ea39476511214f97469b5"
+        "7dd32dbc560a9a94d00bff07620464a3"
+        "ad203df7dc7ce360c3cd3696d9d9fab9"
+        "0f00",
+    ),
+    # Ed448ph TEST abc, with context "foo"
+    (
+        generator_ed448,
+        "833fe62409237b9d62ec77587520911e"
+        "9a759cec1d19755b7da901b96dca3d42"
+        "ef7822e0d5104127dc05d6dbefde69e3"
+        "ab2cec7c867c6e2c49",
+        "259b71c19f83ef77a7abd26524cbdb31"
+        "61b590a48f7d17de3ee0ba9c52beb743"
+        "c09428a131d6b1b57303d90d8132c276"
+        "d5ed3d5d01c0f53880",
+        "616263",
+        "666f6f",
+        "c32299d46ec8ff02b54540982814dce9"
+        "a05812f81962b649d528095916a2aa48"
+        "1065b1580423ef927ecf0af5888f90da"
+        "0f6a9a85ad5dc3f280d91224ba9911a3"
+        "653d00e484e2ce232521481c8658df30"
+        "4bb7745a73514cdb9bf3e15784ab7128"
+        "4f8d0704a608c54a6b62d97beb511d13"
+        "2100",
+    ),
+]
+
+
+def _prehash(generator, message):
+    if generator == generator_ed25519:
+        return hashlib.sha512(compat26_str(message)).digest()
+    return shake_256(message, 64)
+
+
+@pytest.mark.parametrize(
+    "generator,private_key,public_key,message,context,signature",
+    PREHASH_TEST_VECTORS,
+)
+def test_prehash_vectors(
+    generator, private_key, public_key, message, context, signature
+):
+    private_key = a2b_hex(private_key)
+    public_key = a2b_hex(public_key)
+    digest = _prehash(generator, a2b_hex(message))
+    context = a2b_hex(context)
+    signature = a2b_hex(signature)
+
+    sig_key = PrivateKey(generator, private_key)
+    ver_key = PublicKey(generator, public_key)
+
+    assert sig_key.public_key().public_key() == ver_key.public_key()
+
+    gen_sig = sig_key.sign_prehashed(digest, context)
+
+    assert gen_sig == signature
+
+    assert ver_key.verify_prehashed(digest, signature, context)
+
+
+class TestPrehashedEdDSA(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sk = PrivateKey(generator_ed25519, b"\x01" * 32)
+        cls.vk = cls.sk.public_key()
+        cls.digest = hashlib.sha512(b"message").digest()
+
+    def test_pure_signature_not_accepted(self):
+        sig = self.sk.sign(self.digest)
+
+        with self.assertRaises(ValueError):
+            self.vk.verify_prehashed(self.digest, sig)
+
+    def test_prehashed_signature_not_accepted_as_pure(self):
+        sig = self.sk.sign_prehashed(self.digest)
+
+        with self.assertRaises(ValueError):
+            self.vk.verify(self.digest, sig)
+
+    def test_wrong_context(self):
+        sig = self.sk.sign_prehashed(self.digest, b"foo")
+
+        with self.assertRaises(ValueError):
+            self.vk.verify_prehashed(self.digest, sig, b"bar")
+
+    def test_wrong_digest_length(self):
+        with self.assertRaises(ValueError) as e:
+            self.sk.sign_prehashed(self.digest[:32])
+
+        self.assertIn("length of message digest", str(e.exception))
+
+    def test_too_long_context(self):
+        with self.assertRaises(ValueError) as e:
+            self.sk.sign_prehashed(self.digest, b"a" * 256)
+
+        self.assertIn("Context", str(e.exception))
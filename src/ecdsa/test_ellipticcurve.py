@@ -1,3 +1,5 @@
+import base64
+import pickle
 import pytest
 
 try:
@@ -14,7 +16,7 @@ try:
 except ImportError:  # pragma: no cover
     HC_PRESENT = False
 from .numbertheory import inverse_mod
-from .ellipticcurve import CurveFp, INFINITY, Point, CurveEdTw
+from .ellipticcurve import CurveFp, INFINITY, Point, PointJacobi, CurveEdTw
 
 
 HYP_SETTINGS = {}
@@ -35,6 +37,18 @@ Gy = 0x07192B95FFC8DA78631011ED6B24CDD573F977A11E794811
 c192 = CurveFp(p, -3, b)
 p192 = Point(c192, Gx, Gy, r)
 
+# CurveFp(23, 1, 1) and CurveEdTw(13, -1, 2) pickled by python-ecdsa 0.19
+C_23_PICKLE = base64.b64decode(
+    "gAJjZWNkc2EuZWxsaXB0aWNjdXJ2ZQpDdXJ2ZUZwCnEAKYFxAX1xAihYCwAAAF9DdXJ2ZUZwX19w"
+    "cQNLF1gLAAAAX0N1cnZlRnBfX2FxBEsBWAsAAABfQ3VydmVGcF9fYnEFSwFYCwAAAF9DdXJ2ZUZw"
+    "X19ocQZOdWIu"
+)
+ED_13_PICKLE = base64.b64decode(
+    "gAJjZWNkc2EuZWxsaXB0aWNjdXJ2ZQpDdXJ2ZUVkVHcKcQApgXEBfXECKFgNAAAAX0N1cnZlRWRU"
+    "d19fcHEDSw1YDQAAAF9DdXJ2ZUVkVHdfX2FxBEr/////WA0AAABfQ3VydmVFZFR3X19kcQVLAlgN"
+    "AAAAX0N1cnZlRWRUd19faHEGTlgVAAAAX0N1cnZlRWRUd19faGFzaF9mdW5jcQdOdWIu"
+)
+
 c_23 = CurveFp(23, 1, 1)
 g_23 = Point(c_23, 13, 7, 7)
 
@@ -116,6 +130,53 @@ class TestCurve(unittest.TestCase):
         self.assertDictEqual({c_23: None}, {eq1: None})
         self.assertIn(eq2, {eq3: None})
 
+    def test_square_root_in_curve_pickled_by_older_release(self):
+        curve = pickle.loads(C_23_PICKLE)
+
+        self.assertEqual(curve, self.c_23)
+        self.assertIn(curve.square_root(3), (7, 16))
+
+    def test_multiplication_on_curve_pickled_by_older_release(self):
+        curve = pickle.loads(C_23_PICKLE)
+
+        self.assertIsNone(curve.isomorphic_curve())
+        self.assertEqual(
+            PointJacobi(curve, 3, 10, 1) * 3,
+            PointJacobi(self.c_23, 3, 10, 1) * 3,
+        )
+
+    def test_isomorphic_curve_not_set(self):
+        self.assertIsNone(CurveFp(23, 1, 1).isomorphic_curve())
+
+    def test_set_isomorphic_curve(self):
+        c_23 = CurveFp(23, 1, 1)
+        # u == 2: a * u**4 == 16, b * u**6 == 18 (mod 23)
+        iso = CurveFp(23, 16, 18)
+
+        c_23.set_isomorphic_curve(iso)
+
+        curve, u = c_23.isomorphic_curve()
+        self.assertIs(curve, iso)
+        self.assertIn(u, (2, 21))
+        self.assertTrue(iso.contains_point(3 * u**2 % 23, 10 * u**3 % 23))
+
+    def test_set_isomorphic_curve_with_different_b(self):
+        with self.assertRaises(ValueError):
+            CurveFp(23, 1, 1).set_isomorphic_curve(CurveFp(23, 16, 17))
+
+    def test_set_isomorphic_curve_with_different_prime(self):
+        with self.assertRaises(ValueError):
+            CurveFp(23, 1, 1).set_isomorphic_curve(CurveFp(29, 16, 18))
+
+    def test_set_isomorphic_curve_with_a_0(self):
+        with self.assertRaises(ValueError):
+            CurveFp(23, 0, 1).set_isomorphic_curve(CurveFp(23, 0, 18))
+
+    def test_set_isomorphic_curve_with_non_square_u_2(self):
+        # u**2 == 5, which is not a square modulo 23
+        with self.assertRaises(ValueError):
+            CurveFp(23, 1, 1).set_isomorphic_curve(CurveFp(23, 2, 10))
+
     def test___str__(self):
         self.assertEqual(str(self.c_23), "CurveFp(p=23, a=1, b=1)")
 
@@ -142,6 +203,13 @@ class TestCurveEdTw(unittest.TestCase):
     def test_hashability_curves(self):
         hash(self.c_23)
 
+    def test_square_root_in_curve_pickled_by_older_release(self):
+        curve = pickle.loads(ED_13_PICKLE)
+
+        self.assertEqual(curve, CurveEdTw(13, -1, 2))
+        self.assertIn(curve.square_root(4), (2, 11))
+        self.assertIn(curve.square_root_ratio(1, 4), (6, 7))
+
 
 class TestPoint(unittest.TestCase):
     @classmethod
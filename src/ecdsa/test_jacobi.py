@@ -14,7 +14,13 @@ import platform
 import hypothesis.strategies as st
 from hypothesis import given, assume, settings, example
 
-from .ellipticcurve import CurveFp, PointJacobi, INFINITY, Point
+from .ellipticcurve import (
+    CurveFp,
+    PointJacobi,
+    INFINITY,
+    Point,
+    pickle_with_precompute,
+)
 from .ecdsa import (
     generator_256,
     curve_256,
@@ -23,6 +29,12 @@ from .ecdsa import (
     curve_brainpoolp160r1,
     generator_112r2,
     curve_112r2,
+    generator_brainpoolp256t1,
+    generator_brainpoolp256r1,
+    curve_brainpoolp256r1,
+    curve_brainpoolp256t1,
+    generator_secp256k1,
+    curve_secp256k1,
 )
 from .numbertheory import inverse_mod
 from .util import randrange
@@ -229,6 +241,38 @@ class TestJacobi(unittest.TestCase):
 
         self.assertNotEqual(p_a, p_b)
 
+    def test_x_mod_equals(self):
+        pj = PointJacobi.from_affine(generator_256) * 0xA8
+        x = pj.x()
+        n = generator_256.order()
+
+        self.assertTrue(pj.x_mod_equals(x % n, n))
+        self.assertFalse(pj.x_mod_equals((x + 1) % n, n))
+
+    def test_x_mod_equals_affine(self):
+        pj = PointJacobi.from_affine(generator_256)
+        n = generator_256.order()
+
+        self.assertTrue(pj.x_mod_equals(generator_256.x() % n, n))
+        self.assertFalse(pj.x_mod_equals((generator_256.x() + 1) % n, n))
+
+    def test_x_mod_equals_infinity(self):
+        pj = PointJacobi(curve_256, 0, 0, 0)
+
+        self.assertFalse(pj.x_mod_equals(0, generator_256.order()))
+
+    def test_x_mod_equals_with_wrap_around(self):
+        c_23 = CurveFp(23, 1, 1)
+        base = PointJacobi(c_23, 3, 10, 1)
+
+        for i in range(1, 28):
+            pj = base * i
+            if pj == INFINITY:
+                continue
+            x = pj.x()
+            for v in range(7):
+                self.assertEqual(pj.x_mod_equals(v, 7), x % 7 == v)
+
     def test_compare_zero_point_with_infinity(self):
         pj = PointJacobi(curve_256, 0, 0, 0)
 
@@ -711,6 +755,264 @@ class TestJacobi(unittest.TestCase):
         self.assertEqual(p3, INFINITY)
         self.assertIs(p3, INFINITY)
 
+    def test_doubler_selection(self):
+        pj = PointJacobi.from_affine(generator_256)
+        self.assertEqual(pj._doubler(), pj._double_a_m3)
+        self.assertEqual(
+            generator_brainpoolp256t1._doubler(),
+            generator_brainpoolp256t1._double_a_m3,
+        )
+        self.assertEqual(
+            generator_secp256k1._doubler(), generator_secp256k1._double_a_0
+        )
+        self.assertEqual(
+            generator_brainpoolp160r1._doubler(),
+            generator_brainpoolp160r1._double,
+        )
+
+    def test_double_a_m3_vs_generic(self):
+        for gen in (generator_256, generator_brainpoolp256t1):
+            pj = PointJacobi.from_affine(gen) * 0xA8 + gen
+            x, y, z = pj._PointJacobi__coords
+            curve = gen.curve()
+            p, a = curve.p(), curve.a()
+            self.assertNotEqual(z, 1)
+
+            ret = pj._double_a_m3(x, y, z, p, a)
+
+            self.assertEqual(ret, pj._double(x, y, z, p, a))
+
+    def test_double_a_0_vs_generic(self):
+        pj = generator_secp256k1 * 0xA8 + generator_secp256k1
+        x, y, z = pj._PointJacobi__coords
+        p, a = curve_secp256k1.p(), curve_secp256k1.a()
+        self.assertNotEqual(z, 1)
+
+        ret = pj._double_a_0(x, y, z, p, a)
+
+        self.assertEqual(ret, pj._double(x, y, z, p, a))
+
+    def test_double_a_m3_to_infinity(self):
+        c_23 = CurveFp(23, -3, 5)
+        self.assertTrue(c_23.contains_point(3, 0))
+        # (3, 0) with z == 2
+        pj = PointJacobi(c_23, 12, 0, 2)
+
+        self.assertEqual(pj._double_a_m3(12, 0, 2, 23, -3), (0, 0, 0))
+        self.assertIs(pj.double(), INFINITY)
+
+    def test_double_a_0_to_infinity(self):
+        c_23 = CurveFp(23, 0, 22)
+        self.assertTrue(c_23.contains_point(1, 0))
+        # (1, 0) with z == 2
+        pj = PointJacobi(c_23, 4, 0, 2)
+
+        self.assertEqual(pj._double_a_0(4, 0, 2, 23, 0), (0, 0, 0))
+        self.assertIs(pj.double(), INFINITY)
+
+    def test_double_a_m3_with_z_1(self):
+        pj = PointJacobi.from_affine(generator_256)
+
+        self.assertEqual(pj.double(), pj * 2)
+        self.assertEqual(pj.double().to_affine(), generator_256 * 2)
+
+    def test_brainpool_r1_uses_t1_curve(self):
+        curve, u = curve_brainpoolp256r1.isomorphic_curve()
+
+        self.assertIs(curve, curve_brainpoolp256t1)
+
+        p_t1 = PointJacobi.from_affine(generator_brainpoolp256r1)
+        p_t1 = p_t1._to_isomorphic(curve, u)
+        self.assertTrue(curve.contains_point(p_t1.x(), p_t1.y()))
+
+    def test_mul_with_isomorphic_curve(self):
+        gen = generator_brainpoolp256r1
+        no_iso = CurveFp(
+            curve_brainpoolp256r1.p(),
+            curve_brainpoolp256r1.a(),
+            curve_brainpoolp256r1.b(),
+            1,
+        )
+        pj = PointJacobi.from_affine(gen) * 0xA8 + gen
+        pj_no_iso = PointJacobi(no_iso, pj.x(), pj.y(), 1, gen.order())
+        k = gen.order() - 0xFF
+
+        ret = pj * k
+        ret_no_iso = pj_no_iso * k
+
+        self.assertEqual(ret.curve(), curve_brainpoolp256r1)
+        self.assertEqual(ret.to_affine(), ret_no_iso.to_affine())
+        self.assertIs(pj * gen.order(), INFINITY)
+
+    def test_mul_add_with_isomorphic_curve(self):
+        gen = generator_brainpoolp256r1
+        no_iso = CurveFp(
+            curve_brainpoolp256r1.p(),
+            curve_brainpoolp256r1.a(),
+            curve_brainpoolp256r1.b(),
+            1,
+        )
+        pj = PointJacobi.from_affine(gen) * 0xA8
+        pj_no_iso = PointJacobi(no_iso, pj.x(), pj.y(), 1, gen.order())
+        gen_no_iso = PointJacobi(no_iso, gen.x(), gen.y(), 1, gen.order())
+
+        ret = gen.mul_add(0xFF00, pj, 0xF0F0)
+        ret_no_iso = gen_no_iso.mul_add(0xFF00, pj_no_iso, 0xF0F0)
+
+        self.assertEqual(ret.curve(), curve_brainpoolp256r1)
+        self.assertEqual(ret.to_affine(), ret_no_iso.to_affine())
+        self.assertEqual(ret, gen * (0xFF00 + 0xA8 * 0xF0F0))
+
+    def test_mul_x(self):
+        pj = PointJacobi.from_affine(generator_256) * 0xA8
+        pj = PointJacobi(curve_256, pj.x(), pj.y(), 1, generator_256.order())
+        n = generator_256.order()
+
+        for k in (1, 2, 3, 0xFF, n // 2, n // 2 + 1, n - 2, n - 1, n + 5):
+            self.assertEqual(pj.mul_x(k), (pj * k).x())
+
+    def test_mul_x_to_infinity(self):
+        pj = PointJacobi.from_affine(generator_256)
+
+        self.assertIsNone(pj.mul_x(generator_256.order()))
+        self.assertIsNone(pj.mul_x(0))
+
+    def test_mul_x_without_order(self):
+        pj = PointJacobi(curve_256, generator_256.x(), generator_256.y(), 1)
+
+        self.assertEqual(pj.mul_x(0xA8), (pj * 0xA8).x())
+        self.assertEqual(pj.mul_x(1), generator_256.x())
+
+    def test_mul_x_with_z_not_1(self):
+        pj = PointJacobi.from_affine(generator_256) * 0xA8
+        self.assertNotEqual(pj._PointJacobi__coords[2], 1)
+
+        self.assertEqual(pj.mul_x(0xFF), (pj * 0xFF).x())
+
+    def test_mul_x_with_x_0(self):
+        c_23 = CurveFp(23, 1, 1)
+        pj = PointJacobi(c_23, 0, 1, 1)
+
+        for k in range(1, 30):
+            result = pj * k
+            expected = None if result == INFINITY else result.x()
+            self.assertEqual(pj.mul_x(k), expected)
+
+    def test_mul_x_on_small_curve(self):
+        c_23 = CurveFp(23, 1, 1)
+        pj = PointJacobi(c_23, 3, 10, 1)
+
+        for k in range(1, 30):
+            result = pj * k
+            expected = None if result == INFINITY else result.x()
+            self.assertEqual(pj.mul_x(k), expected)
+
+    def test_mul_x_on_small_curve_with_order(self):
+        c_23 = CurveFp(23, 1, 1)
+        # the curve has 28 points, (3, 10) generates all of them
+        pj = PointJacobi(c_23, 3, 10, 1, 28)
+
+        for k in range(1, 60):
+            result = pj * k
+            expected = None if result == INFINITY else result.x()
+            self.assertEqual(pj.mul_x(k), expected)
+
+    @settings(**SLOW_SETTINGS)
+    @given(st.integers(min_value=1, max_value=int(generator_256.order() - 1)))
+    def test_mul_x_vs_mul(self, k):
+        pj = PointJacobi.from_affine(generator_256) * 0xA8
+
+        self.assertEqual(pj.mul_x(k), (pj * k).x())
+
+    def test_batch_mul_x(self):
+        pj = PointJacobi.from_affine(generator_256)
+        points = [pj * i for i in (1, 2, 0xA8, 0xFF)]
+        points.append(PointJacobi(curve_256, 0, 0, 0))
+        k = 0xA8A8A8
+
+        results = PointJacobi.batch_mul_x(points, k)
+
+        self.assertEqual(results[:4], [(i * k).x() for i in points[:4]])
+        self.assertIsNone(results[4])
+
+    def test_batch_mul_x_to_infinity(self):
+        pj = PointJacobi.from_affine(generator_256)
+
+        results = PointJacobi.batch_mul_x([pj, pj * 2], 0)
+        self.assertEqual(results, [None, None])
+
+        results = PointJacobi.batch_mul_x([pj, pj * 2], generator_256.order())
+        self.assertEqual(results, [None, None])
+
+    def test_batch_mul_x_with_special_cases(self):
+        c_23 = CurveFp(23, 1, 1)
+        points = [PointJacobi(c_23, 0, 1, 1), PointJacobi(c_23, 3, 10, 1)]
+
+        for k in range(1, 30):
+            results = PointJacobi.batch_mul_x(points, k)
+            expected = [
+                None if i * k == INFINITY else (i * k).x() for i in points
+            ]
+            self.assertEqual(results, expected)
+
+    @settings(**SLOW_SETTINGS)
+    @given(
+        st.integers(
+            min_value=1, max_value=int(generator_brainpoolp160r1.order() - 1)
+        )
+    )
+    def test_batch_mul_x_vs_mul(self, k):
+        pj = PointJacobi.from_affine(generator_brainpoolp160r1)
+        points = [pj * 3, pj * 0xA8, (pj * 0xFF).scale()]
+
+        self.assertEqual(
+            PointJacobi.batch_mul_x(points, k), [(i * k).x() for i in points]
+        )
+
+    def test_batch_mul_x_on_isomorphic_curve(self):
+        self.assertIsNotNone(curve_brainpoolp256r1.isomorphic_curve())
+        pj = PointJacobi.from_affine(generator_brainpoolp256r1)
+        points = [pj * 2, pj * 0xA8]
+        k = 0xA8A8A8
+
+        results = PointJacobi.batch_mul_x(points, k)
+
+        self.assertEqual(results, [(i.to_affine() * k).x() for i in points])
+
+    def test_wnaf(self):
+        for k in range(0, 300):
+            wnaf = PointJacobi._wnaf(k, 5)
+
+            self.assertEqual(sum(d << i for i, d in enumerate(wnaf)), k)
+            for i, d in enumerate(wnaf):
+                self.assertTrue(d % 2 or not d)
+                self.assertLess(abs(d), 16)
+                if d:
+                    self.assertFalse(any(wnaf[i + 1 : i + 5]))
+
+    def test_batch_mul_x_empty(self):
+        self.assertEqual(PointJacobi.batch_mul_x([], 5), [])
+
+    def test_mul_x_with_precompute(self):
+        pj = PointJacobi.from_affine(generator_256, True)
+        k = 0xA8A8A8
+
+        self.assertEqual(pj.mul_x(k), (generator_256 * k).x())
+        self.assertIsNone(pj.mul_x(generator_256.order()))
+
+    def test_batch_mul_x_with_precompute(self):
+        pj = PointJacobi.from_affine(generator_256 * 3, True)
+        points = [pj, PointJacobi.from_affine(generator_256)]
+        k = 0xA8A8A8
+
+        results = PointJacobi.batch_mul_x(points, k)
+
+        self.assertEqual(results, [(i * k).x() for i in points])
+        self.assertEqual(
+            PointJacobi.batch_mul_x(points, generator_256.order()),
+            [None, None],
+        )
+
     def test_double_to_x_0(self):
         c_23_2 = CurveFp(23, 1, 2)
         p = PointJacobi(c_23_2, 9, 2, 1)
@@ -777,6 +1079,68 @@ class TestJacobi(unittest.TestCase):
         pj = PointJacobi(curve=CurveFp(23, 1, 1, 1), x=2, y=3, z=1, order=1)
         self.assertEqual(pickle.loads(pickle.dumps(pj)), pj)
 
+    def test_pickle_scaled(self):
+        pj = PointJacobi.from_affine(generator_256).double()
+
+        unpickled = pickle.loads(pickle.dumps(pj))
+
+        self.assertEqual(unpickled, pj)
+        self.assertEqual(unpickled._PointJacobi__coords[2], 1)
+        self.assertEqual(unpickled.order(), generator_256.order())
+
+    def test_pickle_infinity(self):
+        pj = PointJacobi(curve_256, 0, 0, 0)
+
+        unpickled = pickle.loads(pickle.dumps(pj))
+
+        self.assertEqual(unpickled, INFINITY)
+
+    def test_pickle_without_precompute(self):
+        pj = PointJacobi.from_affine(generator_256, True)
+        pj * 2
+        self.assertTrue(pj._PointJacobi__precompute)
+
+        unpickled = pickle.loads(pickle.dumps(pj))
+
+        self.assertEqual(unpickled._PointJacobi__precompute, [])
+        self.assertEqual(unpickled * 0xA8, pj * 0xA8)
+        self.assertEqual(
+            unpickled._PointJacobi__precompute, pj._PointJacobi__precompute
+        )
+
+    def test_pickle_with_precompute(self):
+        pj = PointJacobi.from_affine(generator_256, True)
+        pj * 2
+
+        with pickle_with_precompute():
+            data = pickle.dumps(pj)
+        unpickled = pickle.loads(data)
+
+        self.assertEqual(
+            unpickled._PointJacobi__precompute, pj._PointJacobi__precompute
+        )
+        self.assertEqual(unpickled * 0xA8, pj * 0xA8)
+        # outside the context the table is not included
+        self.assertLess(len(pickle.dumps(pj)), len(data) // 10)
+
+    def test_unpickle_old_format(self):
+        pj = PointJacobi(curve_256, 0, 0, 0)
+        pj.__setstate__(
+            {
+                "_PointJacobi__curve": curve_256,
+                "_PointJacobi__coords": (
+                    generator_256.x(),
+                    generator_256.y(),
+                    1,
+                ),
+                "_PointJacobi__order": generator_256.order(),
+                "_PointJacobi__generator": False,
+                "_PointJacobi__precompute": [],
+            }
+        )
+
+        self.assertEqual(pj, generator_256)
+
     @pytest.mark.slow
     @settings(**NO_OLD_SETTINGS)
     @pytest.mark.skipif(
@@ -24,10 +24,12 @@ from .numbertheory import (
     lcm,
     jacobi,
     inverse_mod,
+    inverse_mod_batch,
     is_prime,
     next_prime,
     smallprimes,
     square_root_mod_prime,
+    SquareRootModPrime,
 )
 
 try:
@@ -121,6 +123,83 @@ def test_square_root_mod_prime_for_p_congruent_5_large_d():
     assert root * root % p == 4
 
 
+@pytest.mark.parametrize(
+    "prime",
+    [97, 193, 7681, 12289, 40961],
+    ids=lambda x: "p={0}".format(x),
+)
+def test_square_root_mod_prime_with_large_2_adic_order(prime):
+    for num in range(0, prime // 2 + 1, 7):
+        sq = num * num % prime
+        root = square_root_mod_prime(sq, prime)
+        assert root * root % prime == sq
+
+
+def test_square_root_mod_prime_for_p224():
+    p = 2**224 - 2**96 + 1
+    assert (p - 1) % 2**96 == 0
+
+    for num in (2, 3, 2**100 + 5, p - 2):
+        root = square_root_mod_prime(num * num % p, p)
+        assert root * root % p == num * num % p
+
+
+def test_square_root_mod_prime_for_p224_non_square():
+    p = 2**224 - 2**96 + 1
+    non_square = next(i for i in range(2, 100) if jacobi(i, p) == -1)
+
+    with pytest.raises(SquareRootError):
+        square_root_mod_prime(non_square, p)
+
+
+@pytest.mark.parametrize(
+    "prime",
+    [3, 5, 7, 13, 17, 29, 41, 97, 101, 1229],
+    ids=lambda x: "p={0}".format(x),
+)
+def test_square_root_mod_prime_object(prime):
+    sqrt = SquareRootModPrime(prime)
+    squares = set(num * num % prime for num in range(prime))
+
+    for num in range(prime):
+        if num in squares:
+            root = sqrt(num)
+            assert root * root % prime == num
+        else:
+            with pytest.raises(SquareRootError) as e:
+                sqrt(num)
+            assert "no square root" in str(e.value)
+
+
+@pytest.mark.parametrize(
+    "prime",
+    [7, 11, 13, 17, 29, 41, 97],
+    ids=lambda x: "p={0}".format(x),
+)
+def test_square_root_mod_prime_object_ratio(prime):
+    sqrt = SquareRootModPrime(prime)
+    squares = set(num * num % prime for num in range(prime))
+
+    for u in range(prime):
+        for v in range(1, prime):
+            ratio = u * inverse_mod(v, prime) % prime
+            if ratio in squares:
+                root = sqrt.ratio(u, v)
+                assert root * root % prime == ratio
+            else:
+                with pytest.raises(SquareRootError):
+                    sqrt.ratio(u, v)
+
+
+def test_square_root_mod_prime_object_matches_function():
+    p = 2**224 - 2**96 + 1
+    sqrt = SquareRootModPrime(p)
+
+    for num in (2, 3, 2**100 + 5, p - 2):
+        sq = num * num % p
+        assert sqrt(sq) == square_root_mod_prime(sq, p)
+
+
 class TestSquareRootModPrime(unittest.TestCase):
     def test_power_of_2_p(self):
         with self.assertRaises(JacobiError):
@@ -481,3 +560,20 @@ class TestNumbertheory(unittest.TestCase):
 
     def test_inverse_mod_with_zero(self):
         assert 0 == inverse_mod(0, 11)
+
+    @settings(**HYP_SETTINGS)
+    @given(
+        st.lists(st.integers(min_value=0, max_value=BIGPRIMES[0] - 1)),
+    )
+    def test_inverse_mod_batch(self, nums):
+        prime = BIGPRIMES[0]
+
+        inverses = inverse_mod_batch(nums, prime)
+
+        assert inverses == [inverse_mod(i, prime) for i in nums]
+
+    def test_inverse_mod_batch_with_zeros(self):
+        assert inverse_mod_batch([0, 3, 0, 5, 0], 11) == [0, 4, 0, 9, 0]
+
+    def test_inverse_mod_batch_empty(self):
+        assert inverse_mod_batch([], 11) == []
@@ -0,0 +1,116 @@
+from hashlib import sha256
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+from .parallel import VerificationPool
+from .curves import NIST256p, SECP256k1, Ed25519
+from .keys import SigningKey, BadDigestError
+from .util import sigencode_der, sigdecode_der
+
+
+class TestVerificationPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sk1 = SigningKey.generate(NIST256p)
+        cls.sk2 = SigningKey.generate(SECP256k1)
+        cls.sk3 = SigningKey.generate(Ed25519)
+        cls.pool = VerificationPool(
+            {
+                "p256": cls.sk1.verifying_key,
+                "k256": cls.sk2.verifying_key,
+                "ed25519": cls.sk3.verifying_key,
+            },
+            processes=2,
+            chunksize=2,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_verify(self):
+        requests = []
+        for i in range(5):
+            data = "message {0}".format(i).encode()
+            requests.append(("p256", self.sk1.sign(data), data))
+            requests.append(("k256", self.sk2.sign(data), data))
+            requests.append(("ed25519", self.sk3.sign(data), data))
+
+        self.assertEqual(self.pool.verify(requests), [True] * 15)
+
+    def test_verify_with_invalid_signatures(self):
+        data = b"message"
+        sig1 = self.sk1.sign(data)
+        sig3 = self.sk3.sign(data)
+
+        results = self.pool.verify(
+            [
+                ("p256", sig1, data),
+                ("p256", sig1, b"other message"),
+                ("k256", sig1, data),
+                ("p256", b"\x00" * 3, data),
+                ("ed25519", sig3, b"other message"),
+                ("ed25519", sig3, data),
+            ]
+        )
+
+        self.assertEqual(results, [True, False, False, False, False, True])
+
+    def test_verify_digest(self):
+        digest = sha256(b"message").digest()
+        sig = self.sk1.sign_digest(digest)
+
+        results = self.pool.verify_digest(
+            [("p256", sig, digest), ("p256", sig, digest[::-1])]
+        )
+
+        self.assertEqual(results, [True, False])
+
+    def test_verify_with_unknown_key(self):
+        with self.assertRaises(KeyError):
+            self.pool.verify([("p384", b"", b"")])
+
+    def test_verify_without_requests(self):
+        self.assertEqual(self.pool.verify([]), [])
+
+
+class TestVerificationPoolOptions(unittest.TestCase):
+    def test_list_of_keys_and_options(self):
+        sk = SigningKey.generate(NIST256p)
+        data = b"message"
+        sig = sk.sign(data, hashfunc=sha256, sigencode=sigencode_der)
+
+        with VerificationPool(
+            [sk.verifying_key],
+            processes=1,
+            precompute=False,
+            hashfunc=sha256,
+            sigdecode=sigdecode_der,
+        ) as pool:
+            results = pool.verify([(0, sig, data), (0, sig, b"other")])
+
+        self.assertEqual(results, [True, False])
+
+    def test_verify_digest_without_truncation(self):
+        sk = SigningKey.generate(NIST256p)
+
+        # like in VerifyingKey.verify_digest(), the digests are not
+        # truncated by default, even if verify() truncates the hashes
+        with VerificationPool([sk.verifying_key], processes=1) as pool:
+            with self.assertRaises(BadDigestError):
+                pool.verify_digest([(0, b"\x00" * 64, b"\x01" * 48)])
+
+    def test_verify_digest_with_truncation(self):
+        sk = SigningKey.generate(NIST256p)
+        digest = b"\x01" * 48
+        sig = sk.sign_digest(digest, allow_truncate=True)
+
+        with VerificationPool(
+            [sk.verifying_key], processes=1, digest_allow_truncate=True
+        ) as pool:
+            results = pool.verify_digest([(0, sig, digest)])
+
+        self.assertEqual(results, [True])
@@ -0,0 +1,207 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+from .shared import SharedPrecompute, _SharedTable
+from .curves import Curve, NIST256p, Ed25519
+from .ecdsa import generator_256
+from .eddsa import generator_ed25519, generator_ed448
+from .ellipticcurve import (
+    PointJacobi,
+    PointEdwards,
+    pickle_with_precompute,
+)
+from .keys import SigningKey
+
+
+def _fresh_jacobi(gen=generator_256):
+    """Return copy of the generator point, without a table."""
+    return PointJacobi(gen.curve(), gen.x(), gen.y(), 1, gen.order(), True)
+
+
+def _fresh_edwards(gen):
+    """Return copy of the generator point, without a table."""
+    x, y = gen.x(), gen.y()
+    return PointEdwards(
+        gen.curve(), x, y, 1, x * y % gen.curve().p(), gen.order(), True
+    )
+
+
+class TestSharedPrecompute(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def test_anonymous_block(self):
+        point = _fresh_jacobi()
+        k = generator_256.order() - 0xA8
+
+        tables = SharedPrecompute.create([point])
+
+        self.assertIsInstance(point._maybe_precompute(), _SharedTable)
+        self.assertEqual(
+            list(point._maybe_precompute()),
+            generator_256._maybe_precompute(),
+        )
+        self.assertEqual(point * k, generator_256 * k)
+        self.assertEqual(point * 0xA8, generator_256 * 0xA8)
+        self.assertIn(point, tables)
+
+    def test_edwards_points(self):
+        for gen in (generator_ed25519, generator_ed448):
+            point = _fresh_edwards(gen)
+            k = gen.order() - 0xA8
+
+            SharedPrecompute.create([point])
+
+            self.assertIsInstance(point._maybe_precompute(), _SharedTable)
+            self.assertEqual(point * k, gen * k)
+            self.assertEqual(point.mul_add(3, _fresh_edwards(gen), 5), gen * 8)
+
+    def test_keys_and_curves(self):
+        curve = Curve("test", NIST256p.curve, _fresh_jacobi(), None)
+        sk = SigningKey.generate(NIST256p)
+        vk = sk.verifying_key
+        sig = sk.sign(b"message")
+
+        SharedPrecompute.create([curve, vk, vk])
+
+        self.assertIsInstance(
+            curve.generator._maybe_precompute(), _SharedTable
+        )
+        self.assertIsInstance(
+            vk.pubkey.point._maybe_precompute(), _SharedTable
+        )
+        self.assertTrue(vk.verify(sig, b"message"))
+
+    def test_file(self):
+        path = os.path.join(self.tmp, "tables")
+        sk = SigningKey.generate(Ed25519)
+        sig = sk.sign(b"message")
+        tables = SharedPrecompute.create(
+            [_fresh_jacobi(), sk.verifying_key], path
+        )
+        tables.close()
+
+        tables = SharedPrecompute.open(path)
+        point = _fresh_jacobi()
+        vk = SigningKey.from_string(sk.to_string(), Ed25519).verifying_key
+        tables.attach(point, vk)
+
+        self.assertIsInstance(point._maybe_precompute(), _SharedTable)
+        self.assertEqual(point * 0xA8, generator_256 * 0xA8)
+        self.assertTrue(vk.verify(sig, b"message"))
+
+    def test_attach_unknown_point(self):
+        tables = SharedPrecompute.create([_fresh_jacobi()])
+        vk = SigningKey.generate(NIST256p).verifying_key
+
+        self.assertNotIn(vk, tables)
+        with self.assertRaises(KeyError):
+            tables.attach(vk)
+
+    def test_contains_doesnt_change_key(self):
+        sk = SigningKey.generate(NIST256p)
+        vk = sk.verifying_key
+        point = vk.pubkey.point
+        tables = SharedPrecompute.create([_fresh_jacobi()])
+
+        self.assertNotIn(vk, tables)
+        self.assertIs(vk.pubkey.point, point)
+        self.assertFalse(point._PointJacobi__generator)
+
+        tables = SharedPrecompute.create(
+            [SigningKey.from_string(sk.to_string(), NIST256p).verifying_key]
+        )
+
+        self.assertIn(vk, tables)
+        self.assertIs(vk.pubkey.point, point)
+        self.assertFalse(point._PointJacobi__generator)
+
+    def test_non_generator_point(self):
+        point = PointJacobi.from_affine(generator_256 * 2)
+
+        with self.assertRaises(ValueError):
+            SharedPrecompute.create([point])
+
+        tables = SharedPrecompute.create([_fresh_jacobi()])
+        with self.assertRaises(ValueError):
+            tables.attach(PointJacobi.from_affine(generator_256))
+
+    def test_unsupported_object(self):
+        with self.assertRaises(TypeError):
+            SharedPrecompute.create([SigningKey.generate(NIST256p)])
+
+    def test_invalid_file(self):
+        path = os.path.join(self.tmp, "invalid")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 64)
+
+        with self.assertRaises(ValueError):
+            SharedPrecompute.open(path)
+
+    def test_truncated_file(self):
+        path = os.path.join(self.tmp, "truncated")
+        SharedPrecompute.create([_fresh_jacobi()], path).close()
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-1])
+
+        with self.assertRaises(ValueError):
+            SharedPrecompute.open(path)
+
+    def test_table_index_out_of_range(self):
+        point = _fresh_jacobi()
+        SharedPrecompute.create([point])
+        table = point._maybe_precompute()
+
+        with self.assertRaises(IndexError):
+            table[len(table)]
+
+    def test_pickle_with_shared_table(self):
+        point = _fresh_jacobi()
+        SharedPrecompute.create([point])
+
+        with pickle_with_precompute():
+            unpickled = pickle.loads(pickle.dumps(point))
+
+        self.assertEqual(
+            unpickled._maybe_precompute(), generator_256._maybe_precompute()
+        )
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork()")
+    def test_fork(self):
+        point = _fresh_jacobi()
+        SharedPrecompute.create([point])
+        expected = (point * 0xA8).to_bytes()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:  # pragma: no cover
+            try:
+                os.close(read_fd)
+                os.write(write_fd, (point * 0xA8).to_bytes())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        result = b""
+        while True:
+            data = os.read(read_fd, 1024)
+            if not data:
+                break
+            result += data
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        self.assertEqual(result, expected)
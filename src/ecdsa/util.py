@@ -301,7 +301,7 @@ def sigencode_der(r, s, order):
     :return: DER encoding of ECDSA signature
     :rtype: bytes
     """
-    return der.encode_sequence(der.encode_integer(r), der.encode_integer(s))
+    return der.encode_ecdsa_sig_value(r, s)
 
 
 def _canonize(s, order):
@@ -517,17 +517,4 @@ def sigdecode_der(sig_der, order):
     :return: tuple with decoded ``r`` and ``s`` values of signature
     :rtype: tuple of ints
     """
-    sig_der = normalise_bytes(sig_der)
-    # return der.encode_sequence(der.encode_integer(r), der.encode_integer(s))
-    rs_strings, empty = der.remove_sequence(sig_der)
-    if empty != b"":
-        raise der.UnexpectedDER(
-            "trailing junk after DER sig: %s" % binascii.hexlify(empty)
-        )
-    r, rest = der.remove_integer(rs_strings)
-    s, empty = der.remove_integer(rest)
-    if empty != b"":
-        raise der.UnexpectedDER(
-            "trailing junk after DER numbers: %s" % binascii.hexlify(empty)
-        )
-    return r, s
+    return der.decode_ecdsa_sig_value(sig_der)